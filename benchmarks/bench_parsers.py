@@ -0,0 +1,166 @@
+"""
+Offline parse benchmarks for the kenpompy getters.
+
+Every getter is run against kenpom.com pages stored in a replay archive (see `kenpompy.transport`), so the numbers
+measure parsing alone, with no network involved. Record an archive once with a subscriber account:
+
+	EMAIL=... PASSWORD=... python benchmarks/bench_parsers.py --record kenpom_bench.zip
+
+then benchmark as often as needed, optionally comparing against results saved from another commit:
+
+	python benchmarks/bench_parsers.py kenpom_bench.zip --output after.json --compare before.json
+
+Results are written as JSON with the per-function median latency, pages parsed per second and peak memory.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import cloudscraper
+import pandas as pd
+import kenpompy.utils as kputils
+import kenpompy.misc as kpmisc
+import kenpompy.summary as kpsummary
+import kenpompy.team as kpteam
+from kenpompy.FanMatch import FanMatch
+from kenpompy.transport import RecordingTransport, ReplayTransport
+
+OLD_SEASON = 2005
+NEW_SEASON = 2024
+
+# Name, function, keyword arguments. Old and new seasons are covered where page layouts differ between eras.
+CASES = [
+	('get_pomeroy_ratings[old]', kpmisc.get_pomeroy_ratings, {'season': OLD_SEASON}),
+	('get_pomeroy_ratings[new]', kpmisc.get_pomeroy_ratings, {'season': NEW_SEASON}),
+	('get_efficiency[old]', kpsummary.get_efficiency, {'season': OLD_SEASON}),
+	('get_efficiency[new]', kpsummary.get_efficiency, {'season': NEW_SEASON}),
+	('get_fourfactors[new]', kpsummary.get_fourfactors, {'season': NEW_SEASON}),
+	('get_playerstats[old]', kpsummary.get_playerstats, {'season': OLD_SEASON}),
+	('get_playerstats[new]', kpsummary.get_playerstats, {'season': NEW_SEASON}),
+	('get_playerstats[ORtg]', kpsummary.get_playerstats, {'season': NEW_SEASON, 'metric': 'ORtg'}),
+	('get_schedule[old]', kpteam.get_schedule, {'team': 'Duke', 'season': OLD_SEASON}),
+	('get_schedule[new]', kpteam.get_schedule, {'team': 'Duke', 'season': NEW_SEASON}),
+	('get_scouting_report[old]', kpteam.get_scouting_report, {'team': 'Duke', 'season': OLD_SEASON}),
+	('get_scouting_report[new]', kpteam.get_scouting_report, {'team': 'Duke', 'season': NEW_SEASON}),
+	('FanMatch[old]', FanMatch, {'date': '2011-02-12'}),
+	('FanMatch[new]', FanMatch, {'date': '2024-02-10'}),
+]
+
+
+class CountingReplay(ReplayTransport):
+	"""Replay transport that counts the pages served, so throughput can be reported in pages per second."""
+
+	def __init__(self, path):
+		super().__init__(path)
+		self.pages = 0
+
+	def request(self, method, url, **kwargs):
+		self.pages += 1
+		return super().request(method, url, **kwargs)
+
+
+def record(path):
+	with RecordingTransport(cloudscraper.create_scraper(), path) as recorder:
+		browser = kputils.login(os.environ['EMAIL'], os.environ['PASSWORD'], transport=recorder)
+		for name, func, kwargs in CASES:
+			print('Recording ' + name)
+			func(browser, **kwargs)
+
+
+def run(path, repeat):
+	browser = CountingReplay(path)
+	results = {}
+	for name, func, kwargs in CASES:
+		# Warm up once, which also checks that the archive has every page the case needs. This fills the catalog too,
+		# so the team and season lookups it makes aren't timed or counted as pages parsed.
+		func(browser, **kwargs)
+
+		browser.pages = 0
+		timings = []
+		for _ in range(repeat):
+			start = time.perf_counter()
+			func(browser, **kwargs)
+			timings.append(time.perf_counter() - start)
+		pages = browser.pages / repeat
+
+		tracemalloc.start()
+		func(browser, **kwargs)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+
+		median = statistics.median(timings)
+		results[name] = {
+			'pages': pages,
+			'median_s': median,
+			'min_s': min(timings),
+			'pages_per_s': pages / median,
+			'peak_memory_bytes': peak,
+		}
+		print(f'{name:<28} {median * 1000:9.1f} ms {pages / median:8.1f} pages/s {peak / 2 ** 20:8.1f} MiB')
+	return results
+
+
+def commit():
+	try:
+		return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+									   stderr=subprocess.DEVNULL).strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def compare(results, baseline):
+	print()
+	print(f'{"":<28} {"baseline":>12} {"current":>12} {"change":>8}')
+	for name, result in results.items():
+		if name in baseline['results']:
+			before = baseline['results'][name]['median_s']
+			after = result['median_s']
+			print(f'{name:<28} {before * 1000:9.1f} ms {after * 1000:9.1f} ms {(after / before - 1) * 100:+7.1f}%')
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark kenpompy parsers against a replay archive.')
+	parser.add_argument('archive', nargs='?', help='Replay archive to benchmark against.')
+	parser.add_argument('--record', metavar='ARCHIVE', help='Record a new archive from kenpom.com (needs EMAIL and PASSWORD).')
+	parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case. 5 by default.')
+	parser.add_argument('--output', help='File to write JSON results to.')
+	parser.add_argument('--compare', help='JSON results from an earlier run to compare against.')
+	args = parser.parse_args()
+
+	# Benchmarks measure parsing, so nothing should be served from or throttled by the request layer.
+	kputils.set_cache(None)
+	kputils.set_rate_limiter(None)
+	kputils.set_retry_policy(None)
+
+	if args.record:
+		record(args.record)
+		return
+	if not args.archive:
+		parser.error('an archive to benchmark against is required')
+
+	results = run(args.archive, args.repeat)
+	output = {
+		'commit': commit(),
+		'python': platform.python_version(),
+		'pandas': pd.__version__,
+		'results': results,
+	}
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(output, f, indent=2)
+	if args.compare:
+		with open(args.compare) as f:
+			compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+	main()
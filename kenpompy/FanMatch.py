@@ -3,23 +3,44 @@ This module contains the FanMatch class for scraping the FanMatch pages into mor
 """
 
 import pandas as pd
-from io import StringIO
 import re
-from datetime import datetime
+from datetime import datetime, date as _date
 from cloudscraper import CloudScraper
-from bs4 import BeautifulSoup
-from typing import Optional
-from .utils import get_html
+from typing import Optional, Tuple
+from .utils import get_html, get_html_many
+from .tables import parse_html, read_table
+from .instrument import span, instrumented
+from .cache import url_season
+from . import schema
+
+# Summary stats of a day, in the order they appear in the summary dataframe returned by `get_fanmatch`.
+_SUMMARY = ["ppg", "avg_eff", "pos_40", "mean_abs_err_pred_total_score", "bias_pred_total_score",
+            "mean_abs_err_pred_mov", "record_favs", "expected_record_favs", "exact_mov"]
+
+_RE_THRILL_SCORE = r"^(?P<ThrillScore>.{0,4})\s*(?P<ThrillScoreRank>.*?)\s*$"
+# A game reads "31 Marquette 84, 59 Xavier 82 (2OT) [79] WCC-T MVP: Sacar Anim (28p/5r/2a/1b/4s)", with every part after
+# the teams optional.
+_RE_GAME = (r"^(?P<Game>.*?)(?: \[(?P<Possessions>[^\]]*)\][^\[]*?)?"
+            r"(?:\s+(?P<Tournament>[A-Za-z]{2,}-T)|(?P<NCAA>NCAA))?(?: MVP: (?P<MVP>.*))?$")
+# A prediction reads "Marquette 73-72 (51%)", with the predicted possessions in brackets on recent pages.
+_RE_PREDICTION = (r"^(?P<PredictedWinner>.+?) (?P<PredictedScore>(?P<PredictedWinnerScore>\d+)-(?P<PredictedLoserScore>\d+))"
+                  r"(?:.*?\((?P<WinProbability>\d+%)\))?(?:.*?\[(?P<PredictedPossessions>\d+)\])?")
+_RE_RESULT = (r"^(?P<WinnerRank>\S+) (?P<Winner>.+?) (?P<WinnerScore>\d+), "
+              r"(?P<LoserRank>\S+) (?P<Loser>.+?) (?P<LoserScore>\d+)(?: \((?P<OT>[^()]*)\)?)?\s*$")
+_RE_MATCHUP = r"^\S+ (?P<FirstTeam>.+?) (?:at|vs\.) \S+ (?P<SecondTeam>.+?)\s*$"
 
 class FanMatch:
     """Object to hold FanMatch page scraping results.
     
-    This class scrapes the kenpom FanMatch page when a new instance is created. 
+    This class scrapes the kenpom FanMatch page when a new instance is created. Pages that have already been retrieved
+    can be parsed with `from_html` instead.
 
     Args:
         browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
             by the `login` function.
         date (str): Date to scrape, in format "YYYY-MM-DD", such as "2020-01-29".
+        typed (bool, optional): Whether `fm_df` has scores, ranks and possessions as integers and teams as
+            categoricals (see `schema`), instead of text. False by default.
 
     Attributes:
         url (str): Full url for the page to be scraped.
@@ -37,8 +58,43 @@ class FanMatch:
         fm_df (pandas dataframe or None): Pandas dataframe containing parsed FanMatch table. If there are no games that day, fm_df will be None.
     """
 
-    def __init__(self, browser: CloudScraper, date: Optional[str]=None):
-        self.url = 'https://kenpom.com/fanmatch.php'
+    def __init__(self, browser: CloudScraper, date: Optional[str]=None, typed: bool=False):
+        self._reset(date)
+        with span("FanMatch", url_season(self.url)) as current:
+            self._parse(get_html(browser, self.url), typed)
+            if current is not None and self.fm_df is not None:
+                current.rows = len(self.fm_df)
+
+    @staticmethod
+    def _url(date: Optional[str]=None):
+        url = 'https://kenpom.com/fanmatch.php'
+        if date is not None:
+            url = url + "?d=" + date
+        return url
+
+    @classmethod
+    def from_html(cls, content, date: Optional[str]=None, typed: bool=False):
+        """
+        Builds a FanMatch object from page content that has already been retrieved, such as with `utils.get_html_many`.
+
+        Parsing needs no browser, so pages fetched in bulk can be parsed anywhere, including in a worker pool.
+
+        Args:
+            content (bytes or str): Content of the FanMatch page.
+            date (str, optional): Date the page is for, in format "YYYY-MM-DD", such as "2020-01-29".
+            typed (bool, optional): Whether `fm_df` is typed (see `schema`). False by default.
+
+        Returns:
+            fanmatch (FanMatch): The parsed FanMatch page.
+        """
+
+        self = cls.__new__(cls)
+        self._reset(date)
+        self._parse(content, typed)
+        return self
+
+    def _reset(self, date: Optional[str]):
+        self.url = self._url(date)
         self.date = date
         self.lines_o_night = None
         self.ppg = None
@@ -51,15 +107,22 @@ class FanMatch:
         self.expected_record_favs = None
         self.exact_mov = None
         self.fm_df = None
-        
-        if self.date is not None:
-            self.url = self.url + "?d=" + self.date
 
-        fm = BeautifulSoup(get_html(browser, self.url), "html.parser")
+    def _parse(self, content, typed=False):
+        fm_df = self._read(content)
+        if fm_df is not None:
+            self.fm_df = _tidy(fm_df)
+            if typed:
+                self.fm_df = schema.apply(self.fm_df, "fanmatch_day")
+
+    def _read(self, content):
+        # Reads the day's summary stats into attributes and returns the raw game rows, or None if there are no games.
+        date = self.date
+        fm = parse_html(content)
         if "Sorry, no games today." in fm.text:
-            return
+            return None
         if date is not None:
-            date_text = fm.find("div", class_="lh12").get_text()
+            date_text = fm.find('//div[contains(concat(" ", normalize-space(@class), " "), " lh12 ")]').text_content()
             date_match = re.search(r"for \w+, (\w+ \d{1,2}[a-z]{2})", date_text)
             if date_match:
                 extracted_date_str = re.sub(r"(st|nd|rd|th)", "", date_match.group(1))
@@ -67,27 +130,19 @@ class FanMatch:
                 extracted_mmdd = extracted_date.strftime("%m-%d")
                 user_mmdd = datetime.strptime(date, "%Y-%m-%d").strftime("%m-%d")
                 if extracted_mmdd != user_mmdd:
-                    return
-        table = fm.find_all("table")[0]
-        fm_df = pd.read_html(StringIO(str(table)))
-        fm_df = fm_df[0]
+                    return None
+        table = fm.table(0)
+        fm_df = read_table(table)
         fm_df = fm_df.rename(columns={"Thrill Score": "ThrillScore", "Come back": "Comeback", "Excite ment": "Excitement"})
-        fm_df.ThrillScore = fm_df.ThrillScore.astype("str")
-        fm_df["ThrillScoreRank"] = fm_df.ThrillScore.str[4:]
-        fm_df["ThrillScoreRank"] = fm_df["ThrillScoreRank"].str.strip()
-        fm_df.ThrillScore = fm_df.ThrillScore.str[0:4]
-        
+
         # Take care of parsing if some/all games have been completed.
         if not all(pd.isnull(fm_df["Excitement"])):
-            fm_df["Excitement"] = fm_df.Excitement.str.split("·").str[0]
-            fm_df["ExcitementRank"] = fm_df.Excitement.str.split("·").str[1]
-            
             # Handle extra rows without game info.
             e_start = fm_df.index[fm_df["Game"].str.contains("the night")].tolist()[0]
             extra = fm_df.iloc[e_start:len(fm_df),]
-            fm_df.drop(extra.index, inplace = True)
+            fm_df = fm_df.drop(extra.index)
             self.lines_o_night = extra.iloc[1:len(extra)-4, 0].tolist()
-            
+
             sts = extra.iloc[-1, 0]
             pred_score = extra.iloc[-2, 0]
             pred_mov = extra.iloc[-3, 0]
@@ -114,94 +169,181 @@ class FanMatch:
             exact_mov = exact_mov.split(" in ")[1]
             exact_mov = exact_mov.split()
             self.exact_mov = exact_mov[0] + "/" + exact_mov[2]
-    
-        # Will only be present if some games have been completed.
-        if not all(pd.isnull(fm_df.Comeback)):
-            fm_df["Comeback"] = fm_df.Comeback.str.split("·").str[0]
-            fm_df["ComebackRank"] = fm_df.Comeback.str.split("·").str[1]
-
-        mvp = fm_df.Game.str.split(" MVP: ").str[1]
-        fm_df["Game"], fm_df["MVP"] = fm_df.Game.str.split(" MVP: ").str[0], mvp
-
-        # Conference tournament label handling (fixes j-andrews7/kenpompy#47)
-        fm_df["Tournament"] = fm_df.Game.str.extract(r"([A-Za-z]{2,}-T|NCAA)$")
-        fm_df["Game"] = fm_df.Game.str.replace(r"(\s+[A-Za-z]{2,}-T|NCAA)$", "", regex=True)
-
-        pos = fm_df.Game.str.split(r" \[").str[1]
-        fm_df["Game"], fm_df["Possessions"] = fm_df.Game.str.split(r" \[").str[0], pos.astype("str")
-        fm_df.Possessions = fm_df.Possessions.str.split("]").str[0]
-        fm_df["PredictedWinner"] = fm_df["Prediction"].str.extract(r"^(.+?) \d+-\d+")[0]
-        fm_df["PredictedScore"] = fm_df["Prediction"].str.extract(r" (\d+-\d+)")[0]
-        fm_df["WinProbability"] = fm_df["Prediction"].str.extract(r"\((\d+%)\)")[0]
-        fm_df["PredictedPossessions"] = fm_df["Prediction"].str.extract(r"\[(\d+)\]")[0].astype(float)
-        fm_df["Possessions"] = fm_df["Possessions"].where(fm_df["Possessions"] != "", fm_df["PredictedPossessions"])
-
-        fm_df["PredictedMOV"] = [(int(x[0]) - int(x[1])) if len(x) > 1 else float("nan") for x 
-                                 in fm_df.PredictedScore.astype("str").str.split("-")]
-
-        fm_df.drop(["Prediction", "Time (ET)"], axis = 1, inplace = True)
-        
-        # Parse predicted loser.
-        teams = fm_df.Game.str.split(", ").tolist()
-        teams_np = fm_df.Game.str.split(" at ").tolist()
-        pred_winner = fm_df["PredictedWinner"].tolist()
-        
-        i = 0
-        pred_loser = []
-        for i, x in enumerate(teams):
-            if len(x) != 2:
-                x = teams_np[i]
-                
-                # Account for neutral games.
-                if len(x) < 2:
-                    x = x[0].split(" vs. ")
-                x[0] = " ".join(x[0].split()[1:])
-                x[1] = " ".join(x[1].split()[1:])
-                
-            else:
-                x[1] = x[1].split(" (")[0]
-
-                x[0] = " ".join(x[0].split()[1:-1])
-                x[1] = " ".join(x[1].split()[1:-1])
-            
-            if x[0] != pred_winner[i]:
-                pred_loser.append(x[0])
-            else:
-                pred_loser.append(x[1])
-                
-            i = i + 1
-            
-        fm_df["PredictedLoser"] = pred_loser
-        
-        winner = fm_df.Game.str.split(", ").str[0].tolist()
-        loser = fm_df.Game.str.split(", ").str[1].tolist()
-        
-        if not all(pd.isnull(loser)):
-            loser = [str(x).split("(")[0] for x in loser]
-            ot = fm_df.Game.str.split("(").str[1].astype("str").str.strip(")").tolist()
-            fm_df["OT"] = ot
-            
-            fm_df["Loser"] = [" ".join(x.split()[1:-1]) if len(x.split(" at ")) < 2 else float("nan") for x in loser]
-            fm_df["LoserRank"] = [x.split()[0] for x in loser]
-            fm_df["LoserScore"] = [x.split()[-1] if len(x.split(" at ")) < 2 else float("nan") for x in loser]
-            
-        else:
-            fm_df["OT"] = float("nan")
-            fm_df["Loser"] = float("nan")
-            fm_df["LoserRank"] = float("nan")
-            fm_df["LoserScore"] = float("nan")
-        
-        fm_df["Winner"] = [" ".join(x.split()[1:-1]) if (len(x.split(" at ")) < 2 and 
-            len(x.split(" vs. ")) < 2) else float("nan") for x in winner]
-        fm_df["WinnerRank"] = [x.split()[0] if (len(x.split(" at ")) < 2 and 
-            len(x.split(" vs. ")) < 2) else float("nan") for x in winner]
-        fm_df["WinnerScore"] = [x.split()[-1] if (len(x.split(" at ")) < 2 and 
-            len(x.split(" vs. ")) < 2) else float("nan") for x in winner]
-        
-        if not all(pd.isnull(loser)):
-            fm_df["ActualMOV"] = [(int(x[0]) - int(x[1])) if not pd.isnull(x[0]) else float("nan") for x 
-                                  in list(zip(fm_df.WinnerScore.tolist(), fm_df.LoserScore.tolist()))]
-        else:
-            fm_df["ActualMOV"] = float("nan")
-        
-        self.fm_df = fm_df
+
+        return fm_df
+
+
+def _tidy(fm_df):
+    # Splits the game rows of one or more FanMatch tables into their columns, one regex per column family.
+    thrill = fm_df.ThrillScore.astype("str").str.extract(_RE_THRILL_SCORE)
+    fm_df["ThrillScore"] = thrill.ThrillScore
+    fm_df["ThrillScoreRank"] = thrill.ThrillScoreRank
+
+    # Excitement and Comeback will only be present if some games have been completed.
+    if not all(pd.isnull(fm_df["Excitement"])):
+        fm_df["Excitement"] = fm_df.Excitement.str.split("·").str[0]
+        fm_df["ExcitementRank"] = fm_df.Excitement.str.split("·").str[1]
+    if not all(pd.isnull(fm_df.Comeback)):
+        fm_df["Comeback"] = fm_df.Comeback.str.split("·").str[0]
+        fm_df["ComebackRank"] = fm_df.Comeback.str.split("·").str[1]
+
+    # Possessions, conference tournament label (fixes j-andrews7/kenpompy#47) and MVP follow the game itself.
+    game = fm_df.Game.str.extract(_RE_GAME)
+    fm_df["Game"] = game.Game
+    fm_df["MVP"] = game.MVP
+    fm_df["Tournament"] = game.Tournament.fillna(game.NCAA)
+    fm_df["Possessions"] = game.Possessions
+
+    prediction = fm_df.Prediction.str.extract(_RE_PREDICTION)
+    fm_df["PredictedWinner"] = prediction.PredictedWinner
+    fm_df["PredictedScore"] = prediction.PredictedScore
+    fm_df["WinProbability"] = prediction.WinProbability
+    fm_df["PredictedPossessions"] = prediction.PredictedPossessions.astype(float)
+    fm_df["Possessions"] = fm_df["Possessions"].where(fm_df["Possessions"] != "", fm_df["PredictedPossessions"])
+    fm_df["PredictedMOV"] = (pd.to_numeric(prediction.PredictedWinnerScore)
+                             - pd.to_numeric(prediction.PredictedLoserScore))
+
+    fm_df = fm_df.drop(["Prediction", "Time (ET)"], axis = 1)
+
+    # Completed games read "31 Marquette 84, 59 Xavier 82 (2OT)", others "5 Duke at 20 UNC" or "5 Duke vs. 20 UNC".
+    game = fm_df.Game.astype("str")
+    result = game.str.extract(_RE_RESULT)
+    matchup = game.str.extract(_RE_MATCHUP)
+
+    # Parse predicted loser.
+    first = result.Winner.fillna(matchup.FirstTeam)
+    second = result.Loser.fillna(matchup.SecondTeam)
+    fm_df["PredictedLoser"] = first.where(first != fm_df.PredictedWinner, second)
+
+    if game.str.contains(", ", regex=False).any():
+        fm_df["OT"] = result.OT
+        fm_df["Loser"] = result.Loser
+        fm_df["LoserRank"] = result.LoserRank
+        fm_df["LoserScore"] = result.LoserScore
+        fm_df["Winner"] = result.Winner
+        fm_df["WinnerRank"] = result.WinnerRank
+        fm_df["WinnerScore"] = result.WinnerScore
+        fm_df["ActualMOV"] = pd.to_numeric(result.WinnerScore) - pd.to_numeric(result.LoserScore)
+    else:
+        for column in ["OT", "Loser", "LoserRank", "LoserScore", "Winner", "WinnerRank", "WinnerScore", "ActualMOV"]:
+            fm_df[column] = float("nan")
+
+    return fm_df
+
+
+def _season_dates(season):
+    # FanMatch has games from the start of November through the Final Four in early April.
+    return "{}-11-01".format(int(season) - 1), "{}-04-15".format(int(season))
+
+
+def _day_strings(dates):
+    return pd.to_datetime(dates).dt.strftime("%Y-%m-%d")
+
+
+@instrumented
+def get_fanmatch(browser: CloudScraper, start: Optional[str]=None, end: Optional[str]=None, season: Optional[str]=None,
+                 previous: Optional[Tuple[pd.DataFrame, pd.DataFrame]]=None, max_workers: int=4, typed: bool=False):
+    """
+    Scrapes every FanMatch page (https://kenpom.com/fanmatch.php) in a range of dates into a game-level dataframe.
+
+    Pages are fetched concurrently with `utils.get_html_many`, under the shared rate limit and response cache set in
+    `utils`, and the games of every day are tidied together in one pass. Passing the result of an earlier call as
+    `previous` makes the crawl incremental: days that were already complete then are kept as they were, and only
+    missing or incomplete days are fetched again.
+
+    Args:
+        browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+            by the `login` function.
+        start (str, optional): First date to scrape, in format "YYYY-MM-DD". Required unless `season` is given.
+        end (str, optional): Last date to scrape, in format "YYYY-MM-DD". `start` by default, or the end of the season.
+        season (str, optional): Season to scrape, from November 1st of the previous year through April 15th.
+            `start` and `end` narrow it down if given.
+        previous (tuple, optional): The (games_df, summary_df) returned by an earlier call. An untyped result can be
+            continued by a typed call, but a typed one only by a typed call, since its text can't be recovered.
+        max_workers (int, optional): Maximum number of pages requested at once. 4 by default.
+        typed (bool, optional): Whether to return dates as datetimes, scores, ranks and possessions as integers and
+            teams as categoricals (see `schema`), instead of text. False by default.
+
+    Returns:
+        games_df (pandas dataframe): One row per game, with a Date column followed by the columns of `FanMatch.fm_df`.
+        summary_df (pandas dataframe): One row per date, with the number of games, the day's summary stats
+            (as attributes of `FanMatch`) and whether the day is complete, meaning it is over and every game on it has
+            a result.
+
+    Raises:
+        ValueError if neither `start` nor `season` is given, `end` is before `start`, or `previous` is typed and
+            `typed` isn't set.
+    """
+
+    if season is not None:
+        season_start, season_end = _season_dates(season)
+        start = start or season_start
+        end = end or season_end
+    if start is None:
+        raise ValueError("either start or season must be given.")
+    end = end or start
+    dates = [day.strftime("%Y-%m-%d") for day in pd.date_range(start, end)]
+    if not dates:
+        raise ValueError("end cannot be before start.")
+
+    previous_games = previous_summary = None
+    if previous is not None:
+        previous_games, previous_summary = previous
+        if not typed and pd.api.types.is_datetime64_any_dtype(previous_summary.Date):
+            raise ValueError("a typed previous result can only be continued with typed=True.")
+        # Dates are compared as text, whether or not the previous result was typed.
+        previous_games = previous_games.assign(Date=_day_strings(previous_games.Date))
+        previous_summary = previous_summary.assign(Date=_day_strings(previous_summary.Date))
+        complete = set(previous_summary.loc[previous_summary.Complete, "Date"])
+        dates = [day for day in dates if day not in complete]
+
+    pages = get_html_many(browser, [FanMatch._url(day) for day in dates], max_workers=max_workers,
+                          return_exceptions=False)
+
+    today = _date.today().strftime("%Y-%m-%d")
+    raw = []
+    summary = []
+    for day, content in zip(dates, pages):
+        fm = FanMatch.__new__(FanMatch)
+        fm._reset(day)
+        fm_df = fm._read(content)
+        games = 0
+        if fm_df is not None:
+            games = len(fm_df)
+            fm_df.insert(0, "Date", day)
+            raw.append(fm_df)
+        summary.append([day, games] + [getattr(fm, name) for name in _SUMMARY] + [day < today])
+
+    summary_df = pd.DataFrame(summary, columns=["Date", "Games"] + _SUMMARY + ["Complete"])
+    if raw:
+        games_df = _tidy(pd.concat(raw, ignore_index=True))
+        # Days with a game still to be played aren't complete yet.
+        pending = set(games_df.loc[games_df.ActualMOV.isna(), "Date"])
+        summary_df["Complete"] = summary_df.Complete & ~summary_df.Date.isin(pending)
+    else:
+        games_df = pd.DataFrame(columns=["Date"])
+
+    if typed:
+        games_df, summary_df = schema.apply(games_df, "fanmatch"), schema.apply(summary_df, "fanmatch_summary")
+
+    if previous is not None:
+        fetched = set(dates)
+        previous_games = previous_games[~previous_games.Date.isin(fetched)]
+        previous_summary = previous_summary[~previous_summary.Date.isin(fetched)]
+        if typed:
+            # Typed results are merged as typed, which reads untyped previous results just as a full crawl would.
+            previous_games = schema.apply(previous_games, "fanmatch")
+            previous_summary = schema.apply(previous_summary, "fanmatch_summary")
+        if len(previous_games):
+            games_df = pd.concat([previous_games, games_df], ignore_index=True) if raw else previous_games
+        if len(previous_summary):
+            # Days without games have no stats, which shouldn't leave their columns as objects.
+            summary_df = pd.concat([previous_summary, summary_df], ignore_index=True).infer_objects() \
+                if len(summary_df) else previous_summary
+
+    games_df = games_df.sort_values("Date", kind="stable").reset_index(drop=True)
+    summary_df = summary_df.sort_values("Date", kind="stable").reset_index(drop=True)
+    if typed and previous is not None:
+        # Categoricals with different categories are concatenated as objects.
+        return schema.apply(games_df, "fanmatch"), schema.apply(summary_df, "fanmatch_summary")
+    return games_df, summary_df
@@ -0,0 +1,26 @@
+from . import schema
+
+def pyarrow():
+	# pyarrow is an optional dependency, imported the first time a module needs it.
+	try:
+		import pyarrow
+		import pyarrow.dataset
+		import pyarrow.feather
+		import pyarrow.parquet
+	except ImportError:
+		raise ImportError('this needs pyarrow, which can be installed with `pip install kenpompy[arrow]`.') from None
+	return pyarrow
+
+
+def arrow_type(pa, dtype):
+	# Arrow type of a schema dtype.
+	return {
+		'Int8': pa.int8(),
+		'Int16': pa.int16(),
+		'Int32': pa.int32(),
+		schema.FLOAT: pa.float32(),
+		schema.CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+		schema.STRING: pa.string(),
+		schema.DATE: pa.timestamp('ns'),
+		schema.BOOL: pa.bool_(),
+	}[dtype]
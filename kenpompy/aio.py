@@ -0,0 +1,135 @@
+"""
+The aio module provides awaitable versions of every public getter, for use inside an asyncio event loop.
+
+Requests have to go through CloudScraper to get past Cloudflare, so each call runs on a small worker pool shared by the
+whole module rather than on the event loop itself. `ConferencePage` and `TeamPage` also extract every table of their
+page on the pool, so reading their attributes afterwards doesn't block the loop. All calls made with the same browser share its session and
+connection pool, so hundreds of calls can be gathered at once while only `max_workers` requests are in flight.
+"""
+
+import asyncio
+import operator
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from . import utils, misc, summary, conference, team, bulk
+from .FanMatch import FanMatch as _FanMatch, get_fanmatch as _get_fanmatch
+
+_executor = None
+_max_workers = 8
+_lock = threading.Lock()
+
+def set_max_workers(max_workers: int):
+	"""
+	Sets how many calls made through this module may run at once.
+
+	Args:
+		max_workers (int): Maximum number of calls in flight. 8 by default.
+
+	Raises:
+		ValueError if `max_workers` is less than 1.
+	"""
+
+	global _executor, _max_workers
+	if max_workers < 1:
+		raise ValueError('max_workers must be at least 1.')
+	with _lock:
+		_max_workers = max_workers
+		if _executor is not None:
+			_executor.shutdown(wait=False)
+			_executor = None
+
+
+def _get_executor():
+	global _executor
+	with _lock:
+		if _executor is None:
+			_executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix='kenpompy')
+		return _executor
+
+
+async def run(func, *args, **kwargs):
+	"""
+	Runs any blocking kenpompy call on the shared worker pool and waits for its result.
+
+	Args:
+		func (callable): The function to call.
+		*args: Positional arguments for `func`.
+		**kwargs: Keyword arguments for `func`.
+
+	Returns:
+		result: Whatever `func` returns.
+	"""
+
+	loop = asyncio.get_running_loop()
+	context = contextvars.copy_context()
+	return await loop.run_in_executor(_get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def _awaitable(func):
+	@functools.wraps(func)
+	async def wrapper(*args, **kwargs):
+		return await run(func, *args, **kwargs)
+	return wrapper
+
+
+def _parsed(cls, *extracts):
+	# Page objects extract their tables the first time they are accessed. Doing it on the worker pool right after the
+	# page is fetched keeps that parsing off the event loop.
+	@functools.wraps(cls, updated=())
+	def build(*args, **kwargs):
+		page = cls(*args, **kwargs)
+		for extract in extracts:
+			try:
+				extract(page)
+			except (ValueError, IndexError, KeyError):
+				# Left for the page to raise if it is accessed, as it would outside this module.
+				pass
+		return page
+	return _awaitable(build)
+
+
+login = _awaitable(utils.login)
+get_html = _awaitable(utils.get_html)
+
+get_current_season = _awaitable(misc.get_current_season)
+get_pomeroy_ratings = _awaitable(misc.get_pomeroy_ratings)
+get_trends = _awaitable(misc.get_trends)
+get_refs = _awaitable(misc.get_refs)
+get_hca = _awaitable(misc.get_hca)
+get_arenas = _awaitable(misc.get_arenas)
+get_gameattribs = _awaitable(misc.get_gameattribs)
+get_program_ratings = _awaitable(misc.get_program_ratings)
+
+get_efficiency = _awaitable(summary.get_efficiency)
+get_fourfactors = _awaitable(summary.get_fourfactors)
+get_teamstats = _awaitable(summary.get_teamstats)
+get_pointdist = _awaitable(summary.get_pointdist)
+get_height = _awaitable(summary.get_height)
+get_playerstats = _awaitable(summary.get_playerstats)
+get_all_playerstats = _awaitable(summary.get_all_playerstats)
+get_kpoy = _awaitable(summary.get_kpoy)
+
+get_valid_conferences = _awaitable(conference.get_valid_conferences)
+get_aggregate_stats = _awaitable(conference.get_aggregate_stats)
+get_standings = _awaitable(conference.get_standings)
+get_offense = _awaitable(conference.get_offense)
+get_defense = _awaitable(conference.get_defense)
+ConferencePage = _parsed(conference.ConferencePage, operator.attrgetter('standings'), operator.attrgetter('offense'),
+						 operator.attrgetter('defense'), operator.attrgetter('aggregate_stats'),
+						 operator.attrgetter('conferences'))
+
+get_valid_teams = _awaitable(team.get_valid_teams)
+get_schedule = _awaitable(team.get_schedule)
+get_scouting_report = _awaitable(team.get_scouting_report)
+get_scouting_reports = _awaitable(team.get_scouting_reports)
+get_season_schedule = _awaitable(team.get_season_schedule)
+get_season_games = _awaitable(team.get_season_games)
+TeamPage = _parsed(team.TeamPage, operator.attrgetter('schedule'), operator.methodcaller('scouting_report'),
+				   operator.methodcaller('scouting_report', conference_only=True), operator.attrgetter('roster'))
+
+FanMatch = _awaitable(_FanMatch)
+get_fanmatch = _awaitable(_get_fanmatch)
+
+get_seasons = _awaitable(bulk.get_seasons)
@@ -0,0 +1,127 @@
+"""
+The backend module builds the output of the getters that take a `backend` argument: pandas dataframes (the default),
+PyArrow tables or Polars dataframes.
+
+The Arrow and Polars backends build their columns straight from the text of the table cells, with no pandas dataframe
+in between. Untyped results keep every column as text, as it appears on the site. Typed results get the same Arrow
+schema as `export.to_arrow`.
+
+pyarrow and polars are optional dependencies, only imported when their backend is used. Install them with
+`pip install kenpompy[arrow]` or `pip install kenpompy[polars]`.
+"""
+
+from typing import List, Optional
+from . import schema
+from ._arrow import pyarrow, arrow_type
+from .export import arrow_schema
+
+BACKENDS = ('pandas', 'arrow', 'polars')
+
+def _polars():
+	try:
+		import polars
+	except ImportError:
+		raise ImportError('the polars backend needs polars, which can be installed with `pip install kenpompy[polars]`.') from None
+	return polars
+
+
+def check_backend(backend: str):
+	"""
+	Checks that a backend is valid, and that the packages it needs are installed.
+
+	Args:
+		backend (str): 'pandas', 'arrow' or 'polars'.
+
+	Returns:
+		is_pandas (bool): Whether the backend is 'pandas'.
+
+	Raises:
+		ValueError if `backend` is invalid.
+		ImportError if the backend needs a package that isn't installed.
+	"""
+
+	if backend not in BACKENDS:
+		raise ValueError('backend is invalid, must be one of: ' + ', '.join(BACKENDS))
+	if backend == 'polars':
+		_polars()
+	if backend != 'pandas':
+		pyarrow()
+	return backend == 'pandas'
+
+
+def _number(text, integer):
+	# Read leniently, as `schema.convert` does: percent signs and thousands separators are dropped and anything else
+	# becomes missing.
+	try:
+		value = float(text.strip().rstrip('%').replace(',', ''))
+	except (AttributeError, ValueError):
+		return None
+	if integer:
+		return int(value) if value == value else None
+	return value
+
+
+def _column(pa, values, dtype):
+	if dtype in (schema.CATEGORY, schema.STRING):
+		array = pa.array([value if value else None for value in values], pa.string())
+		return array.dictionary_encode() if dtype == schema.CATEGORY else array
+	return pa.array([_number(value, dtype != schema.FLOAT) for value in values], arrow_type(pa, dtype))
+
+
+def _split_records(values):
+	wins, losses = [], []
+	for value in values:
+		won, _, lost = (value or '').strip().partition('-')
+		wins.append(won)
+		losses.append(lost)
+	return wins, losses
+
+
+def finish(arrow_table, backend: str):
+	"""
+	Turns an Arrow table into the output of a backend other than pandas.
+
+	Args:
+		arrow_table (pyarrow.Table): The table.
+		backend (str): 'arrow' or 'polars'.
+
+	Returns:
+		table: `arrow_table` itself, or a Polars dataframe.
+	"""
+
+	if backend == 'polars':
+		return _polars().from_arrow(arrow_table)
+	return arrow_table
+
+
+def from_rows(rows: List[list], columns: List[str], backend: str, table: Optional[str]=None, typed: bool=False):
+	"""
+	Builds a table from the text of its cells, without going through pandas.
+
+	Args:
+		rows (list): Rows of cell text, as lists as long as `columns`.
+		columns (list): Column names.
+		backend (str): 'arrow' or 'polars'.
+		table (str, optional): Name of the table in `schema.SCHEMAS`. Required if `typed` is set. Only tables of text,
+			numbers and records are supported, not dates.
+		typed (bool, optional): Whether to convert the columns to the table's schema, with the columns it lacks left
+			empty, instead of keeping them as text. False by default.
+
+	Returns:
+		table (pyarrow.Table or polars.DataFrame): The table.
+	"""
+
+	pa = pyarrow()
+	values = dict(zip(columns, zip(*rows))) if rows else {column: () for column in columns}
+	if not typed:
+		return finish(pa.table({column: pa.array(values[column], pa.string()) for column in columns}), backend)
+
+	missing = [None] * len(rows)
+	arrays = []
+	for column, dtype in schema.SCHEMAS[table].items():
+		if dtype == schema.RECORD:
+			wins, losses = _split_records(values.get(column, missing))
+			arrays += [_column(pa, wins, schema.COUNT), _column(pa, losses, schema.COUNT)]
+		else:
+			arrays.append(_column(pa, values.get(column, missing), dtype))
+	return finish(pa.Table.from_arrays(arrays, schema=arrow_schema(table)), backend)
@@ -0,0 +1,166 @@
+"""
+The bulk module gets a table for many seasons at once, as a single dataframe with a Season column.
+"""
+
+import functools
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cloudscraper import CloudScraper
+from typing import Iterable
+from . import misc, summary
+from .backend import check_backend, finish
+from ._arrow import pyarrow
+from .schema import SCHEMAS, COUNT, CATEGORY
+
+# Tables that can be fetched in bulk, by schema name.
+TABLES = {
+	'pomeroy_ratings': misc.get_pomeroy_ratings,
+	'efficiency': summary.get_efficiency,
+	'fourfactors': summary.get_fourfactors,
+	'teamstats': summary.get_teamstats,
+	'teamstats_defense': functools.partial(summary.get_teamstats, defense=True),
+	'pointdist': summary.get_pointdist,
+	'height': summary.get_height,
+}
+
+def _getter(table):
+	try:
+		return TABLES[table]
+	except KeyError:
+		raise KeyError('table is invalid, must be one of: ' + ', '.join(TABLES)) from None
+
+
+def _ordered(columns, table):
+	# Untyped tables keep their text, but share the column order of the schema so that eras with fewer columns line up.
+	schema = [column for column in SCHEMAS[table] if column in columns]
+	return schema + [column for column in columns if column not in schema]
+
+
+def _reconcile(df: pd.DataFrame, table: str, season, typed: bool):
+	if not typed:
+		df = df[_ordered(df.columns, table)]
+	df = df.reset_index(drop=True)
+	df.insert(0, 'Season', pd.Series(int(season), index=df.index, dtype=COUNT if typed else 'int64'))
+	return df
+
+
+def _reconcile_arrow(arrow_table, table: str, season, typed: bool):
+	pa = pyarrow()
+	if not typed:
+		arrow_table = arrow_table.select(_ordered(arrow_table.column_names, table))
+	seasons = pa.array([int(season)] * arrow_table.num_rows, pa.int16() if typed else pa.int64())
+	return arrow_table.add_column(0, 'Season', seasons)
+
+
+def _seasons(browser, table, seasons, typed, max_workers, backend):
+	# Yields each season as a dataframe, or as an Arrow table for the other backends.
+	getter = _getter(table)
+	if max_workers < 1:
+		raise ValueError('max_workers must be at least 1.')
+	is_pandas = check_backend(backend)
+	seasons = list(seasons)
+	if not seasons:
+		return
+
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(seasons))) as executor:
+		futures = {executor.submit(getter, browser, season=season, typed=typed, backend='pandas' if is_pandas else 'arrow'):
+				   season for season in seasons}
+		try:
+			for future in as_completed(futures):
+				season = futures[future]
+				if is_pandas:
+					yield season, _reconcile(future.result(), table, season, typed)
+				else:
+					yield season, _reconcile_arrow(future.result(), table, season, typed)
+		finally:
+			# Stop early, whether a season failed or the caller stopped iterating.
+			for future in futures:
+				future.cancel()
+
+
+def iter_seasons(browser: CloudScraper, table: str, seasons: Iterable, typed: bool=False, max_workers: int=4,
+				 backend: str='pandas'):
+	"""
+	Gets a table for many seasons concurrently, yielding each season as soon as it is ready.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function.
+		table (str): The table to get, one of the keys of `TABLES`, such as 'efficiency'.
+		seasons (iterable): Seasons to get, such as `range(2002, 2026)`.
+		typed (bool, optional): Whether to get typed tables (see `schema`). False by default.
+		max_workers (int, optional): Maximum number of seasons fetched at once. 4 by default.
+		backend (str, optional): 'pandas', or 'arrow' or 'polars' to get PyArrow tables or Polars dataframes that are
+			never converted to pandas (see `backend`). 'pandas' by default.
+
+	Yields:
+		season, season_df (tuple): The season, and its table with a Season column first. Seasons come in the order
+			they finish.
+
+	Raises:
+		KeyError if `table` is invalid.
+		ValueError if `max_workers` is less than 1.
+		Exception raised by the getter for any of the seasons, after which no more seasons are yielded.
+	"""
+
+	for season, season_df in _seasons(browser, table, seasons, typed, max_workers, backend):
+		yield season, season_df if backend == 'pandas' else finish(season_df, backend)
+
+
+def _concat_arrow(arrow_tables, table, typed, backend):
+	pa = pyarrow()
+	# Missing columns are filled with nulls, and each season's categories are merged.
+	seasons_table = pa.concat_tables(arrow_tables, promote_options='default')
+	if typed:
+		seasons_table = seasons_table.unify_dictionaries()
+	else:
+		columns = [column for column in seasons_table.column_names if column != 'Season']
+		seasons_table = seasons_table.select(['Season'] + _ordered(columns, table))
+	return finish(seasons_table, backend)
+
+
+def get_seasons(browser: CloudScraper, table: str, seasons: Iterable, typed: bool=False, max_workers: int=4,
+				backend: str='pandas'):
+	"""
+	Gets a table for many seasons concurrently, as a single dataframe.
+
+	Seasons are fetched with the table's getter, so the response cache, rate limiter and retry policy set in `utils`
+	apply. Seasons where kenpom.com has fewer columns, such as the efficiency table before 2010, have the missing
+	columns left empty.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function.
+		table (str): The table to get, one of the keys of `TABLES`, such as 'efficiency'.
+		seasons (iterable): Seasons to get, such as `range(2002, 2026)`.
+		typed (bool, optional): Whether to get typed tables (see `schema`). False by default.
+		max_workers (int, optional): Maximum number of seasons fetched at once. 4 by default.
+		backend (str, optional): 'pandas', or 'arrow' or 'polars' to get PyArrow tables or Polars dataframes that are
+			never converted to pandas (see `backend`). 'pandas' by default.
+
+	Returns:
+		seasons_df (pandas dataframe): The table of every season, in the order of `seasons`, with a Season column
+			first.
+
+	Raises:
+		KeyError if `table` is invalid.
+		ValueError if `max_workers` is less than 1, or `seasons` is empty.
+		Exception raised by the getter for any of the seasons.
+	"""
+
+	seasons = list(seasons)
+	if not seasons:
+		raise ValueError('seasons cannot be empty.')
+	results = dict(_seasons(browser, table, seasons, typed, max_workers, backend))
+	if backend != 'pandas':
+		return _concat_arrow([results[season] for season in seasons], table, typed, backend)
+	seasons_df = pd.concat([results[season] for season in seasons], ignore_index=True)
+	if typed:
+		# Each season has its own categories, which pandas doesn't merge.
+		for column, dtype in SCHEMAS[table].items():
+			if dtype == CATEGORY:
+				seasons_df[column] = seasons_df[column].astype(CATEGORY)
+	else:
+		schema = [column for column in ['Season', *SCHEMAS[table]] if column in seasons_df.columns]
+		seasons_df = seasons_df[schema + [column for column in seasons_df.columns if column not in schema]]
+	return seasons_df
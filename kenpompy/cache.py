@@ -0,0 +1,185 @@
+"""
+The cache module provides an on-disk response cache that `utils.get_html` consults before going to kenpom.com.
+"""
+
+import os
+import re
+import time
+import hashlib
+import tempfile
+from datetime import date
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+def normalize_url(url: str):
+	"""
+	Normalizes a kenpom.com url so that equivalent requests share a single cache key.
+
+	The scheme and host are lowercased, the site root is mapped to `index.php`, and query parameters are sorted.
+
+	Args:
+		url (str): The url to normalize.
+
+	Returns:
+		url (str): The normalized url.
+	"""
+
+	parts = urlsplit(url.strip())
+	path = parts.path
+	if path in ('', '/'):
+		path = '/index.php'
+	query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+	return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def url_season(url: str):
+	"""
+	Determines which season a kenpom.com url refers to, if it is explicit in the url.
+
+	Seasons are read from the `y` parameter, or from the `d` parameter of FanMatch pages, where games from
+	July onwards belong to the following season.
+
+	Args:
+		url (str): The url to inspect.
+
+	Returns:
+		season (int or None): Season the url refers to, or None if the url refers to the current season.
+	"""
+
+	params = dict(parse_qsl(urlsplit(url).query))
+	if re.fullmatch(r'\d{4}', params.get('y', '')):
+		return int(params['y'])
+	match = re.fullmatch(r'(\d{4})-(\d{2})-\d{2}', params.get('d', ''))
+	if match:
+		return int(match.group(1)) + (1 if int(match.group(2)) >= 7 else 0)
+	return None
+
+
+class ResponseCache:
+	"""Persistent on-disk cache of kenpom.com page content.
+
+	Pages for past seasons never change, so they are kept forever. Everything else (pages for the current season,
+	or pages without an explicit season) expires after `ttl` seconds. Entries are written atomically, so a cache
+	directory can be shared by several processes.
+
+	Args:
+		path (str): Directory to store cached pages in. Created if it doesn't exist.
+		ttl (float, optional): Seconds before a current season page expires. One hour by default. Use None to never
+			expire and 0 to never cache current season pages.
+		current_season (int, optional): Latest season with data published. If not given, `get_html` passes the
+			browser's current season from the catalog (see `catalog.Catalog.current_season`) on every lookup, so the
+			cache follows it when a new season starts.
+
+	Attributes:
+		path (str): Directory cached pages are stored in.
+		ttl (float or None): Seconds before a current season page expires.
+		current_season (int or None): Latest season with data published, if fixed.
+		hits (int): Number of lookups served from the cache.
+		misses (int): Number of lookups that had to go to kenpom.com.
+	"""
+
+	def __init__(self, path: str, ttl: Optional[float]=3600, current_season: Optional[int]=None):
+		self.path = path
+		self.ttl = ttl
+		self.current_season = current_season
+		self.hits = 0
+		self.misses = 0
+		os.makedirs(self.path, exist_ok=True)
+
+	def _file(self, url: str):
+		key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+		return os.path.join(self.path, key[:2], key + '.html')
+
+	def is_permanent(self, url: str, current_season: Optional[int]=None):
+		"""
+		Checks whether the page at `url` belongs to a past season and can be cached forever.
+
+		Args:
+			url (str): The url to check.
+			current_season (int, optional): Latest season with data published, used if the cache wasn't given one.
+
+		Returns:
+			permanent (bool): True if the url refers to a season before `current_season`.
+		"""
+
+		season = url_season(url)
+		if season is None:
+			return False
+		if self.current_season is not None:
+			current_season = self.current_season
+		if current_season is None:
+			# Without knowing the current season, only seasons that have certainly finished are safe.
+			return season < date.today().year
+		return season < int(current_season)
+
+	def get(self, url: str, current_season: Optional[int]=None):
+		"""
+		Looks up the cached content for `url`.
+
+		Args:
+			url (str): The url to look up.
+			current_season (int, optional): Latest season with data published, used if the cache wasn't given one.
+
+		Returns:
+			content (bytes or None): The cached content, or None if the url isn't cached or has expired.
+		"""
+
+		file = self._file(url)
+		try:
+			if not self.is_permanent(url, current_season):
+				if self.ttl is not None and time.time() - os.path.getmtime(file) >= self.ttl:
+					self.misses += 1
+					return None
+			with open(file, 'rb') as f:
+				content = f.read()
+		except OSError:
+			self.misses += 1
+			return None
+		self.hits += 1
+		return content
+
+	def set(self, url: str, content: bytes, current_season: Optional[int]=None):
+		"""
+		Stores the content for `url` in the cache.
+
+		Args:
+			url (str): The url the content was retrieved from.
+			content (bytes): The page content.
+			current_season (int, optional): Latest season with data published, used if the cache wasn't given one.
+		"""
+
+		if self.ttl == 0 and not self.is_permanent(url, current_season):
+			return
+		file = self._file(url)
+		os.makedirs(os.path.dirname(file), exist_ok=True)
+		fd, tmp = tempfile.mkstemp(dir=os.path.dirname(file), suffix='.tmp')
+		try:
+			with os.fdopen(fd, 'wb') as f:
+				f.write(content)
+			os.replace(tmp, file)
+		except BaseException:
+			os.remove(tmp)
+			raise
+
+	def delete(self, url: str):
+		"""
+		Removes `url` from the cache, if present.
+
+		Args:
+			url (str): The url to remove.
+		"""
+
+		try:
+			os.remove(self._file(url))
+		except FileNotFoundError:
+			pass
+
+	def clear(self):
+		"""
+		Removes every page from the cache.
+		"""
+
+		for root, _, files in os.walk(self.path):
+			for file in files:
+				if file.endswith('.html'):
+					os.remove(os.path.join(root, file))
@@ -0,0 +1,232 @@
+"""
+The catalog module remembers the current season and the valid teams and conferences of each season, so that checking
+a team name or season doesn't mean downloading and parsing the ratings page again.
+"""
+
+import re
+import weakref
+import threading
+from typing import Iterable, Optional
+
+_catalogs = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_RE_SEED = re.compile(r'\d+\**')
+# Title of the ratings pages, which starts with their season.
+_CONTENT_HEADER = '//*[@id="content-header"]//h2'
+
+def team_names(teams):
+	"""
+	Cleans the team column of a ratings table into plain team names.
+
+	Args:
+		teams (iterable): The raw team column, such as a pandas series, as read from https://kenpom.com. Missing and
+			empty cells are skipped.
+
+	Returns:
+		team_list (list): Team names, without tournament seeds or leftover headers.
+	"""
+
+	# Remove NCAA tourny seeds for previous seasons.
+	teams = [_RE_SEED.sub('', team).rstrip() for team in teams if isinstance(team, str) and team]
+	# Remove leftover team headers
+	return [team for team in teams if team != "Team"]
+
+
+def note_current_season(browser, page):
+	"""
+	Records the current season shown on a ratings page requested without a season, which saves looking it up again.
+
+	Only the part of the page up to its first table is parsed, so getters that stop parsing there keep doing so.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		page (Page): The parsed page, such as https://kenpom.com/index.php.
+
+	Returns:
+		current_season (int or None): The season in the page's title, or None if the page has no title.
+	"""
+
+	try:
+		title = page.find_before(0, _CONTENT_HEADER)
+	except IndexError:
+		title = page.find(_CONTENT_HEADER)
+	match = re.match(r'^(\d{4})', title.text_content()) if title is not None else None
+	if match is None:
+		return None
+	season = int(match.group(1))
+	get_catalog(browser).set_current_season(season)
+	return season
+
+
+class Catalog:
+	"""Memoized current season and valid team and conference lists for one browser.
+
+	Lists are looked up the first time they are needed, and kept until `invalidate` is called. Getters that already
+	download the pages holding them, such as `misc.get_pomeroy_ratings`, fill the catalog in as they go.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+	"""
+
+	def __init__(self, browser):
+		self._browser = weakref.ref(browser)
+		self._lock = threading.Lock()
+		self._current_season = None
+		self._teams = {}
+		self._conferences = {}
+
+	@property
+	def browser(self):
+		"""
+		CloudScraper: The browser lists are looked up with.
+		"""
+
+		browser = self._browser()
+		if browser is None:
+			raise ReferenceError('the browser for this catalog no longer exists.')
+		return browser
+
+	def current_season(self):
+		"""
+		Gets the latest season with data published.
+
+		Returns:
+			current_season (int): Number corresponding to the last season year that has data published
+		"""
+
+		if self._current_season is None:
+			# Imported here as misc depends on this module.
+			from .misc import get_current_season
+			self.set_current_season(get_current_season(self.browser))
+		return self._current_season
+
+	def _key(self, season):
+		# Lists for the current season are kept under its number, however they were looked up.
+		return self.current_season() if not season else int(season)
+
+	def teams(self, season: Optional[str]=None):
+		"""
+		Gets the valid teams for a season.
+
+		Args:
+			season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+
+		Returns:
+			teams (frozenset): All valid teams for the given season on kenpom.com.
+		"""
+
+		key = self._key(season)
+		teams = self._teams.get(key)
+		if teams is None:
+			from .team import get_valid_teams
+			get_valid_teams(self.browser, season)
+			teams = self._teams[key]
+		return teams
+
+	def conferences(self, season: Optional[str]=None):
+		"""
+		Gets the valid conferences for a season.
+
+		Args:
+			season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+
+		Returns:
+			conferences (frozenset): All valid conference abbreviations for the given season on kenpom.com.
+		"""
+
+		key = self._key(season)
+		conferences = self._conferences.get(key)
+		if conferences is None:
+			from .conference import get_valid_conferences
+			get_valid_conferences(self.browser, season)
+			conferences = self._conferences[key]
+		return conferences
+
+	def is_valid_team(self, team: str, season: Optional[str]=None):
+		"""
+		Checks whether a team exists in kenpom for a season.
+
+		Args:
+			team (str): The team name, spelled as on https://kenpom.com.
+			season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+
+		Returns:
+			bool: True if the team is valid for the given season.
+		"""
+
+		return team in self.teams(season)
+
+	def set_current_season(self, season: int):
+		"""
+		Records the current season, such as after reading it from a page retrieved some other way.
+
+		Args:
+			season (int): The latest season with data published.
+		"""
+
+		with self._lock:
+			self._current_season = int(season)
+
+	def set_teams(self, season: Optional[str], teams: Iterable[str]):
+		"""
+		Records the valid teams for a season.
+
+		Args:
+			season (str or None): The season, or None for the current one, which is filed under its number.
+			teams (iterable): The valid team names.
+		"""
+
+		key = self._key(season)
+		with self._lock:
+			self._teams[key] = frozenset(teams)
+
+	def set_conferences(self, season: Optional[str], conferences: Iterable[str]):
+		"""
+		Records the valid conferences for a season.
+
+		Args:
+			season (str or None): The season, or None for the current one, which is filed under its number.
+			conferences (iterable): The valid conference abbreviations.
+		"""
+
+		key = self._key(season)
+		with self._lock:
+			self._conferences[key] = frozenset(conferences)
+
+	def invalidate(self, season: Optional[str]=None):
+		"""
+		Forgets memoized lists, so they are looked up again the next time they are needed.
+
+		Args:
+			season (str, optional): Season to forget. By default, everything is forgotten, including the current season.
+		"""
+
+		with self._lock:
+			if season is None:
+				self._current_season = None
+				self._teams.clear()
+				self._conferences.clear()
+			else:
+				self._teams.pop(int(season), None)
+				self._conferences.pop(int(season), None)
+
+
+def get_catalog(browser):
+	"""
+	Gets the catalog for a browser, creating it the first time. It is dropped along with the browser.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+
+	Returns:
+		catalog (Catalog): The browser's catalog.
+	"""
+
+	with _lock:
+		catalog = _catalogs.get(browser)
+		if catalog is None:
+			catalog = _catalogs[browser] = Catalog(browser)
+		return catalog
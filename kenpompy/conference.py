@@ -4,12 +4,131 @@ pandas dataframes
 """
 
 import pandas as pd
-from io import StringIO
 from cloudscraper import CloudScraper
-from bs4 import BeautifulSoup
+from functools import cached_property
 from typing import Optional
 from .utils import get_html
+from .tables import parse_html, read_table
+from .instrument import instrumented
+from .catalog import get_catalog
+from . import schema
 
+class ConferencePage:
+	"""Object to hold a parsed conference page (https://kenpom.com/conf.php).
+
+	The page is fetched and parsed once when a new instance is created. Each table is only turned into a dataframe
+	the first time it is accessed, and then kept.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		conf (str): conference abbreviation (ie B10, P12)
+		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+
+	Attributes:
+		url (str): Full url for the page.
+		conf (str): Conference abbreviation.
+		season (str or None): Season requested.
+		page (Page): The parsed page.
+		standings (pandas dataframe): Standing stats of the conference, as returned by `get_standings`.
+		offense (pandas dataframe): Offense only stats of the conference, as returned by `get_offense`.
+		defense (pandas dataframe): Defense only stats of the conference, as returned by `get_defense`.
+		aggregate_stats (pandas dataframe): Aggregate stats of the conference, as returned by `get_aggregate_stats`.
+		conferences (list): All valid conferences for the season, as returned by `get_valid_conferences`.
+	"""
+
+	def __init__(self, browser: CloudScraper, conf: str, season: Optional[str]=None):
+		self.conf = conf
+		self.season = season
+		self.url = self._url(conf, season)
+		self.page = parse_html(get_html(browser, self.url))
+
+	@staticmethod
+	def _url(conf: str, season: Optional[str]=None):
+		url = "https://kenpom.com/conf.php"
+		url = url + f'?c={conf}'
+		if(season):
+			url = url + '&y=' + str(season)
+		return url
+
+	@classmethod
+	def from_html(cls, content, conf: str, season: Optional[str]=None):
+		"""
+		Builds a conference page from page content that has already been retrieved.
+
+		Args:
+			content (bytes or str): Content of the conference page.
+			conf (str): conference abbreviation (ie B10, P12)
+			season (str, optional): Season the page is for.
+
+		Returns:
+			conference_page (ConferencePage): The parsed conference page.
+		"""
+
+		self = cls.__new__(cls)
+		self.conf = conf
+		self.season = season
+		self.url = cls._url(conf, season)
+		self.page = parse_html(content)
+		return self
+
+	@cached_property
+	def standings(self):
+		conf_df = self.page.read_table(0)
+		# Parse out seed
+		conf_df['Seed'] = conf_df['Team'].str.extract('([0-9]+)')
+		conf_df['Team'] = conf_df['Team'].str.replace('([0-9]+)', '', regex=True).str.rstrip()
+
+		# Rename Rank headers
+		conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
+
+		return conf_df
+
+	@cached_property
+	def offense(self):
+		conf_df = self.page.read_table(1)
+
+		# Rename Rank headers
+		conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
+
+		return conf_df
+
+	@cached_property
+	def defense(self):
+		conf_df = self.page.read_table(2)
+
+		# Rename Rank headers
+		conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
+
+		return conf_df
+
+	@cached_property
+	def aggregate_stats(self):
+		#get first table
+		conf_df = self.page.read_table(-3)
+		#get second table
+		conf2_df = self.page.read_table(-2)
+		conf2_df['Value'] = conf2_df['Value'].str.replace('%', '').astype(float)
+		conf_df = pd.concat([conf_df, conf2_df])
+		#clean table
+		conf_df = conf_df.set_index('Stat')
+		conf_df = conf_df.drop('Unnamed: 1', axis=1)
+		conf_df.columns = ['Value', 'Rank']
+		conf_df.index = conf_df.index.str.split(' (', regex=False).str[0]
+		return conf_df
+
+	@cached_property
+	def conferences(self):
+		table = self.page.tables[-1]
+		links = table.iter('a')
+		conf_list = []
+		for link in links:
+			conf_list.append(link.get('href').split('=')[-1])
+		conf_list.sort()
+		return conf_list
+
+
+@instrumented
 def get_valid_conferences(browser: CloudScraper, season: Optional[str]=None):
 	"""
 	Scrapes the conferences (https://kenpom.com/conf.php) into a list.
@@ -23,21 +142,13 @@ def get_valid_conferences(browser: CloudScraper, season: Optional[str]=None):
 		conference_list (list): List containing all valid conferences for the given season on kenpom.com.
 	"""
 
-	url = "https://kenpom.com/conf.php"
-	url = url + '?c=B10'
-	if(season):
-		url = url + '&y=' + str(season)
-	confs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = confs.find_all('table')[-1]
-	links = table.find_all('a')
-	conf_list = []
-	for link in links:
-		conf_list.append(link['href'].split('=')[-1])
-	conf_list.sort()
-	return conf_list
-
-
-def get_aggregate_stats(browser: CloudScraper, conf: Optional[str]=None, season: Optional[str]=None):
+	conference_list = ConferencePage(browser, 'B10', season).conferences
+	get_catalog(browser).set_conferences(season, conference_list)
+	return conference_list
+
+
+@instrumented
+def get_aggregate_stats(browser: CloudScraper, conf: Optional[str]=None, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes a given conference's stats (https://kenpom.com/conf.php or https://kenpom.com/confstats.php) into a dataframe.
 
@@ -46,44 +157,30 @@ def get_aggregate_stats(browser: CloudScraper, conf: Optional[str]=None, season:
 			by the `login` function
 		conf (str: optional): conference abbreviation (ie B10, P12). If None, it will grab the table from https://kenpom.com/confstats.php instead of https://kenpom.com/conf.php
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		typed (bool, optional): Whether to return numeric values and integer ranks (see `schema`), instead of the
+			columns as read. False by default.
 
 	Returns:
 		conference_df (dataframe): Dataframe containing aggregate stats of the conference for the given season on kenpom.com.
 	"""
 	if(conf):
-		url = "https://kenpom.com/conf.php"
-		url = url + f'?c={conf}'
-		if(season):
-			url = url + '&y=' + str(season)
-		confs = BeautifulSoup(get_html(browser, url), "html.parser")
-		#get first table
-		table = confs.find_all('table')[-3]
-		conf_df = pd.read_html(StringIO(str(table)))[0]
-		#get second table
-		table = confs.find_all('table')[-2]
-		conf2_df = pd.read_html(StringIO(str(table)))[0]
-		conf2_df['Value'] = conf2_df['Value'].str.replace('%', '').astype(float)
-		conf_df = pd.concat([conf_df, conf2_df])
-		#clean table
-		conf_df = conf_df.set_index('Stat')
-		conf_df = conf_df.drop('Unnamed: 1', axis=1)
-		conf_df.columns = ['Value', 'Rank']
-		conf_df.index = conf_df.index.str.split(' (', regex=False).str[0]
-		return conf_df
+		conf_df = ConferencePage(browser, conf, season).aggregate_stats
+		return schema.apply(conf_df, 'aggregate_stats') if typed else conf_df
 	else:
 		url = "https://kenpom.com/confstats.php"
 		if(season):
 			url = url + '?y=' + str(season)
-		confs = BeautifulSoup(get_html(browser, url), "html.parser")
+		confs = parse_html(get_html(browser, url))
 		#get table
-		table = confs.find_all('table')[0]
-		conf_df = pd.read_html(StringIO(str(table)))[0]
+		table = confs.table(0)
+		conf_df = read_table(table)
 		# Clean table
 		conf_df = conf_df.set_index('Conf')
 		conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
-		return conf_df
+		return schema.apply(conf_df, 'conference_stats') if typed else conf_df
 
-def get_standings(browser: CloudScraper, conf: str, season: Optional[str]=None):
+@instrumented
+def get_standings(browser: CloudScraper, conf: str, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes a given conference's standing stats (https://kenpom.com/conf.php) into a dataframe.
 
@@ -92,29 +189,19 @@ def get_standings(browser: CloudScraper, conf: str, season: Optional[str]=None):
 			by the `login` function
 		conf (str): conference abbreviation (ie B10, P12)
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		typed (bool, optional): Whether to return categorical teams and numeric stats with integer ranks (see
+			`schema`), instead of the columns as read. Columns that change with the season are kept. False by default.
 
 	Returns:
 		conference_df (dataframe): Dataframe containing standing stats of the conference for the given season on kenpom.com.
 	"""
 
-	url = "https://kenpom.com/conf.php"
-	url = url + f'?c={conf}'
-	if(season):
-		url = url + '&y=' + str(season)
-	confs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = confs.find_all('table')[0]
-	conf_df = pd.read_html(StringIO(str(table)))[0]
-	# Parse out seed
-	conf_df['Seed'] = conf_df['Team'].str.extract('([0-9]+)')
-	conf_df['Team'] = conf_df['Team'].str.replace('([0-9]+)', '', regex=True).str.rstrip()
-
-	# Rename Rank headers
-	conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
-
-	return conf_df
+	conf_df = ConferencePage(browser, conf, season).standings
+	return schema.apply(conf_df, 'conference_standings') if typed else conf_df
 
 
-def get_offense(browser: CloudScraper, conf: str, season: Optional[str]=None):
+@instrumented
+def get_offense(browser: CloudScraper, conf: str, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes a given conference's offense only stats (https://kenpom.com/conf.php) into a dataframe.
 
@@ -123,26 +210,19 @@ def get_offense(browser: CloudScraper, conf: str, season: Optional[str]=None):
 			by the `login` function
 		conf (str): conference abbreviation (ie B10, P12)
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		typed (bool, optional): Whether to return categorical teams and numeric stats with integer ranks (see
+			`schema`), instead of the columns as read. Columns that change with the season are kept. False by default.
 
 	Returns:
 		conference_df (dataframe): Dataframe containing offensive stats of the conference for the given season on kenpom.com.
 	"""
 
-	url = "https://kenpom.com/conf.php"
-	url = url + f'?c={conf}'
-	if(season):
-		url = url + '&y=' + str(season)
-	confs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = confs.find_all('table')[1]
-	conf_df = pd.read_html(StringIO(str(table)))[0]
+	conf_df = ConferencePage(browser, conf, season).offense
+	return schema.apply(conf_df, 'conference_offense') if typed else conf_df
 
-	# Rename Rank headers
-	conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
 
-	return conf_df
-
-
-def get_defense(browser: CloudScraper, conf: str, season: Optional[str]=None):
+@instrumented
+def get_defense(browser: CloudScraper, conf: str, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes a given conference's defense only stats (https://kenpom.com) into a dataframe.
 
@@ -151,20 +231,12 @@ def get_defense(browser: CloudScraper, conf: str, season: Optional[str]=None):
 			by the `login` function
 		conf (str): conference abbreviation (ie B10, P12)
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		typed (bool, optional): Whether to return categorical teams and numeric stats with integer ranks (see
+			`schema`), instead of the columns as read. Columns that change with the season are kept. False by default.
 
 	Returns:
 		conference_df (dataframe): Dataframe containing defensive stats of the conference for the given season on kenpom.com.
 	"""
 
-	url = "https://kenpom.com/conf.php"
-	url = url + f'?c={conf}'
-	if(season):
-		url = url + '&y=' + str(season)
-	confs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = confs.find_all('table')[2]
-	conf_df = pd.read_html(StringIO(str(table)))[0]
-
-	# Rename Rank headers
-	conf_df.columns = [stat[:-1] + 'Rank' if '.1' in stat else stat for stat in conf_df.columns]
-
-	return conf_df
+	conf_df = ConferencePage(browser, conf, season).defense
+	return schema.apply(conf_df, 'conference_defense') if typed else conf_df
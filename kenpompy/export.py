@@ -0,0 +1,196 @@
+"""
+The export module writes getter results to Parquet or Arrow IPC files, partitioned by table and season.
+
+Results are written to `<root>/<table>/Season=<season>/`, one new file per write, so appending a season never rewrites
+the files already there. Tables with a schema in `schema.SCHEMAS` are always written with the same Arrow schema,
+whether the result was typed or not.
+
+pyarrow is an optional dependency, only imported when this module is first used. Install it with
+`pip install kenpompy[arrow]`.
+"""
+
+import os
+import uuid
+import time
+import pandas as pd
+from typing import Iterable, Optional
+from . import schema
+from ._arrow import pyarrow, arrow_type
+
+# File extension of each format.
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+def _check_format(format):
+	if format not in FORMATS:
+		raise ValueError('format is invalid, must be one of: ' + ', '.join(FORMATS))
+
+
+def arrow_schema(table: str):
+	"""
+	Gets the Arrow schema a table is written with.
+
+	Args:
+		table (str): Name of the table in `schema.SCHEMAS`, such as 'efficiency'.
+
+	Returns:
+		arrow_schema (pyarrow.Schema): The table's schema. Records are split into Wins and Losses, as in typed tables.
+			For tables whose columns change with the season, only the columns that are always there.
+
+	Raises:
+		KeyError if `table` has no schema.
+	"""
+
+	pa = pyarrow()
+	fields = []
+	for column, dtype in schema.SCHEMAS[table].items():
+		if column == schema.OTHER:
+			continue
+		if dtype == schema.RECORD:
+			fields += [pa.field('Wins', pa.int16()), pa.field('Losses', pa.int16())]
+		else:
+			fields.append(pa.field(column, arrow_type(pa, dtype)))
+	return pa.schema(fields)
+
+
+def _frame(result):
+	# Turns any getter result into a single dataframe.
+	if isinstance(result, pd.DataFrame):
+		return result.reset_index() if result.index.name is not None else result
+	if isinstance(result, dict):
+		return pd.DataFrame([result])
+	if isinstance(result, list) and all(isinstance(item, pd.DataFrame) for item in result):
+		# Getters returning several tables, such as `summary.get_kpoy`, are numbered in a Part column.
+		return pd.concat([item.assign(Part=i) for i, item in enumerate(result)], ignore_index=True)
+	if hasattr(result, 'fm_df'):
+		fm_df = result.fm_df if result.fm_df is not None else pd.DataFrame()
+		return fm_df.assign(Date=result.date)
+	raise TypeError('result must be a dataframe, dictionary, list of dataframes or FanMatch object.')
+
+
+def to_arrow(result, table: Optional[str]=None, season: Optional[int]=None):
+	"""
+	Converts a getter result into an Arrow table.
+
+	Args:
+		result: What the getter returned: a dataframe, a dictionary such as a scouting report, a list of dataframes or
+			a `FanMatch` object. A named index, such as the GameID of `team.get_season_games`, becomes a column.
+		table (str, optional): Name of the table in `schema.SCHEMAS`. If given, the result is typed and converted to the
+			table's fixed schema. Otherwise column types are inferred.
+		season (int, optional): Season of the result, which gives the year of untyped schedule dates.
+
+	Returns:
+		arrow_table (pyarrow.Table): The result as an Arrow table.
+	"""
+
+	pa = pyarrow()
+	df = _frame(result)
+	if table is None or table not in schema.SCHEMAS:
+		return pa.Table.from_pandas(df, preserve_index=False)
+
+	typed_df = schema.apply(df, table, season=season)
+	extra = [column for column in df.columns if column not in typed_df.columns and column not in ('W-L', 'Record')]
+	if schema.OTHER in schema.SCHEMAS[table]:
+		# The other columns are typed too, so their Arrow types follow from their dtypes.
+		return pa.Table.from_pandas(typed_df, preserve_index=False)
+	arrow_table = pa.Table.from_pandas(typed_df, schema=arrow_schema(table), preserve_index=False)
+	for column in extra:
+		arrow_table = arrow_table.append_column(column, pa.array(df[column], from_pandas=True))
+	return arrow_table
+
+
+def _partition(root, table, season):
+	return os.path.join(root, table, 'Season=' + str(int(season)))
+
+
+def _write(pa, arrow_table, directory, format):
+	os.makedirs(directory, exist_ok=True)
+	name = 'part-{}-{}{}'.format(time.time_ns(), uuid.uuid4().hex[:8], FORMATS[format])
+	# Files are written under a hidden name first, so readers never see a partial file.
+	partial = os.path.join(directory, '.' + name)
+	if format == 'parquet':
+		pa.parquet.write_table(arrow_table, partial)
+	else:
+		pa.feather.write_feather(arrow_table, partial)
+	os.replace(partial, os.path.join(directory, name))
+
+
+def write_dataset(result, root: str, table: str, season: Optional[int]=None, format: str='parquet',
+				  replace: bool=False):
+	"""
+	Writes a getter result to a dataset partitioned by table and season.
+
+	Results with a Season column, such as those of `bulk.get_seasons`, are split into one partition per season.
+	Each write adds new files and leaves existing ones alone, unless `replace` is set.
+
+	Args:
+		result: What the getter returned (see `to_arrow`).
+		root (str): Directory holding the dataset.
+		table (str): Name of the table, used as its directory. Tables in `schema.SCHEMAS` get their fixed schema.
+		season (int, optional): Season of the result. Required unless it has a Season column.
+		format (str, optional): 'parquet' or 'arrow' (Arrow IPC). 'parquet' by default.
+		replace (bool, optional): Whether to remove the files already in the partitions written to, once the new ones
+			are written. Other seasons are never touched. False by default.
+
+	Returns:
+		paths (list): The partition directories written to.
+
+	Raises:
+		ValueError if `format` is invalid, or the season isn't known.
+		ImportError if pyarrow isn't installed.
+	"""
+
+	_check_format(format)
+	pa = pyarrow()
+	df = _frame(result)
+	if 'Season' in df.columns:
+		parts = [(season, part.drop(columns='Season')) for season, part in df.groupby('Season', sort=True)]
+	elif season is not None:
+		parts = [(season, df)]
+	else:
+		raise ValueError('season must be given for results without a Season column.')
+
+	paths = []
+	for season, part in parts:
+		directory = _partition(root, table, season)
+		existing = [entry.path for entry in os.scandir(directory)] if replace and os.path.isdir(directory) else []
+		_write(pa, to_arrow(part, table, season), directory, format)
+		for path in existing:
+			if os.path.basename(path).startswith('part-'):
+				os.remove(path)
+		paths.append(directory)
+	return paths
+
+
+def read_dataset(root: str, table: str, seasons: Optional[Iterable[int]]=None, format: str='parquet'):
+	"""
+	Reads a table written with `write_dataset` back into a dataframe.
+
+	Args:
+		root (str): Directory holding the dataset.
+		table (str): Name of the table.
+		seasons (iterable, optional): Seasons to read. Every season by default.
+		format (str, optional): 'parquet' or 'arrow'. 'parquet' by default.
+
+	Returns:
+		table_df (pandas dataframe): The table, with a Season column first.
+
+	Raises:
+		ValueError if `format` is invalid.
+		FileNotFoundError if the table has never been written.
+		ImportError if pyarrow isn't installed.
+	"""
+
+	_check_format(format)
+	pa = pyarrow()
+	path = os.path.join(root, table)
+	if not os.path.isdir(path):
+		raise FileNotFoundError('no dataset for ' + table + ' in ' + root)
+
+	partitioning = pa.dataset.partitioning(pa.schema([('Season', pa.int16())]), flavor='hive')
+	dataset = pa.dataset.dataset(path, format='ipc' if format == 'arrow' else format, partitioning=partitioning)
+	expression = None
+	if seasons is not None:
+		expression = pa.dataset.field('Season').isin([int(season) for season in seasons])
+	table_df = dataset.to_table(filter=expression).to_pandas()
+	columns = ['Season'] + [column for column in table_df.columns if column != 'Season']
+	return table_df[columns].sort_values('Season', kind='stable').reset_index(drop=True)
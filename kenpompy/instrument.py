@@ -0,0 +1,193 @@
+"""
+The instrument module lets callers time every getter phase by phase, through hooks that receive one `Span` per call.
+"""
+
+import time
+import inspect
+import functools
+import contextvars
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Optional
+
+_hooks = []
+_current = contextvars.ContextVar('kenpompy_span', default=None)
+_null = nullcontext()
+
+class Span:
+	"""Timings and metadata for a single getter call, passed to every registered hook once the call finishes.
+
+	Phases are named after the work done in them: 'fetch' for `utils.get_html` (network, cache, retries and
+	rate limiting), 'parse' for building the document from the page content, 'read_html' for turning a table into a
+	dataframe, and 'tidy' for everything else the getter does.
+
+	Attributes:
+		function (str): Name of the getter, such as 'get_efficiency' or 'FanMatch'.
+		season (str or None): Season requested, if given.
+		duration (float): Seconds the whole call took.
+		phases (dict): Seconds spent in each phase, keyed by phase name.
+		urls (list): Urls requested during the call.
+		bytes (int): Total size of the page content retrieved.
+		status_codes (list): Status code of every response received from kenpom.com, including retried ones.
+		cache_hits (int): Number of pages served from the response cache.
+		rows (int or None): Number of rows returned, if the result is tabular.
+		error (Exception or None): Exception raised by the call, if any.
+	"""
+
+	def __init__(self, function: str, season=None):
+		self.function = function
+		self.season = None if season is None else str(season)
+		self.duration = 0.0
+		self.phases = {}
+		self.urls = []
+		self.bytes = 0
+		self.status_codes = []
+		self.cache_hits = 0
+		self.rows = None
+		self.error = None
+
+	def __repr__(self):
+		phases = ', '.join(f'{name}={seconds * 1000:.1f}ms' for name, seconds in self.phases.items())
+		return f'<Span {self.function} season={self.season} {self.duration * 1000:.1f}ms ({phases}) rows={self.rows}>'
+
+
+def add_hook(hook: Callable[[Span], None]):
+	"""
+	Registers a hook that is called with a `Span` after every getter call.
+
+	Hooks run in the thread that made the call, so they should be quick and thread-safe. While no hook is registered,
+	getters skip instrumentation entirely.
+
+	Args:
+		hook (callable): Function taking a single `Span`.
+	"""
+
+	_hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Span], None]):
+	"""
+	Unregisters a hook added with `add_hook`.
+
+	Args:
+		hook (callable): The hook to remove.
+
+	Raises:
+		ValueError if `hook` isn't registered.
+	"""
+
+	_hooks.remove(hook)
+
+
+def current_span():
+	"""
+	Gets the span of the getter call in progress, if it is being instrumented.
+
+	Returns:
+		span (Span or None): The current span, or None if no getter call is being instrumented.
+	"""
+
+	return _current.get()
+
+
+def phase(name: str):
+	"""
+	Times a block of code as phase `name` of the current span. Does nothing if no getter call is being instrumented.
+
+	Args:
+		name (str): Name of the phase.
+
+	Returns:
+		context manager
+	"""
+
+	span = _current.get()
+	if span is None:
+		return _null
+	return _phase(span, name)
+
+
+@contextmanager
+def _phase(span: Span, name: str):
+	start = time.perf_counter()
+	try:
+		yield span
+	finally:
+		span.phases[name] = span.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+@contextmanager
+def span(function: str, season=None):
+	"""
+	Instruments a block of code as a call to `function`, reporting it to every hook when the block exits.
+
+	Time not attributed to any phase is reported as 'tidy'. If a span is already in progress, the block becomes part
+	of it instead.
+
+	Args:
+		function (str): Name to report the call under.
+		season (optional): Season to tag the call with.
+
+	Returns:
+		context manager yielding the `Span`, or None if nothing is being instrumented.
+	"""
+
+	if not _hooks or _current.get() is not None:
+		yield _current.get()
+		return
+
+	current = Span(function, season)
+	token = _current.set(current)
+	start = time.perf_counter()
+	try:
+		yield current
+	except BaseException as e:
+		current.error = e
+		raise
+	finally:
+		_current.reset(token)
+		current.duration = time.perf_counter() - start
+		current.phases['tidy'] = max(current.duration - sum(current.phases.values()), 0.0)
+		for hook in list(_hooks):
+			hook(current)
+
+
+def _count_rows(result):
+	if hasattr(result, 'shape'):
+		return result.shape[0]
+	if isinstance(result, list):
+		return sum(_count_rows(item) or 0 for item in result) if any(hasattr(item, 'shape') for item in result) else len(result)
+	if isinstance(result, dict):
+		return 1
+	return None
+
+
+def instrumented(func: Optional[Callable]=None, name: Optional[str]=None):
+	"""
+	Decorates a getter so every call to it is reported to the registered hooks, tagged with its `season` argument and
+	the number of rows it returns.
+
+	Args:
+		func (callable): The getter to decorate.
+		name (str, optional): Name to report calls under. The function's own name by default.
+
+	Returns:
+		callable: The decorated getter.
+	"""
+
+	if func is None:
+		return functools.partial(instrumented, name=name)
+
+	signature = inspect.signature(func)
+	name = name or func.__name__
+
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		if not _hooks or _current.get() is not None:
+			return func(*args, **kwargs)
+		season = signature.bind_partial(*args, **kwargs).arguments.get('season')
+		with span(name, season) as current:
+			result = func(*args, **kwargs)
+			current.rows = _count_rows(result)
+			return result
+
+	return wrapper
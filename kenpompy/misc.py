@@ -3,14 +3,23 @@ This module provides functions for scraping the miscellaneous stats kenpom.com p
 usable pandas dataframes.
 """
 
-import pandas as pd
-from io import StringIO
 import re
 from cloudscraper import CloudScraper
-from bs4 import BeautifulSoup
 from typing import Optional
 from .utils import get_html
-
+from .tables import parse_html, read_table, table_rows
+from .instrument import instrumented
+from .catalog import get_catalog, team_names, note_current_season
+from .backend import check_backend, from_rows
+from . import schema
+
+# Columns of the Pomeroy ratings table.
+_RATINGS = ['Rk', 'Team', 'Conf', 'W-L', 'AdjEM', 'AdjO', 'AdjO.Rank', 'AdjD', 'AdjD.Rank', 'AdjT', 'AdjT.Rank', 'Luck',
+            'Luck.Rank', 'SOS-AdjEM', 'SOS-AdjEM.Rank', 'SOS-OppO', 'SOS-OppO.Rank', 'SOS-OppD', 'SOS-OppD.Rank',
+            'NCSOS-AdjEM', 'NCSOS-AdjEM.Rank', 'Seed']
+_RE_TEAM_SEED = re.compile(r'(?P<Team>[a-zA-Z.&\'\s]+(?<!\s))\s*(?P<Seed>\d*)')
+
+@instrumented
 def get_current_season(browser: CloudScraper):
 	"""
 	Scrapes the KenPom homepage to get the latest season year that has data published
@@ -23,12 +32,29 @@ def get_current_season(browser: CloudScraper):
 		current_season (int): Number corresponding to the last season year that has data published
 	"""
 	url = 'https://kenpom.com/index.php'
-	content = BeautifulSoup(get_html(browser, url), "html.parser")
-	page_title = content.select_one('#content-header h2').text
-	YEAR_PATTERN = r'^(\d{4})'
-	return int(re.match(YEAR_PATTERN, page_title).group(0))
-
-def get_pomeroy_ratings(browser: CloudScraper, season: Optional[str]=None):
+	current_season = note_current_season(browser, parse_html(get_html(browser, url)))
+	if current_season is None:
+		raise ValueError('the current season could not be found on the kenpom.com homepage.')
+	return current_season
+
+def _ratings_table(browser, table, season, typed, backend):
+	# Tidies the ratings table the way `get_pomeroy_ratings` tidies its dataframe, without pandas.
+	_, body, foot = table_rows(table)
+	rows = [(row + [''] * 21)[:21] for row in body + foot]
+	get_catalog(browser).set_teams(season, team_names(row[1] for row in rows))
+	ratings = []
+	for row in rows:
+		if '' in row or row[0] == 'Rk':
+			continue
+		# Parse out seed, most current won't have this
+		match = _RE_TEAM_SEED.search(row[1])
+		team, seed = (match.group('Team'), match.group('Seed')) if match else (None, None)
+		ratings.append([row[0], team] + row[2:] + [seed])
+	return from_rows(ratings, _RATINGS, backend, 'pomeroy_ratings', typed)
+
+
+@instrumented
+def get_pomeroy_ratings(browser: CloudScraper, season: Optional[str]=None, typed: bool=False, backend: str='pandas'):
     """
     Scrapes the Pomeroy College Basketball Ratings table (https://kenpom.com/index.php) into a dataframe.
 
@@ -37,21 +63,31 @@ def get_pomeroy_ratings(browser: CloudScraper, season: Optional[str]=None):
             by the `login` function.
         season (str, optional): Used to define different seasons. 1999 is the earliest available season.
             Most recent season is the default.
+        typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the W-L record
+            split into Wins and Losses (see `schema`), instead of text. False by default.
+        backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+            or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+            default.
     Returns:
         refs_df (pandas dataframe): Pandas dataframe containing the Pomeroy College Basketball Ratings table from kenpom.com.
     Raises:
         ValueError: If `season` is less than 1999.
     """
+    is_pandas = check_backend(backend)
     url = 'https://kenpom.com/index.php'
     if season and int(season) < 1999:
         raise ValueError("season cannot be less than 1999")
     url += '?y={}'.format(season)
-    page = BeautifulSoup(get_html(browser, url), "html.parser")
-    table = page.find_all('table')[0]
-    ratings_df = pd.read_html(StringIO(str(table)))
+    page = parse_html(get_html(browser, url))
+    table = page.table(0)
+    if not season:
+        note_current_season(browser, page)
+    if not is_pandas:
+        return _ratings_table(browser, table, season, typed, backend)
+    ratings_df = read_table(table)
     # Dataframe tidying.
-    ratings_df = ratings_df[0]
     ratings_df.columns = ratings_df.columns.map(lambda x: x[1])
+    get_catalog(browser).set_teams(season, team_names(ratings_df['Team']))
     ratings_df.dropna(inplace=True)
     ratings_df = ratings_df[ratings_df['Rk'] != 'Rk']
     ratings_df.reset_index(drop=True, inplace=True)
@@ -61,21 +97,29 @@ def get_pomeroy_ratings(browser: CloudScraper, season: Optional[str]=None):
     ratings_df["Seed"] = tmp["Seed"]
     
     # Disambiguate column names for easier reference
-    ratings_df.columns = ['Rk', 'Team', 'Conf', 'W-L', 'AdjEM', 'AdjO',
-                          'AdjO.Rank', 'AdjD', 'AdjD.Rank', 'AdjT', 'AdjT.Rank',
-						  'Luck', 'Luck.Rank', 'SOS-AdjEM', 'SOS-AdjEM.Rank', 'SOS-OppO', 'SOS-OppO.Rank',
-						  'SOS-OppD', 'SOS-OppD.Rank', 'NCSOS-AdjEM', 'NCSOS-AdjEM.Rank', 'Seed']
-    
+    ratings_df.columns = _RATINGS
+
+    if typed:
+        return schema.apply(ratings_df, 'pomeroy_ratings')
+
     return ratings_df
 
 
-def get_trends(browser: CloudScraper):
+def _date_season(browser, season):
+	# Dates on these pages have no year, which comes from the season they are for.
+	return int(season) if season else get_catalog(browser).current_season()
+
+
+@instrumented
+def get_trends(browser: CloudScraper, typed: bool=False):
 	"""
 	Scrapes the statistical trends table (https://kenpom.com/trends.php) into a dataframe.
 
 	Args:
 		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
 			by the `login` function.
+		typed (bool, optional): Whether to return an integer Season column and numeric stats (see `schema`), instead
+			of text. False by default.
 
 	Returns:
 		trends_df (pandas dataframe): Pandas dataframe containing the statistical trends table from kenpom.com.
@@ -83,18 +127,20 @@ def get_trends(browser: CloudScraper):
 
 	url = 'https://kenpom.com/trends.php'
 
-	trends = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = trends.find_all('table')[0]
-	trends_df = pd.read_html(StringIO(str(table)))
+	trends = parse_html(get_html(browser, url))
+	table = trends.table(0)
+	trends_df = read_table(table)
 
 	# Dataframe tidying.
-	trends_df = trends_df[0]
 	trends_df.drop(trends_df.tail(5).index, inplace=True)
 
+	if typed:
+		return schema.apply(trends_df, 'trends')
 	return trends_df
 
 
-def get_refs(browser: CloudScraper, season: Optional[str]=None):
+@instrumented
+def get_refs(browser: CloudScraper, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes the officials rankings table (https://kenpom.com/officials.php) into a dataframe.
 
@@ -103,6 +149,8 @@ def get_refs(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 2016 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return numeric columns and the last game as a date (see `schema`), instead
+			of text. False by default.
 
 	Returns:
 		refs_df (pandas dataframe): Pandas dataframe containing the officials rankings table from kenpom.com.
@@ -119,26 +167,30 @@ def get_refs(browser: CloudScraper, season: Optional[str]=None):
 				'season cannot be less than 2016, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	refs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = refs.find_all('table')[0]
-	refs_df = pd.read_html(StringIO(str(table)))
+	refs = parse_html(get_html(browser, url))
+	table = refs.table(0)
+	refs_df = read_table(table)
 
 	# Dataframe tidying.
-	refs_df = refs_df[0]
 	refs_df.columns = ['Rank', 'Name', 'Rating', 'Games', 'Last Game', 'Game Score', 'Box']
 	refs_df = refs_df[refs_df.Rating != 'Rating']
 	refs_df = refs_df.drop(['Box'], axis=1)
 
+	if typed:
+		return schema.apply(refs_df, 'refs', season=_date_season(browser, season))
 	return refs_df
 
 
-def get_hca(browser: CloudScraper):
+@instrumented
+def get_hca(browser: CloudScraper, typed: bool=False):
 	"""
 	Scrapes the home court advantage table (https://kenpom.com/hca.php) into a dataframe.
 
 	Args:
 		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
 			by the `login` function.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns (see `schema`),
+			instead of text. False by default.
 
 	Returns:
 		hca_df (pandas dataframe): Pandas dataframe containing the home court advantage table from kenpom.com.
@@ -146,20 +198,22 @@ def get_hca(browser: CloudScraper):
 
 	url = 'https://kenpom.com/hca.php'
 
-	hca = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = hca.find_all('table')[0]
-	hca_df = pd.read_html(StringIO(str(table)))
+	hca = parse_html(get_html(browser, url))
+	table = hca.table(0)
+	hca_df = read_table(table)
 
 	# Dataframe tidying.
-	hca_df = hca_df[0]
 	hca_df.columns = ['Team', 'Conference', 'HCA', 'HCA.Rank', 'PF', 'PF.Rank', 'Pts', 'Pts.Rank', 'NST',
 						'NST.Rank', 'Blk', 'Blk.Rank', 'Elev', 'Elev.Rank']
 	hca_df = hca_df[hca_df.Team != 'Team']
 
+	if typed:
+		return schema.apply(hca_df, 'hca')
 	return hca_df
 
 
-def get_arenas(browser: CloudScraper, season: Optional[str]=None):
+@instrumented
+def get_arenas(browser: CloudScraper, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes the arenas table (https://kenpom.com/arenas.php) into a dataframe.
 
@@ -168,6 +222,8 @@ def get_arenas(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 2010 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return integer ranks and capacities and categorical teams and conferences
+			(see `schema`), instead of text. False by default.
 
 	Returns:
 		arenas_df (pandas dataframe): Pandas dataframe containing the arenas table from kenpom.com.
@@ -184,22 +240,24 @@ def get_arenas(browser: CloudScraper, season: Optional[str]=None):
 				'season cannot be less than 2010, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	arenas = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = arenas.find_all('table')[0]
-	arenas_df = pd.read_html(StringIO(str(table)))
+	arenas = parse_html(get_html(browser, url))
+	table = arenas.table(0)
+	arenas_df = read_table(table)
 
 	# Dataframe tidying.
-	arenas_df = arenas_df[0]
 	arenas_df.columns = ['Rank', 'Team', 'Conference', 'Arena', 'Alternate']
 	arenas_df[['Arena', 'Arena.Capacity']] = arenas_df['Arena'].str.split(r' \(', expand=True, regex=True)
 	arenas_df['Arena.Capacity'] = arenas_df['Arena.Capacity'].str.rstrip(')')
 	arenas_df[['Alternate', 'Alternate.Capacity']] = arenas_df['Alternate'].str.split(r' \(', expand=True, regex=True)
 	arenas_df['Alternate.Capacity'] = arenas_df['Alternate.Capacity'].str.rstrip(')')
 
+	if typed:
+		return schema.apply(arenas_df, 'arenas')
 	return arenas_df
 
 
-def get_gameattribs(browser: CloudScraper, season: Optional[str]=None, metric: str='Excitement'):
+@instrumented
+def get_gameattribs(browser: CloudScraper, season: Optional[str]=None, metric: str='Excitement', typed: bool=False):
 	"""
 	Scrapes the Game Attributes tables (https://kenpom.com/game_attrs.php) into a dataframe.
 
@@ -211,6 +269,8 @@ def get_gameattribs(browser: CloudScraper, season: Optional[str]=None, metric: s
 		metric (str, optional): Used to get highest ranking games for different metrics. Available values are:
 			'Excitement', 'Tension', 'Dominance', 'ComeBack', 'FanMatch', 'Upsets', and 'Busts'. Default is
 			'Excitement'. 'FanMatch', 'Upsets', and 'Busts' are only valid for seasons after 2010.
+		typed (bool, optional): Whether to return integer ranks, numeric values, dates and categorical locations
+			(see `schema`), instead of text. False by default.
 
 	Returns:
 		ga_df (pandas dataframe): Pandas dataframe containing the Game Attributes table from kenpom.com for a
@@ -245,28 +305,32 @@ def get_gameattribs(browser: CloudScraper, season: Optional[str]=None, metric: s
 			)
 		url = url + '&y=' + str(season)
 
-	playerstats = BeautifulSoup(get_html(browser, url), "html.parser")
+	playerstats = parse_html(get_html(browser, url))
 
-	table = playerstats.find_all('table')[0]
-	ga_df = pd.read_html(StringIO(str(table)))
+	table = playerstats.table(0)
+	ga_df = read_table(table)
 
 	# Dataframe tidying.
-	ga_df = ga_df[0]
 	ga_df.columns = ['Rank', 'Date', 'Game', 'Box', 'Location', 'Conf.Matchup', 'Value']
 	ga_df = ga_df.drop(['Box'], axis=1)
 	ga_df[['Location', 'Arena']] = ga_df['Location'].str.split(r' \(', expand=True, regex=True)
 	ga_df['Arena'] = ga_df['Arena'].str.rstrip(')')
 
+	if typed:
+		return schema.apply(ga_df, 'gameattribs', season=_date_season(browser, season))
 	return ga_df
 
 
-def get_program_ratings(browser: CloudScraper):
+@instrumented
+def get_program_ratings(browser: CloudScraper, typed: bool=False):
 	"""
 	Scrapes the program ratings table (https://kenpom.com/programs.php) into a dataframe.
 
 	Args:
 		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
 			by the `login` function.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns (see `schema`),
+			instead of text. False by default.
 
 	Returns:
 		programs_df (pandas dataframe): Pandas dataframe containing the program ratings table from kenpom.com.
@@ -274,10 +338,9 @@ def get_program_ratings(browser: CloudScraper):
 
 	url = 'https://kenpom.com/programs.php'
 
-	programs = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = programs.find_all('table')[0]
-	programs_df = pd.read_html(StringIO(str(table)))
-	programs_df = programs_df[0]
+	programs = parse_html(get_html(browser, url))
+	table = programs.table(0)
+	programs_df = read_table(table)
 
 	programs_df.columns = ['Rank', 'Team', 'Conference', 'Rating', 'kenpom.Best.Rank', 'kenpom.Best.Season', 'kenpom.Worst.Rank',
 							'kenpom.Worst.Season', 'kenpom.Median.Rank', 'kenpom.Top10.Finishes',
@@ -286,4 +349,6 @@ def get_program_ratings(browser: CloudScraper):
 
 	programs_df = programs_df[programs_df.Team != 'Team']
 
+	if typed:
+		return schema.apply(programs_df, 'program_ratings')
 	return programs_df
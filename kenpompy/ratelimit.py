@@ -0,0 +1,95 @@
+"""
+The ratelimit module provides a token bucket rate limiter that `utils.get_html` applies to every request to kenpom.com.
+"""
+
+import os
+import time
+import struct
+import threading
+from typing import Optional
+from ._FileLock import FileLock
+
+class RateLimiter:
+	"""Token bucket rate limiter shared by every request made through `utils.get_html`.
+
+	Each request reserves the next free slot in the bucket and then sleeps until that slot comes up, so concurrent
+	callers are spread out evenly and run right at `rate` instead of polling for free tokens. Up to `burst` requests
+	may go out back to back after the limiter has been idle.
+
+	Without a `path`, the bucket is shared by all threads in the process. With a `path`, the bucket state is kept in
+	that file under an exclusive lock, so every process using the same file shares one bucket.
+
+	Args:
+		rate (float, optional): Requests allowed per second on average. 1 by default.
+		burst (int, optional): Requests allowed back to back after an idle period. 1 by default.
+		path (str, optional): File to keep the bucket state in so it is shared across processes.
+
+	Attributes:
+		rate (float): Requests allowed per second on average.
+		burst (int): Requests allowed back to back after an idle period.
+		path (str or None): File the bucket state is kept in, if shared across processes.
+	"""
+
+	def __init__(self, rate: float=1.0, burst: int=1, path: Optional[str]=None):
+		if rate <= 0:
+			raise ValueError('rate must be greater than 0.')
+		if burst < 1:
+			raise ValueError('burst must be at least 1.')
+		self.rate = rate
+		self.burst = burst
+		self.path = path
+		self._next_free = 0.0
+		if path is None:
+			self._lock = threading.Lock()
+		else:
+			self._lock = FileLock(path + '.lock')
+
+	def _reserve(self, now: float):
+		interval = 1.0 / self.rate
+		# The bucket is full once `next_free` falls behind `now`; each reservation pushes it one interval ahead.
+		next_free = max(self._read(), now)
+		wait = next_free - (self.burst - 1) * interval - now
+		self._write(next_free + interval)
+		return max(wait, 0.0)
+
+	def _read(self):
+		if self.path is None:
+			return self._next_free
+		try:
+			with open(self.path, 'rb') as f:
+				return struct.unpack('<d', f.read(8))[0]
+		except (OSError, struct.error):
+			return 0.0
+
+	def _write(self, next_free: float):
+		if self.path is None:
+			self._next_free = next_free
+			return
+		tmp = self.path + '.' + str(os.getpid()) + '.tmp'
+		with open(tmp, 'wb') as f:
+			f.write(struct.pack('<d', next_free))
+		os.replace(tmp, self.path)
+
+	def reserve(self):
+		"""
+		Reserves a request slot without waiting for it.
+
+		Returns:
+			wait (float): Seconds until the reserved slot comes up.
+		"""
+
+		with self._lock:
+			return self._reserve(time.time())
+
+	def acquire(self):
+		"""
+		Blocks until the caller is allowed to make a request.
+
+		Returns:
+			waited (float): Seconds spent waiting.
+		"""
+
+		wait = self.reserve()
+		if wait > 0:
+			time.sleep(wait)
+		return wait
@@ -0,0 +1,106 @@
+"""
+The retry module provides the retry policy `utils.get_html` follows when kenpom.com or Cloudflare fails transiently.
+"""
+
+import time
+import random
+from typing import Iterable, Optional
+from email.utils import parsedate_to_datetime
+from requests.exceptions import ConnectionError, Timeout
+from cloudscraper.exceptions import CloudflareChallengeError, CloudflareLoopProtection
+
+class RetryError(Exception):
+	"""Raised by `utils.get_html` once a request has failed on every attempt allowed by the retry policy.
+
+	Attributes:
+		url (str): The url that couldn't be retrieved.
+		attempts (int): Number of attempts made.
+		status_code (int or None): Status code of the last response, or None if the last attempt raised an exception.
+	"""
+
+	def __init__(self, url: str, attempts: int, status_code: Optional[int]=None):
+		self.url = url
+		self.attempts = attempts
+		self.status_code = status_code
+		reason = f'status code: {status_code}' if status_code is not None else 'no response'
+		super().__init__(f'Failed to retrieve {url} after {attempts} attempts (last {reason})')
+
+
+def parse_retry_after(value: Optional[str]):
+	"""
+	Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+	Args:
+		value (str or None): The header value.
+
+	Returns:
+		seconds (float or None): Seconds to wait, or None if the header is missing or invalid.
+	"""
+
+	if not value:
+		return None
+	value = value.strip()
+	if value.isdigit():
+		return float(value)
+	try:
+		return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+	except (TypeError, ValueError, IndexError, OverflowError):
+		return None
+
+
+class RetryPolicy:
+	"""Retry policy with exponential backoff and jitter for requests made by `utils.get_html`.
+
+	Requests are retried on connection errors, timeouts, unsolved Cloudflare challenges and any status code in
+	`status_codes`. The wait before attempt `n + 1` is `backoff_factor * 2 ** (n - 1)` seconds, capped at
+	`max_backoff`, with up to half of it randomized when `jitter` is set. A Retry-After header sent by the server is
+	honored when it asks for a longer wait. Once `max_attempts` have been made, or the next wait would take the total
+	time past `max_time`, a `RetryError` is raised.
+
+	Args:
+		max_attempts (int, optional): Maximum number of attempts, including the first. 3 by default.
+		backoff_factor (float, optional): Seconds to wait before the first retry. 1 by default.
+		max_backoff (float, optional): Longest wait between attempts, in seconds, not counting Retry-After. 60 by default.
+		max_time (float, optional): Longest total time to spend on one url, in seconds. 300 by default.
+		jitter (bool, optional): Whether to randomize waits so concurrent retries spread out. True by default.
+		status_codes (iterable of int, optional): Status codes worth retrying. 429 and the 5xx codes used by
+			kenpom.com and Cloudflare by default.
+
+	Attributes:
+		exceptions (tuple): Exception types worth retrying.
+	"""
+
+	exceptions = (ConnectionError, Timeout, CloudflareChallengeError, CloudflareLoopProtection)
+
+	def __init__(self, max_attempts: int=3, backoff_factor: float=1.0, max_backoff: float=60.0, max_time: float=300.0,
+				 jitter: bool=True, status_codes: Iterable[int]=(429, 500, 502, 503, 504, 520, 521, 522, 523, 524)):
+		if max_attempts < 1:
+			raise ValueError('max_attempts must be at least 1.')
+		self.max_attempts = max_attempts
+		self.backoff_factor = backoff_factor
+		self.max_backoff = max_backoff
+		self.max_time = max_time
+		self.jitter = jitter
+		self.status_codes = frozenset(status_codes)
+
+	def backoff(self, attempt: int, retry_after: Optional[float]=None):
+		"""
+		Computes how long to wait after a failed attempt.
+
+		Args:
+			attempt (int): Number of the attempt that failed, starting at 1.
+			retry_after (float, optional): Seconds the server asked to wait, if any.
+
+		Returns:
+			wait (float): Seconds to wait before the next attempt.
+		"""
+
+		wait = min(self.backoff_factor * 2 ** (attempt - 1), self.max_backoff)
+		if self.jitter:
+			wait = wait / 2 + random.uniform(0, wait / 2)
+		if retry_after is not None:
+			wait = max(wait, retry_after)
+		return wait
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
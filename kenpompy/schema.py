@@ -0,0 +1,273 @@
+"""
+The schema module fixes the column dtypes of the tables returned by the getters, for calls made with `typed=True`.
+
+Each table has one schema covering every season, so columns that only exist in some seasons are added (empty) to the
+others and the dtypes of a table never depend on what a particular page held.
+
+Some pages, such as the conference pages, have columns that change with the season. Their schemas list the columns
+that are always there, and give the dtype of every other column under `OTHER`, with rank columns as `RANK`.
+"""
+
+import pandas as pd
+
+RANK = 'Int16'
+COUNT = 'Int16'
+SEED = 'Int8'
+FLOAT = 'float32'
+CATEGORY = 'category'
+STRING = 'string'
+DATE = 'datetime64[ns]'
+BOOL = 'bool'
+# A "W-L" record, split into integer Wins and Losses columns.
+RECORD = 'record'
+# Key of the dtype given to columns a schema doesn't list.
+OTHER = '*'
+
+def _ranked(*names, dtype=FLOAT):
+	# Every stat on the summary pages is followed by its rank.
+	schema = {}
+	for name in names:
+		schema[name] = dtype
+		schema[name + '.Rank'] = RANK
+	return schema
+
+
+_TEAM = {'Team': CATEGORY, 'Conference': CATEGORY}
+
+# Columns of each metric of the Player Leaders page, as named by `summary.get_playerstats`.
+PLAYER_METRICS = {
+	'ORTG': ['ORtg', 'Poss%'], 'MIN': ['MIN'], 'EFG': ['EFG'], 'POSS': ['POSS'], 'SHOTS': ['SHOTS'], 'OR': ['OR%'],
+	'DR': ['DR%'], 'TO': ['TO%'], 'ARATE': ['ARATE'], 'BLK': ['BLK'], 'FTRATE': ['FTRATE'], 'STL': ['STL'],
+	'TS': ['TS%'], 'FC40': ['FC40'], 'FD40': ['FD40'], '2P': ['2PM', '2PA', '2P%'], '3P': ['3PM', '3PA', '3P%'],
+	'FT': ['FTM', 'FTA', 'FT%'],
+}
+
+def _player_metric(column):
+	# Made and attempted shots are counts, everything else is a rate.
+	return COUNT if column[-1] in 'MA' and column[:-1] in ('2P', '3P', 'FT') else FLOAT
+
+
+def _players():
+	schema = {'PlayerID': 'Int32', 'Player': STRING, 'Team': CATEGORY, 'Ht': CATEGORY, 'Wt': COUNT, 'Yr': CATEGORY}
+	for metric, columns in PLAYER_METRICS.items():
+		for column in columns:
+			schema[column] = _player_metric(column)
+		schema[metric + '.Rank'] = RANK
+	return schema
+
+_FANMATCH_GAMES = {
+	'Game': STRING, 'Location': CATEGORY, 'ThrillScore': FLOAT, 'Comeback': FLOAT, 'Excitement': FLOAT,
+	'ThrillScoreRank': RANK, 'ExcitementRank': RANK, 'ComebackRank': RANK, 'MVP': STRING, 'Tournament': CATEGORY,
+	'Possessions': COUNT, 'PredictedWinner': CATEGORY, 'PredictedScore': STRING, 'WinProbability': FLOAT,
+	'PredictedPossessions': COUNT, 'PredictedMOV': COUNT, 'PredictedLoser': CATEGORY, 'OT': CATEGORY,
+	'Loser': CATEGORY, 'LoserRank': RANK, 'LoserScore': COUNT, 'Winner': CATEGORY, 'WinnerRank': RANK,
+	'WinnerScore': COUNT, 'ActualMOV': COUNT,
+}
+
+# Columns of both kPOY tables, after the leader's stat.
+_KPOY = {'Weight': COUNT, 'Year': CATEGORY, 'Hometown': STRING, 'Team': CATEGORY, 'Height': CATEGORY}
+
+SCHEMAS = {
+	'pomeroy_ratings': {
+		'Rk': RANK, 'Team': CATEGORY, 'Conf': CATEGORY, 'W-L': RECORD, 'AdjEM': FLOAT,
+		**_ranked('AdjO', 'AdjD', 'AdjT', 'Luck', 'SOS-AdjEM', 'SOS-OppO', 'SOS-OppD', 'NCSOS-AdjEM'),
+		'Seed': SEED,
+	},
+	'efficiency': {
+		**_TEAM,
+		**_ranked('Tempo-Adj', 'Tempo-Raw', 'Avg. Poss Length-Offense', 'Avg. Poss Length-Defense',
+				  'Off. Efficiency-Adj', 'Off. Efficiency-Raw', 'Def. Efficiency-Adj', 'Def. Efficiency-Raw'),
+	},
+	'fourfactors': {
+		**_TEAM,
+		**_ranked('AdjTempo', 'AdjOE', 'Off-eFG%', 'Off-TO%', 'Off-OR%', 'Off-FTRate', 'AdjDE', 'Def-eFG%', 'Def-TO%',
+				  'Def-OR%', 'Def-FTRate'),
+	},
+	'teamstats': {
+		**_TEAM,
+		**_ranked('3P%', '2P%', 'FT%', 'Blk%', 'Stl%', 'NST%', 'A%', '3PA%', 'AdjOE'),
+	},
+	'teamstats_defense': {
+		**_TEAM,
+		**_ranked('3P%', '2P%', 'FT%', 'Blk%', 'Stl%', 'NST%', 'A%', '3PA%', 'AdjDE'),
+	},
+	'pointdist': {
+		**_TEAM,
+		**_ranked('Off-FT', 'Off-2P', 'Off-3P', 'Def-FT', 'Def-2P', 'Def-3P'),
+	},
+	'height': {
+		**_TEAM,
+		**_ranked('AvgHgt', 'EffHgt', 'C-Hgt', 'PF-Hgt', 'SF-Hgt', 'SG-Hgt', 'PG-Hgt', 'Experience', 'Bench',
+				  'Continuity'),
+	},
+	# Each metric of the Player Leaders page only has some of these columns, see `apply`.
+	'playerstats': {
+		'Rank': RANK, 'Player': STRING, 'Team': CATEGORY,
+		**{column: _player_metric(column) for columns in PLAYER_METRICS.values() for column in columns},
+		'Ht': CATEGORY, 'Wt': COUNT, 'Yr': CATEGORY,
+	},
+	# Every metric of the Player Leaders page, one row per player.
+	'players': _players(),
+	'schedule': {
+		'Date': DATE, 'Team Rank': RANK, 'Opponent Rank': RANK, 'Opponent Name': CATEGORY, 'Result': STRING,
+		'Possession Number': COUNT, 'Location': CATEGORY, 'Record': RECORD, 'Conference': CATEGORY,
+		'Postseason': CATEGORY,
+	},
+	'season_schedule': {
+		'Team': CATEGORY, 'Date': DATE, 'Team Rank': RANK, 'Opponent Rank': RANK, 'Opponent Name': CATEGORY,
+		'Result': STRING, 'Possession Number': COUNT, 'Location': CATEGORY, 'Record': RECORD, 'Conference': CATEGORY,
+		'Postseason': CATEGORY,
+	},
+	'games': {
+		'Date': DATE, 'Team1': CATEGORY, 'Team2': CATEGORY, 'HomeTeam': CATEGORY, 'Winner': CATEGORY,
+		'Loser': CATEGORY, 'WinnerScore': COUNT, 'LoserScore': COUNT, 'Possessions': COUNT, 'Postseason': CATEGORY,
+	},
+	'fanmatch': {'Date': DATE, **_FANMATCH_GAMES},
+	# The games of a single FanMatch page, as in `FanMatch.fm_df`.
+	'fanmatch_day': _FANMATCH_GAMES,
+	'fanmatch_summary': {
+		'Date': DATE, 'Games': COUNT, 'ppg': FLOAT, 'avg_eff': FLOAT, 'pos_40': FLOAT,
+		'mean_abs_err_pred_total_score': FLOAT, 'bias_pred_total_score': FLOAT, 'mean_abs_err_pred_mov': FLOAT,
+		'record_favs': STRING, 'expected_record_favs': STRING, 'exact_mov': STRING, 'Complete': BOOL,
+	},
+	'trends': {'Season': COUNT, OTHER: FLOAT},
+	'refs': {'Rank': RANK, 'Name': STRING, 'Rating': FLOAT, 'Games': COUNT, 'Last Game': DATE, 'Game Score': STRING},
+	'hca': {**_TEAM, **_ranked('HCA', 'PF', 'Pts', 'NST', 'Blk', 'Elev')},
+	'arenas': {
+		'Rank': RANK, 'Team': CATEGORY, 'Conference': CATEGORY, 'Arena': STRING, 'Alternate': STRING,
+		'Arena.Capacity': 'Int32', 'Alternate.Capacity': 'Int32',
+	},
+	'gameattribs': {
+		'Rank': RANK, 'Date': DATE, 'Game': STRING, 'Location': CATEGORY, 'Conf.Matchup': CATEGORY, 'Value': FLOAT,
+		'Arena': CATEGORY,
+	},
+	'program_ratings': {
+		'Rank': RANK, 'Team': CATEGORY, 'Conference': CATEGORY, 'Rating': FLOAT, 'kenpom.Best.Rank': RANK,
+		'kenpom.Best.Season': COUNT, 'kenpom.Worst.Rank': RANK, 'kenpom.Worst.Season': COUNT,
+		'kenpom.Median.Rank': FLOAT, 'kenpom.Top10.Finishes': COUNT, 'kenpom.Top25.Finishes': COUNT,
+		'kenpom.Top50.Finishes': COUNT, 'NCAA.Champs': COUNT, 'NCAA.F4': COUNT, 'NCAA.S16': COUNT, 'NCAA.R1': COUNT,
+		'Change': FLOAT,
+	},
+	# The tables of a conference page, whose stats change with the season.
+	'conference_standings': {'Team': CATEGORY, 'W-L': RECORD, 'Seed': SEED, OTHER: FLOAT},
+	'conference_offense': {'Team': CATEGORY, OTHER: FLOAT},
+	'conference_defense': {'Team': CATEGORY, OTHER: FLOAT},
+	# Aggregate stats of one conference, indexed by stat, and of every conference, indexed by conference.
+	'aggregate_stats': {'Value': FLOAT, 'Rank': RANK},
+	'conference_stats': {OTHER: FLOAT},
+	'kpoy': {'Rank': RANK, 'Player': STRING, 'KPOY Rating': FLOAT, **_KPOY},
+	'kpoy_mvp': {'Rank': RANK, 'Player': STRING, 'Game MVPs': COUNT, **_KPOY},
+}
+
+
+def _missing(index):
+	return pd.Series(float('nan'), index=index, dtype=object)
+
+
+def _season_dates(dates, season):
+	# Schedules show dates such as "Sat Dec 15" and the officials page such as "Sat 4/6", without the year. Games from
+	# July onwards belong to the next season.
+	text = dates.astype(STRING)
+	year = ' ' + str(int(season))
+	days = text.str.extract(r'^\s*[A-Za-z]{3}\s+([A-Za-z]{3}\s+\d{1,2})\s*$', expand=False)
+	numeric = text.str.extract(r'^\s*[A-Za-z]{3}\s+(\d{1,2}/\d{1,2})\s*$', expand=False)
+	dates = pd.to_datetime(days + year, format='%b %d %Y', errors='coerce')
+	dates = dates.fillna(pd.to_datetime(numeric + year, format='%m/%d %Y', errors='coerce'))
+	return dates.where(dates.dt.month < 7, dates - pd.DateOffset(years=1))
+
+
+def convert(values, dtype: str, season=None):
+	"""
+	Converts a column to one of the schema dtypes.
+
+	Numbers are read leniently: percent signs and thousands separators are dropped and anything that isn't a number,
+	such as an empty cell, becomes missing.
+
+	Args:
+		values (pandas series): The column, as returned by an untyped getter.
+		dtype (str): One of the dtypes in this module, such as `RANK` or `CATEGORY`.
+		season (int, optional): Season the values are from, which gives the year of dates shown without one, such as
+			"Sat Dec 15" on team schedules or "Sat 4/6" on the officials page. Other dates are read as "YYYY-MM-DD",
+			with or without a season.
+
+	Returns:
+		values (pandas series): The converted column.
+	"""
+
+	if dtype == CATEGORY:
+		return values.where(values.notna() & (values != '')).astype(CATEGORY)
+	if dtype == STRING:
+		return values.astype(STRING)
+	if dtype == DATE:
+		if not pd.api.types.is_datetime64_any_dtype(values):
+			dates = pd.to_datetime(values, errors='coerce', format='ISO8601')
+			if season is not None:
+				# Only dates shown without a year take it from the season.
+				dates = dates.fillna(_season_dates(values, season))
+			values = dates
+		return values.astype(DATE)
+	if dtype == BOOL:
+		return values.fillna(False).astype(BOOL)
+	if not pd.api.types.is_numeric_dtype(values):
+		values = values.astype(STRING).str.strip().str.rstrip('%').str.replace(',', '', regex=False)
+	return pd.to_numeric(values, errors='coerce').astype(dtype)
+
+
+def split_record(values):
+	"""
+	Splits "W-L" records into wins and losses.
+
+	Args:
+		values (pandas series): Records such as "25-4".
+
+	Returns:
+		wins, losses (tuple of pandas series): The wins and losses, as `COUNT` columns.
+	"""
+
+	record = values.astype(STRING).str.extract(r'^\s*(\d+)-(\d+)\s*$')
+	return convert(record[0], COUNT), convert(record[1], COUNT)
+
+
+def apply(df: pd.DataFrame, table: str, fill: bool=True, season=None):
+	"""
+	Gives a table returned by a getter the dtypes of its schema.
+
+	Args:
+		df (pandas dataframe): The table, as returned by the getter.
+		table (str): Name of the schema in `SCHEMAS`, such as 'efficiency'.
+		fill (bool, optional): Whether to add the schema's columns missing from `df`, so that the table has exactly the
+			columns of the schema. True by default. When False, only the columns `df` has are kept, in schema order.
+		season (int, optional): Season of the table, needed to read dates shown without a year (see `convert`).
+
+	Returns:
+		typed_df (pandas dataframe): The typed table. Columns not in the schema are dropped, unless it gives their dtype
+			under `OTHER`.
+
+	Raises:
+		KeyError if `table` has no schema.
+	"""
+
+	schema = SCHEMAS[table]
+	columns = {}
+	for column, dtype in schema.items():
+		if column == OTHER:
+			# The columns the schema doesn't list, in table order.
+			for other in df.columns:
+				if other not in schema and other not in columns:
+					columns[other] = convert(df[other], RANK if str(other).endswith('.Rank') else dtype, season)
+			continue
+		if dtype == RECORD and column not in df.columns and 'Wins' in df.columns:
+			# Already split, such as in a table that was typed before.
+			columns['Wins'], columns['Losses'] = convert(df['Wins'], COUNT), convert(df['Losses'], COUNT)
+			continue
+		if column in df.columns:
+			values = df[column]
+		elif fill:
+			values = _missing(df.index)
+		else:
+			continue
+		if dtype == RECORD:
+			columns['Wins'], columns['Losses'] = split_record(values)
+		else:
+			columns[column] = convert(values, dtype, season)
+	return pd.DataFrame(columns, index=df.index)
@@ -0,0 +1,344 @@
+"""
+The store module keeps kenpom.com tables in a local SQLite database, refreshed incrementally.
+
+`Store.sync` records every (table, season, params) combination it loads. Later syncs only fetch the combinations that
+are missing or stale, and upsert them into one indexed table per kenpom.com table. `Store.read` and `Store.query` then
+work from the database alone, with no browser and no network.
+
+Loads of past seasons are final and never fetched again. Loads of the current season go stale after `ttl` seconds.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import pandas as pd
+from cloudscraper import CloudScraper
+from typing import Iterable, Optional, Union
+from . import bulk, schema, summary, team
+from .FanMatch import get_fanmatch
+from .catalog import get_catalog
+
+def _season_table(table):
+	def load(browser, season, previous, **params):
+		return bulk.TABLES[table](browser, season=season, typed=True)
+	return load
+
+
+def _load_schedule(browser, season, previous, **params):
+	return team.get_season_schedule(browser, season, typed=True)
+
+
+def _load_games(browser, season, previous, **params):
+	return team.get_season_games(browser, season, typed=True).reset_index()
+
+
+def _load_players(browser, season, previous, **params):
+	players_df = summary.get_all_playerstats(browser, season=season, typed=True, **params)
+	# Players are told apart by the id of their player page, or by name and team where there is no link.
+	fallback = players_df['Player'].astype(str) + ' | ' + players_df['Team'].astype(str)
+	return players_df.assign(PlayerKey=players_df['PlayerID'].astype('string').fillna(fallback))
+
+
+def _load_fanmatch(browser, season, previous, **params):
+	# Days that were already complete are kept from the store, so only the rest are fetched.
+	games_df, summary_df = get_fanmatch(browser, season=season, previous=previous, typed=True)
+	return games_df, summary_df
+
+
+# Tables the store can sync: schema name, key columns within a season, loader and the getter parameters it accepts.
+TABLES = {
+	**{table: (table, ('Team',), _season_table(table), ()) for table in bulk.TABLES},
+	'schedule': ('season_schedule', ('Team', 'Date', 'Opponent Name'), _load_schedule, ()),
+	'games': ('games', ('GameID',), _load_games, ()),
+	'players': ('players', ('PlayerKey',), _load_players, ('conf', 'conf_only')),
+	'fanmatch': ('fanmatch', ('Date', 'Game'), _load_fanmatch, ()),
+}
+
+# Tables written alongside another one, rather than synced on their own.
+_COMPANIONS = {'fanmatch': 'fanmatch_summary'}
+
+# Schema name and key columns of every stored table.
+_STORED = {
+	**{table: (schema_name, keys) for table, (schema_name, keys, _, _) in TABLES.items()},
+	'fanmatch_summary': ('fanmatch_summary', ('Date',)),
+}
+
+_SQL_TYPES = {'Int8': 'INTEGER', 'Int16': 'INTEGER', 'Int32': 'INTEGER', schema.FLOAT: 'REAL', schema.BOOL: 'INTEGER'}
+
+def _source(table):
+	try:
+		return TABLES[table]
+	except KeyError:
+		raise KeyError('table is invalid, must be one of: ' + ', '.join(TABLES)) from None
+
+
+def _quote(name):
+	return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(table_schema, keys):
+	# Columns of a stored table, with their SQL types, after the Season and Params columns every table has.
+	columns = {}
+	for column, dtype in table_schema.items():
+		if dtype == schema.RECORD:
+			columns['Wins'] = columns['Losses'] = 'INTEGER'
+		else:
+			columns[column] = _SQL_TYPES.get(dtype, 'TEXT')
+	if 'GameID' in keys:
+		columns = {'GameID': 'INTEGER', **columns}
+	if 'PlayerKey' in keys:
+		# The PlayerID, or the name and team of players without one, as text. Not part of the schema, so not read back.
+		columns['PlayerKey'] = 'TEXT'
+	return columns
+
+
+def _params_key(params):
+	return json.dumps(params, sort_keys=True)
+
+
+def _sql_values(df):
+	# SQLite takes plain Python values, with None for anything missing. Dates are stored as ISO text.
+	df = df.copy()
+	for column in df.columns:
+		if pd.api.types.is_datetime64_any_dtype(df[column]):
+			df[column] = df[column].dt.strftime('%Y-%m-%d')
+		elif column == 'GameID':
+			# Game IDs are unsigned 64-bit hashes, stored bit for bit in SQLite's signed integers.
+			df[column] = df[column].to_numpy().astype('uint64').view('int64')
+	df = df.astype(object)
+	return df.where(df.notna(), None).itertuples(index=False, name=None)
+
+
+class Store:
+	"""Local SQLite database of kenpom.com tables.
+
+	Every table in `TABLES` is stored with the columns of its schema (see `schema`), plus a Season column and a Params
+	column holding the getter parameters it was loaded with, and is indexed on its key. A `_loads` table records when
+	each (table, season, params) combination was loaded.
+
+	Args:
+		path (str): Database file. Created if it doesn't exist. Use ':memory:' for a store that isn't kept.
+		ttl (float, optional): Seconds before a load of the current season goes stale. Six hours by default. Use None
+			to never refresh loads once made.
+
+	Attributes:
+		path (str): Database file.
+		ttl (float or None): Seconds before a load of the current season goes stale.
+	"""
+
+	def __init__(self, path: str, ttl: Optional[float]=6 * 3600):
+		self.path = path
+		self.ttl = ttl
+		# Syncs can be run from any thread, such as through `aio.run`, one at a time.
+		self._lock = threading.RLock()
+		self._connection = sqlite3.connect(path, check_same_thread=False)
+		with self._lock, self._connection:
+			self._connection.execute('CREATE TABLE IF NOT EXISTS _loads (tbl TEXT NOT NULL, Season INTEGER NOT NULL, '
+									 'Params TEXT NOT NULL, LoadedAt REAL NOT NULL, Final INTEGER NOT NULL, '
+									 'Rows INTEGER NOT NULL, PRIMARY KEY (tbl, Season, Params))')
+			for table, (schema_name, keys) in _STORED.items():
+				self._create(table, schema_name, keys)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	def close(self):
+		"""
+		Closes the database.
+		"""
+
+		self._connection.close()
+
+	def _create(self, table, schema_name, keys):
+		columns = _columns(schema.SCHEMAS[schema_name], keys)
+		existing = [row[1] for row in self._connection.execute('PRAGMA table_info(' + _quote(table) + ')')]
+		if not existing:
+			definitions = ['Season INTEGER NOT NULL', 'Params TEXT NOT NULL', 'LoadedAt REAL NOT NULL']
+			definitions += [_quote(column) + ' ' + sql_type for column, sql_type in columns.items()]
+			self._connection.execute('CREATE TABLE ' + _quote(table) + ' (' + ', '.join(definitions) + ')')
+		else:
+			# Columns added to a schema since the table was created.
+			for column, sql_type in columns.items():
+				if column not in existing:
+					self._connection.execute('ALTER TABLE ' + _quote(table) + ' ADD COLUMN ' + _quote(column) + ' '
+											 + sql_type)
+		key = ('Season', 'Params', *keys)
+		indexed = [row[2] for row in self._connection.execute('PRAGMA index_info(' + _quote(table + '_key') + ')')]
+		if indexed and tuple(indexed) != key:
+			# The table was created with an older key.
+			self._connection.execute('DROP INDEX ' + _quote(table + '_key'))
+		self._connection.execute('CREATE UNIQUE INDEX IF NOT EXISTS ' + _quote(table + '_key') + ' ON '
+								 + _quote(table) + ' (' + ', '.join(_quote(column) for column in key) + ')')
+
+	def loads(self):
+		"""
+		Lists every (table, season, params) combination loaded so far.
+
+		Returns:
+			loads_df (pandas dataframe): One row per combination, with the table, season, params (as JSON), when it was
+				loaded (seconds since the epoch), whether the season was over by then and how many rows it had.
+		"""
+
+		with self._lock:
+			loads_df = pd.read_sql_query('SELECT * FROM _loads ORDER BY tbl, Season, Params', self._connection)
+		return loads_df.rename(columns={'tbl': 'Table'})
+
+	def _loaded(self, table, season, params_key):
+		with self._lock:
+			return self._connection.execute('SELECT LoadedAt, Final FROM _loads WHERE tbl = ? AND Season = ? AND Params = ?',
+											(table, int(season), params_key)).fetchone()
+
+	def is_stale(self, table: str, season: int, **params):
+		"""
+		Checks whether a (table, season, params) combination has to be fetched.
+
+		Args:
+			table (str): Name of the table, one of the keys of `TABLES`.
+			season (int): The season.
+			**params: Getter parameters, such as `conf` for 'players'.
+
+		Returns:
+			stale (bool): True if it was never loaded, or was loaded while the season was still going more than `ttl`
+				seconds ago.
+		"""
+
+		row = self._loaded(table, season, _params_key(params))
+		if row is None:
+			return True
+		loaded_at, final = row
+		return not final and self.ttl is not None and time.time() - loaded_at >= self.ttl
+
+	def sync(self, browser: CloudScraper, tables: Union[str, Iterable[str]], seasons: Union[int, Iterable[int], None]=None,
+			 force: bool=False, **params):
+		"""
+		Fetches the (table, season) combinations that are missing or stale, and upserts them into the store.
+
+		Rows of a combination that are no longer on kenpom.com, such as a rescheduled game, are removed once it is
+		loaded again. FanMatch is refreshed day by day: days that were already complete are kept as stored.
+
+		Args:
+			browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+				by the `login` function.
+			tables (str or iterable): Tables to sync, from the keys of `TABLES`.
+			seasons (int or iterable, optional): Seasons to sync. The current season by default.
+			force (bool, optional): Whether to fetch every combination, even the ones that are up to date. False by
+				default.
+			**params: Getter parameters, for tables that take them, such as `conf` and `conf_only` for 'players'.
+
+		Returns:
+			synced (list): The (table, season) combinations that were fetched.
+
+		Raises:
+			KeyError if a table is invalid.
+			ValueError if a table doesn't accept one of `params`.
+		"""
+
+		tables = [tables] if isinstance(tables, str) else list(tables)
+		for table in tables:
+			unknown = set(params) - set(_source(table)[3])
+			if unknown:
+				raise ValueError(table + ' does not take the parameters: ' + ', '.join(sorted(unknown)))
+		current_season = int(get_catalog(browser).current_season())
+		if seasons is None:
+			seasons = [current_season]
+		elif isinstance(seasons, int):
+			seasons = [seasons]
+
+		synced = []
+		for table in tables:
+			for season in seasons:
+				if force or self.is_stale(table, season, **params):
+					self._load(browser, table, int(season), current_season, params)
+					synced.append((table, int(season)))
+		return synced
+
+	def _load(self, browser, table, season, current_season, params):
+		_, keys, loader, _ = _source(table)
+		params_key = _params_key(params)
+		previous = None
+		if table in _COMPANIONS and self._loaded(table, season, params_key):
+			previous = tuple(self.read(name, season, **params).drop(columns='Season') for name in (table, _COMPANIONS[table]))
+		result = loader(browser, season, previous, **params)
+
+		loaded_at = time.time()
+		with self._lock, self._connection:
+			if table in _COMPANIONS:
+				result, companion_df = result
+				companion = _COMPANIONS[table]
+				self._upsert(companion, _STORED[companion][1], companion_df, season, params_key, loaded_at)
+			self._upsert(table, keys, result, season, params_key, loaded_at)
+			self._connection.execute('INSERT OR REPLACE INTO _loads VALUES (?, ?, ?, ?, ?, ?)',
+									 (table, season, params_key, loaded_at, int(season < current_season), len(result)))
+
+	def _upsert(self, table, keys, df, season, params_key, loaded_at):
+		columns = ['Season', 'Params', 'LoadedAt'] + list(df.columns)
+		df = df.copy()
+		df.insert(0, 'Season', season)
+		df.insert(1, 'Params', params_key)
+		df.insert(2, 'LoadedAt', loaded_at)
+		conflict = ', '.join(_quote(column) for column in ('Season', 'Params', *keys))
+		updates = ', '.join(_quote(column) + ' = excluded.' + _quote(column) for column in columns if column not in keys)
+		sql = ('INSERT INTO ' + _quote(table) + ' (' + ', '.join(_quote(column) for column in columns) + ') VALUES ('
+			   + ', '.join('?' * len(columns)) + ') ON CONFLICT (' + conflict + ') DO UPDATE SET ' + updates)
+		self._connection.executemany(sql, _sql_values(df))
+		# Rows this load didn't touch are gone from kenpom.com.
+		self._connection.execute('DELETE FROM ' + _quote(table) + ' WHERE Season = ? AND Params = ? AND LoadedAt < ?',
+								 (season, params_key, loaded_at))
+
+	def read(self, table: str, seasons: Union[int, Iterable[int], None]=None, **params):
+		"""
+		Reads a table from the store, without going to kenpom.com.
+
+		Args:
+			table (str): Name of the table, one of the keys of `TABLES` or 'fanmatch_summary'.
+			seasons (int or iterable, optional): Seasons to read. Every stored season by default.
+			**params: Getter parameters the table was synced with, such as `conf` for 'players'.
+
+		Returns:
+			table_df (pandas dataframe): The table, typed as with `typed=True` (see `schema`), with a Season column
+				first. Games are indexed by GameID, as returned by `team.get_season_games`.
+
+		Raises:
+			KeyError if `table` is invalid.
+		"""
+
+		if table not in _STORED:
+			raise KeyError('table is invalid, must be one of: ' + ', '.join(_STORED))
+		schema_name = _STORED[table][0]
+
+		sql = 'SELECT * FROM ' + _quote(table) + ' WHERE Params = ?'
+		args = [_params_key(params)]
+		if seasons is not None:
+			seasons = [seasons] if isinstance(seasons, int) else [int(season) for season in seasons]
+			sql += ' AND Season IN (' + ', '.join('?' * len(seasons)) + ')'
+			args += seasons
+		with self._lock:
+			stored_df = pd.read_sql_query(sql + ' ORDER BY Season, rowid', self._connection, params=args)
+
+		table_df = schema.apply(stored_df, schema_name)
+		table_df.insert(0, 'Season', schema.convert(stored_df['Season'], schema.COUNT))
+		if 'GameID' in stored_df.columns:
+			game_ids = stored_df['GameID'].to_numpy().astype('int64').view('uint64')
+			table_df.index = pd.Index(game_ids, name='GameID')
+		return table_df
+
+	def query(self, sql: str, params=()):
+		"""
+		Runs an SQL query against the store, without going to kenpom.com.
+
+		Tables are named as in `TABLES`, with a Season and Params column added. Dates are stored as "YYYY-MM-DD" text.
+
+		Args:
+			sql (str): The query.
+			params (sequence or dict, optional): Values for the query's placeholders.
+
+		Returns:
+			result_df (pandas dataframe): The rows the query returned.
+		"""
+
+		with self._lock:
+			return pd.read_sql_query(sql, self._connection, params=params)
@@ -3,15 +3,69 @@ This module provides functions for scraping the summary stats kenpom.com pages i
 usable pandas dataframes.
 """
 
-import pandas as pd
 import re
-from io import StringIO
+import pandas as pd
 from cloudscraper import CloudScraper
-from bs4 import BeautifulSoup
-from typing import Optional
-from .utils import get_html
-
-def get_efficiency(browser: CloudScraper, season: Optional[str]=None):
+from typing import Optional, Union, Iterable
+from .utils import get_html, get_html_many
+from .tables import parse_html, read_table, table_rows, _cell_text
+from .instrument import instrumented
+from .catalog import get_catalog
+from .backend import check_backend, from_rows
+from . import schema
+
+# Url parameter of each Player Leaders metric.
+_PLAYER_METRICS = {'ORTG': 'ORtg', 'MIN': 'PctMin', 'EFG': 'eFG', 'POSS': 'PctPoss', 'SHOTS': 'PctShots', 'OR': 'ORPct',
+				   'DR': 'DRPct', 'TO': 'TORate', 'ARATE': 'ARate', 'BLK': 'PctBlocks', 'FTRATE': 'FTRate',
+				   'STL': 'PctStls', 'TS': 'TS', 'FC40': 'FCper40', 'FD40': 'FDper40', '2P': 'FG2Pct', '3P': 'FG3Pct',
+				   'FT': 'FTPct'}
+_PLAYER_BIO = ['PlayerID', 'Player', 'Team', 'Ht', 'Wt', 'Yr']
+_RE_PLAYER_ID = re.compile(r'player\.php\?(?:.*&)?p=(\d+)')
+_RE_SEED = re.compile(r'\d+')
+
+# Columns of the team tables.
+_EFFICIENCY = ['Team', 'Conference', 'Tempo-Adj', 'Tempo-Adj.Rank', 'Tempo-Raw', 'Tempo-Raw.Rank',
+			   'Avg. Poss Length-Offense', 'Avg. Poss Length-Offense.Rank', 'Avg. Poss Length-Defense',
+			   'Avg. Poss Length-Defense.Rank', 'Off. Efficiency-Adj', 'Off. Efficiency-Adj.Rank', 'Off. Efficiency-Raw',
+			   'Off. Efficiency-Raw.Rank', 'Def. Efficiency-Adj', 'Def. Efficiency-Adj.Rank', 'Def. Efficiency-Raw',
+			   'Def. Efficiency-Raw.Rank']
+_EFFICIENCY_BEFORE_2010 = [column for column in _EFFICIENCY if not column.startswith('Avg. Poss Length')]
+_FOURFACTORS = ['Team', 'Conference', 'AdjTempo', 'AdjTempo.Rank', 'AdjOE', 'AdjOE.Rank', 'Off-eFG%', 'Off-eFG%.Rank',
+				'Off-TO%', 'Off-TO%.Rank', 'Off-OR%', 'Off-OR%.Rank', 'Off-FTRate', 'Off-FTRate.Rank', 'AdjDE',
+				'AdjDE.Rank', 'Def-eFG%', 'Def-eFG%.Rank', 'Def-TO%', 'Def-TO%.Rank', 'Def-OR%', 'Def-OR%.Rank',
+				'Def-FTRate', 'Def-FTRate.Rank']
+# Followed by AdjOE or AdjDE.
+_TEAMSTATS = ['Team', 'Conference', '3P%', '3P%.Rank', '2P%', '2P%.Rank', 'FT%', 'FT%.Rank', 'Blk%', 'Blk%.Rank',
+			  'Stl%', 'Stl%.Rank', 'NST%', 'NST%.Rank', 'A%', 'A%.Rank', '3PA%', '3PA%.Rank']
+_POINTDIST = ['Team', 'Conference', 'Off-FT', 'Off-FT.Rank', 'Off-2P', 'Off-2P.Rank', 'Off-3P', 'Off-3P.Rank', 'Def-FT',
+			  'Def-FT.Rank', 'Def-2P', 'Def-2P.Rank', 'Def-3P', 'Def-3P.Rank']
+_HEIGHT = ['Team', 'Conference', 'AvgHgt', 'AvgHgt.Rank', 'EffHgt', 'EffHgt.Rank', 'C-Hgt', 'C-Hgt.Rank', 'PF-Hgt',
+		   'PF-Hgt.Rank', 'SF-Hgt', 'SF-Hgt.Rank', 'SG-Hgt', 'SG-Hgt.Rank', 'PG-Hgt', 'PG-Hgt.Rank', 'Experience',
+		   'Experience.Rank', 'Bench', 'Bench.Rank', 'Continuity', 'Continuity.Rank']
+_HEIGHT_BEFORE_2008 = _HEIGHT[:20]
+
+def _text_rows(table):
+	# The text of a table's rows, and its number of columns, for backends other than pandas.
+	head, body, foot = table_rows(table)
+	return body + foot, max(len(row) for row in head + body + foot)
+
+
+def _team_table(rows, columns, table, typed, backend):
+	# Tidies the rows of a team table the way the getters tidy their dataframes, without pandas.
+	tidy = []
+	for row in rows:
+		row = (row + [''] * len(columns))[:len(columns)]
+		# Remove the header rows that are interjected for readability, and incomplete rows.
+		if row[0] == 'Team' or '' in row:
+			continue
+		# Remove NCAA tourny seeds for previous seasons.
+		row[0] = _RE_SEED.sub('', row[0]).rstrip()
+		tidy.append(row)
+	return from_rows(tidy, columns, backend, table, typed)
+
+
+@instrumented
+def get_efficiency(browser: CloudScraper, season: Optional[str]=None, typed: bool=False, backend: str='pandas'):
 	"""
 	Scrapes the Efficiency stats table (https://kenpom.com/summary.php) into a dataframe.
 
@@ -20,6 +74,11 @@ def get_efficiency(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season but 
 			possession length data wasn't available until 2010. Most recent season is the default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the same
+			columns for every season (see `schema`), instead of text. False by default.
+		backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+			or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+			default.
 
 	Returns:
 		eff_df (pandas dataframe): Pandas dataframe containing the summary efficiency/tempo table from kenpom.com.
@@ -28,6 +87,7 @@ def get_efficiency(browser: CloudScraper, season: Optional[str]=None):
 		ValueError: If `season` is less than 1999.
 	"""
 
+	is_pandas = check_backend(backend)
 	url = 'https://kenpom.com/summary.php'
 
 	if season:
@@ -36,27 +96,22 @@ def get_efficiency(browser: CloudScraper, season: Optional[str]=None):
 				'season cannot be less than 1999, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	eff = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = eff.find_all('table')[0]
-	eff_df = pd.read_html(StringIO(str(table)))
+	eff = parse_html(get_html(browser, url))
+	table = eff.table(0)
+	if not is_pandas:
+		rows, width = _text_rows(table)
+		return _team_table(rows, _EFFICIENCY if width == 18 else _EFFICIENCY_BEFORE_2010, 'efficiency', typed, backend)
+	eff_df = read_table(table)
 
 	# Dataframe tidying.
-	eff_df = eff_df[0]
 
 	# Handle seasons prior to 2010 having fewer columns.
 	if len(eff_df.columns) == 18:
 		eff_df = eff_df.iloc[:, 0:18]
-		eff_df.columns = ['Team', 'Conference', 'Tempo-Adj', 'Tempo-Adj.Rank', 'Tempo-Raw', 'Tempo-Raw.Rank',
-						  'Avg. Poss Length-Offense', 'Avg. Poss Length-Offense.Rank', 'Avg. Poss Length-Defense',
-						  'Avg. Poss Length-Defense.Rank', 'Off. Efficiency-Adj', 'Off. Efficiency-Adj.Rank',
-						  'Off. Efficiency-Raw', 'Off. Efficiency-Raw.Rank', 'Def. Efficiency-Adj',
-						  'Def. Efficiency-Adj.Rank', 'Def. Efficiency-Raw', 'Def. Efficiency-Raw.Rank']
+		eff_df.columns = _EFFICIENCY
 	else:
 		eff_df = eff_df.iloc[:, 0:14]
-		eff_df.columns = ['Team', 'Conference', 'Tempo-Adj', 'Tempo-Adj.Rank', 'Tempo-Raw', 'Tempo-Raw.Rank',
-						  'Off. Efficiency-Adj', 'Off. Efficiency-Adj.Rank', 'Off. Efficiency-Raw',
-						  'Off. Efficiency-Raw.Rank', 'Def. Efficiency-Adj', 'Def. Efficiency-Adj.Rank',
-						  'Def. Efficiency-Raw', 'Def. Efficiency-Raw.Rank']
+		eff_df.columns = _EFFICIENCY_BEFORE_2010
 
 	# Remove the header rows that are interjected for readability.
 	eff_df = eff_df[eff_df.Team != 'Team']
@@ -65,10 +120,14 @@ def get_efficiency(browser: CloudScraper, season: Optional[str]=None):
 	eff_df['Team'] = eff_df['Team'].str.rstrip()
 	eff_df = eff_df.dropna()
 
+	if typed:
+		return schema.apply(eff_df, 'efficiency')
+
 	return eff_df
 
 
-def get_fourfactors(browser: CloudScraper, season: Optional[str]=None):
+@instrumented
+def get_fourfactors(browser: CloudScraper, season: Optional[str]=None, typed: bool=False, backend: str='pandas'):
 	"""
 	Scrapes the Four Factors table (https://kenpom.com/stats.php) into a dataframe.
 
@@ -77,6 +136,11 @@ def get_fourfactors(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the same
+			columns for every season (see `schema`), instead of text. False by default.
+		backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+			or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+			default.
 
 	Returns:
 		ff_df (pandas dataframe): Pandas dataframe containing the summary Four Factors table from kenpom.com.
@@ -85,6 +149,7 @@ def get_fourfactors(browser: CloudScraper, season: Optional[str]=None):
 		ValueError: If `season` is less than 1999.
 	"""
 
+	is_pandas = check_backend(backend)
 	url = 'https://kenpom.com/stats.php'
 
 	if season:
@@ -93,17 +158,15 @@ def get_fourfactors(browser: CloudScraper, season: Optional[str]=None):
 				'season cannot be less than 1999, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	ff = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = ff.find_all('table')[0]
-	ff_df = pd.read_html(StringIO(str(table)))
+	ff = parse_html(get_html(browser, url))
+	table = ff.table(0)
+	if not is_pandas:
+		return _team_table(_text_rows(table)[0], _FOURFACTORS, 'fourfactors', typed, backend)
+	ff_df = read_table(table)
 
 	# Dataframe tidying.
-	ff_df = ff_df[0]
 	ff_df = ff_df.iloc[:, 0:24]
-	ff_df.columns = ['Team', 'Conference', 'AdjTempo', 'AdjTempo.Rank', 'AdjOE', 'AdjOE.Rank', 'Off-eFG%',
-					 'Off-eFG%.Rank', 'Off-TO%', 'Off-TO%.Rank', 'Off-OR%', 'Off-OR%.Rank', 'Off-FTRate',
-					 'Off-FTRate.Rank', 'AdjDE', 'AdjDE.Rank', 'Def-eFG%', 'Def-eFG%.Rank', 'Def-TO%', 'Def-TO%.Rank',
-					 'Def-OR%', 'Def-OR%.Rank', 'Def-FTRate', 'Def-FTRate.Rank']
+	ff_df.columns = _FOURFACTORS
 
 	# Remove the header rows that are interjected for readability.
 	ff_df = ff_df[ff_df.Team != 'Team']
@@ -112,10 +175,15 @@ def get_fourfactors(browser: CloudScraper, season: Optional[str]=None):
 	ff_df['Team'] = ff_df['Team'].str.rstrip()
 	ff_df = ff_df.dropna()
 
+	if typed:
+		return schema.apply(ff_df, 'fourfactors')
+
 	return ff_df
 
 
-def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season: Optional[str]=None):
+@instrumented
+def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season: Optional[str]=None, typed: bool=False,
+					backend: str='pandas'):
 	"""
 	Scrapes the Miscellaneous Team Stats table (https://kenpom.com/teamstats.php) into a dataframe.
 
@@ -126,6 +194,11 @@ def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season:
 			default.
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the same
+			columns for every season (see `schema`), instead of text. False by default.
+		backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+			or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+			default.
 
 	Returns:
 			ts_df (pandas dataframe): Pandas dataframe containing the Miscellaneous Team Stats table from kenpom.com.
@@ -134,6 +207,7 @@ def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season:
 			ValueError: If `season` is less than 1999.
 	"""
 
+	is_pandas = check_backend(backend)
 	url = 'https://kenpom.com/teamstats.php'
 	last_cols = ['AdjOE', 'AdjOE.Rank']
 
@@ -150,16 +224,16 @@ def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season:
 		url = url + '?od=d'
 		last_cols = ['AdjDE', 'AdjDE.Rank']
 
-	ts = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = ts.find_all('table')[0]
-	ts_df = pd.read_html(StringIO(str(table)))
+	ts = parse_html(get_html(browser, url))
+	table = ts.table(0)
+	if not is_pandas:
+		rows = _text_rows(table)[0]
+		return _team_table(rows, _TEAMSTATS + last_cols, 'teamstats_defense' if defense else 'teamstats', typed, backend)
+	ts_df = read_table(table)
 
 	# Dataframe tidying.
-	ts_df = ts_df[0]
 	ts_df = ts_df.iloc[:, 0:20]
-	ts_df.columns = ['Team', 'Conference', '3P%', '3P%.Rank', '2P%', '2P%.Rank', 'FT%', 'FT%.Rank',
-					 'Blk%', 'Blk%.Rank', 'Stl%', 'Stl%.Rank', 'NST%', 'NST%.Rank', 'A%', 'A%.Rank', '3PA%', '3PA%.Rank',
-					 last_cols[0], last_cols[1]]
+	ts_df.columns = _TEAMSTATS + last_cols
 
 	# Remove the header rows that are interjected for readability.
 	ts_df = ts_df[ts_df.Team != 'Team']
@@ -168,10 +242,14 @@ def get_teamstats(browser: CloudScraper, defense: Optional[bool]=False, season:
 	ts_df['Team'] = ts_df['Team'].str.rstrip()
 	ts_df = ts_df.dropna()
 
+	if typed:
+		return schema.apply(ts_df, 'teamstats_defense' if defense else 'teamstats')
+
 	return ts_df
 
 
-def get_pointdist(browser: CloudScraper, season: Optional[str]=None):
+@instrumented
+def get_pointdist(browser: CloudScraper, season: Optional[str]=None, typed: bool=False, backend: str='pandas'):
 	"""
 	Scrapes the Team Points Distribution table (https://kenpom.com/pointdist.php) into a dataframe.
 
@@ -180,6 +258,11 @@ def get_pointdist(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the same
+			columns for every season (see `schema`), instead of text. False by default.
+		backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+			or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+			default.
 
 	Returns:
 		dist_df (pandas dataframe): Pandas dataframe containing the Team Points Distribution table from kenpom.com.
@@ -188,6 +271,7 @@ def get_pointdist(browser: CloudScraper, season: Optional[str]=None):
 		ValueError: If `season` is less than 1999.
 	"""
 
+	is_pandas = check_backend(backend)
 	url = 'https://kenpom.com/pointdist.php'
 
 	# Create URL.
@@ -197,15 +281,15 @@ def get_pointdist(browser: CloudScraper, season: Optional[str]=None):
 				'season cannot be less than 1999, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	dist = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = dist.find_all('table')[0]
-	dist_df = pd.read_html(StringIO(str(table)))
+	dist = parse_html(get_html(browser, url))
+	table = dist.table(0)
+	if not is_pandas:
+		return _team_table(_text_rows(table)[0], _POINTDIST, 'pointdist', typed, backend)
+	dist_df = read_table(table)
 
 	# Dataframe tidying.
-	dist_df = dist_df[0]
 	dist_df = dist_df.iloc[:, 0:14]
-	dist_df.columns = ['Team', 'Conference', 'Off-FT', 'Off-FT.Rank', 'Off-2P', 'Off-2P.Rank', 'Off-3P', 'Off-3P.Rank',
-					   'Def-FT', 'Def-FT.Rank', 'Def-2P', 'Def-2P.Rank', 'Def-3P', 'Def-3P.Rank']
+	dist_df.columns = _POINTDIST
 
 	# Remove the header rows that are interjected for readability.
 	dist_df = dist_df[dist_df.Team != 'Team']
@@ -214,10 +298,14 @@ def get_pointdist(browser: CloudScraper, season: Optional[str]=None):
 	dist_df['Team'] = dist_df['Team'].str.rstrip()
 	dist_df = dist_df.dropna()
 
+	if typed:
+		return schema.apply(dist_df, 'pointdist')
+
 	return dist_df
 
 
-def get_height(browser: CloudScraper, season: Optional[str]=None):
+@instrumented
+def get_height(browser: CloudScraper, season: Optional[str]=None, typed: bool=False, backend: str='pandas'):
 	"""
 	Scrapes the Height/Experience table (https://kenpom.com/height.php) into a dataframe.
 
@@ -226,6 +314,11 @@ def get_height(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 2007 is the earliest available season but 
 			continuity data wasn't available until 2008. Most recent season is the default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns, with the same
+			columns for every season (see `schema`), instead of text. False by default.
+		backend (str, optional): What to return: 'pandas' for a dataframe, or 'arrow' or 'polars' for a PyArrow table
+			or Polars dataframe built straight from the table cells, skipping pandas (see `backend`). 'pandas' by
+			default.
 
 	Returns:
 		h_df (pandas dataframe): Pandas dataframe containing the Height/Experience table from kenpom.com.
@@ -234,6 +327,7 @@ def get_height(browser: CloudScraper, season: Optional[str]=None):
 		ValueError: If `season` is less than 2007.
 	"""
 
+	is_pandas = check_backend(backend)
 	url = 'https://kenpom.com/height.php'
 
 	if season:
@@ -242,26 +336,22 @@ def get_height(browser: CloudScraper, season: Optional[str]=None):
 				'Season cannot be less than 2007, as data only goes back that far.')
 		url = url + '?y=' + str(season)
 
-	height = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = height.find_all('table')[0]
-	h_df = pd.read_html(StringIO(str(table)))
+	height = parse_html(get_html(browser, url))
+	table = height.table(0)
+	if not is_pandas:
+		rows, width = _text_rows(table)
+		return _team_table(rows, _HEIGHT if width == 22 else _HEIGHT_BEFORE_2008, 'height', typed, backend)
+	h_df = read_table(table)
 
 	# Dataframe tidying.
-	h_df = h_df[0]
 
 	# Handle seasons prior to 2008 having fewer columns.
 	if len(h_df.columns) == 22:
 		h_df = h_df.iloc[:, 0:22]
-		h_df.columns = ['Team', 'Conference', 'AvgHgt', 'AvgHgt.Rank', 'EffHgt', 'EffHgt.Rank',
-						'C-Hgt', 'C-Hgt.Rank', 'PF-Hgt', 'PF-Hgt.Rank', 'SF-Hgt', 'SF-Hgt.Rank',
-						'SG-Hgt', 'SG-Hgt.Rank', 'PG-Hgt', 'PG-Hgt.Rank', 'Experience', 'Experience.Rank',
-						'Bench', 'Bench.Rank', "Continuity", "Continuity.Rank"]
+		h_df.columns = _HEIGHT
 	else:
 		h_df = h_df.iloc[:, 0:20]
-		h_df.columns = ['Team', 'Conference', 'AvgHgt', 'AvgHgt.Rank', 'EffHgt', 'EffHgt.Rank',
-						'C-Hgt', 'C-Hgt.Rank', 'PF-Hgt', 'PF-Hgt.Rank', 'SF-Hgt', 'SF-Hgt.Rank',
-						'SG-Hgt', 'SG-Hgt.Rank', 'PG-Hgt', 'PG-Hgt.Rank', 'Experience', 'Experience.Rank',
-						'Bench', 'Bench.Rank']
+		h_df.columns = _HEIGHT_BEFORE_2008
 
 	# Remove the header rows that are interjected for readability.
 	h_df = h_df[h_df.Team != 'Team']
@@ -270,10 +360,15 @@ def get_height(browser: CloudScraper, season: Optional[str]=None):
 	h_df['Team'] = h_df['Team'].str.rstrip()
 	h_df = h_df.dropna()
 
+	if typed:
+		return schema.apply(h_df, 'height')
+
 	return h_df
 
 
-def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: str='EFG', conf: Optional[str]=None, conf_only: bool=False):
+@instrumented
+def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: str='EFG', conf: Optional[str]=None, conf_only: bool=False,
+					typed: bool=False):
 	"""
 	Scrapes the Player Leaders tables (https://kenpom.com/playerstats.php) into a dataframe.
 
@@ -295,7 +390,8 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 			like that. No filter applied by default.
 		conf_only (bool, optional): Used to define whether stats should reflect conference games only. Only
 			available if specific conference is defined. Only available for seasons after 2013. False by default.
-
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns (see `schema`) instead
+			of text. False by default.
 
 	Returns:
 		ps_df (pandas dataframe): Pandas dataframe containing the Player Leaders table from kenpom.com.
@@ -305,18 +401,20 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 		KeyError: If `metric` is invalid.
 	"""
 
+	url = _playerstats_url(metric, season, conf, conf_only)
+	playerstats = parse_html(get_html(browser, url))
+	return _playerstats(playerstats, metric, typed)
+
+
+def _playerstats_url(metric, season=None, conf=None, conf_only=False):
 	# `metric` parameter checking.
 	metric = metric.upper()
-	metrics = {'ORTG': 'ORtg', 'MIN': 'PctMin', 'EFG': 'eFG', 'POSS': 'PctPoss', 'SHOTS': 'PctShots', 'OR': 'ORPct', 
-			   'DR': 'DRPct', 'TO': 'TORate', 'ARATE': 'ARate', 'BLK': 'PctBlocks', 'FTRATE': 'FTRate', 
-			   'STL': 'PctStls', 'TS': 'TS', 'FC40': 'FCper40', 'FD40': 'FDper40', '2P': 'FG2Pct', '3P': 'FG3Pct', 
-			   'FT': 'FTPct'}
-	if metric not in metrics:
+	if metric not in _PLAYER_METRICS:
 		raise KeyError(
 			"""Metric is invalid, must be one of: 'ORtg', 'Min', 'eFG', 'Poss', 'Shots', 'OR', 'DR', 'TO', 'ARate', 
 			'Blk', 'FTRate', 'Stl', 'TS', 'FC40', 'FD40', '2P', '3P', 'FT'""")
 	else:
-		met_url = 's=' + metrics[metric]
+		met_url = 's=' + _PLAYER_METRICS[metric]
 
 
 	url = 'https://kenpom.com/playerstats.php?' + met_url
@@ -337,13 +435,17 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 	if conf:
 		url = url + '&f=' + conf
 
-	playerstats = BeautifulSoup(get_html(browser, url), "html.parser")
+	return url
+
+
+def _playerstats(playerstats, metric, typed=False, player_ids=False):
+	# Tidies the Player Leaders tables of a page, optionally with the id of each player's page in a PlayerID column.
+	metric = metric.upper()
 	if metric == 'ORTG':
 		ps_dfs = []
-		tables = playerstats.find_all('table')
+		tables = playerstats.tables
 		for t in tables:
-			ps_df = pd.read_html(StringIO(str(t)))
-			ps_df = ps_df[0]
+			ps_df = read_table(t)
 			
 			# Split ortg column.
 			ps_df.columns = ['Rank', 'Player', 'Team', 'ORtg', 'Ht', 'Wt', 'Yr']
@@ -352,6 +454,10 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 
 			ps_df = ps_df[ps_df.Rank != 'Rk']
 			ps_df = ps_df.dropna()
+			if player_ids:
+				ps_df = _with_player_ids(ps_df, t)
+			if typed:
+				ps_df = schema.apply(ps_df, 'playerstats', fill=False)
 
 			ps_dfs.append(ps_df)
 		ps_df = ps_dfs
@@ -359,13 +465,12 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 		perc_mets = ['Min', 'eFG', 'Poss', 'Shots', 'OR', 'DR', 'TO', 'Blk', 'Stl', 'TS', '2P', '3P', 'FT']
 		if metric.upper() in perc_mets:
 			metric = metric + '%'
-		table = playerstats.find_all('table')[0]
-		ps_df = pd.read_html(StringIO(str(table)))
+		table = playerstats.table(0)
+		ps_df = read_table(table)
 
 		# Dataframe tidying.
-		ps_df = ps_df[0]
 
-		if metric.upper() in ['2P', '3P', 'FT']:
+		if metric.rstrip('%') in ['2P', '3P', 'FT']:
 			ps_df.columns = ['Rank', 'Player', 'Team', metric.rstrip('%') + 'M', 
 			metric.rstrip('%') + 'A', metric, 'Ht', 'Wt', 'Yr'] 
 		else:
@@ -374,11 +479,104 @@ def get_playerstats(browser: CloudScraper, season: Optional[str]=None, metric: s
 		# Remove the header rows that are interjected for readability.
 		ps_df = ps_df[ps_df.Rank != 'Rk']
 		ps_df = ps_df.dropna()
+		if player_ids:
+			ps_df = _with_player_ids(ps_df, table)
+		if typed:
+			ps_df = schema.apply(ps_df, 'playerstats', fill=False)
 
 	return ps_df
 
 
-def get_kpoy(browser: CloudScraper, season: Optional[str]=None):
+def _with_player_ids(ps_df, table):
+	# Player names link to their player pages, whose ids don't change when a player transfers or changes their name.
+	ids = {}
+	for row in table.iter('tr'):
+		cells = row.xpath('./td')
+		links = row.xpath('.//a[contains(@href, "player.php")]/@href')
+		match = _RE_PLAYER_ID.search(links[0]) if links and len(cells) >= 3 else None
+		if match:
+			ids[(_cell_text(cells[1]), _cell_text(cells[2]))] = int(match.group(1))
+	keys = zip(ps_df['Player'].astype(str), ps_df['Team'].astype(str))
+	return ps_df.assign(PlayerID=pd.array([ids.get(key) for key in keys], dtype='Int32'))
+
+
+def _player_keys(ps_df):
+	# Players without a link fall back to their name and team.
+	fallback = ps_df['Player'].astype(str) + ' | ' + ps_df['Team'].astype(str)
+	return ps_df['PlayerID'].astype('string').fillna(fallback)
+
+
+@instrumented
+def get_all_playerstats(browser: CloudScraper, season: Optional[str]=None, conf: Optional[Union[str, Iterable[str]]]=None,
+						conf_only: bool=False, typed: bool=False, max_workers: int=4):
+	"""
+	Scrapes every metric of the Player Leaders tables (https://kenpom.com/playerstats.php) into one dataframe, with a
+	row per player.
+
+	The pages of every metric (and conference) are fetched concurrently with `utils.get_html_many`. Players are
+	matched across metrics by the id of their player page, or by name and team where there is no link.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function.
+		season (str, optional): Used to define different seasons. 2004 is the earliest available season.
+			Most recent season is the default.
+		conf (str or list, optional): Conference, or list of conferences, to get leaders of (see `get_playerstats`).
+			'all' gets the leaders of every conference of the season, which covers far more players than the
+			national leaders. No filter applied by default.
+		conf_only (bool, optional): Used to define whether stats should reflect conference games only. Only
+			available if `conf` is given. Only available for seasons after 2013. False by default.
+		typed (bool, optional): Whether to return numeric, categorical and integer rank columns (see `schema`) instead
+			of text. False by default.
+		max_workers (int, optional): Maximum number of pages requested at once. 4 by default.
+
+	Returns:
+		players_df (pandas dataframe): One row per player, with their PlayerID, name, team, height, weight and year
+			followed by the columns and rank of every metric, as in `schema.SCHEMAS['players']`. Ranks are within the
+			conference when `conf` is given. Players who aren't among the leaders of a metric have it left empty.
+
+	Raises:
+		ValueError: If `season` is less than 2004 or `conf_only` is used with an invalid `season`.
+	"""
+
+	if isinstance(conf, str) and conf.lower() == 'all':
+		conferences = sorted(get_catalog(browser).conferences(season))
+	elif conf is None or isinstance(conf, str):
+		conferences = [conf]
+	else:
+		conferences = list(conf)
+
+	pages = [(metric, c) for metric in _PLAYER_METRICS for c in conferences]
+	urls = [_playerstats_url(metric, season, c, conf_only) for metric, c in pages]
+	contents = get_html_many(browser, urls, max_workers=max_workers, return_exceptions=False)
+
+	tables = {}
+	for (metric, _), content in zip(pages, contents):
+		ps_df = _playerstats(parse_html(content), metric, player_ids=True)
+		if metric == 'ORTG':
+			# The unrestricted table comes last, rank players by it first.
+			ps_df = pd.concat(ps_df[::-1], ignore_index=True)
+		tables.setdefault(metric, []).append(ps_df)
+
+	bios = []
+	metrics = []
+	for metric, ps_dfs in tables.items():
+		ps_df = pd.concat(ps_dfs, ignore_index=True)
+		ps_df.index = _player_keys(ps_df)
+		ps_df = ps_df[~ps_df.index.duplicated()]
+		bios.append(ps_df[_PLAYER_BIO])
+		metrics.append(ps_df[schema.PLAYER_METRICS[metric] + ['Rank']].rename(columns={'Rank': metric + '.Rank'}))
+
+	bio = pd.concat(bios).groupby(level=0, sort=False).first()
+	players_df = pd.concat([bio] + metrics, axis=1).reset_index(drop=True)
+	if typed:
+		return schema.apply(players_df, 'players')
+
+	return players_df
+
+
+@instrumented
+def get_kpoy(browser: CloudScraper, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes the kenpom Player of the Year tables (https://kenpom.com/kpoy.php) into dataframes.
 
@@ -387,6 +585,8 @@ def get_kpoy(browser: CloudScraper, season: Optional[str]=None):
 			by the `login` function.
 		season (str, optional): Used to define different seasons. 2011 is the earliest available season.
 			Most recent season is the default.
+		typed (bool, optional): Whether to return integer ranks, numeric ratings and categorical teams (see
+			`schema`), instead of text. False by default.
 
 	Returns:
 		kpoy_dfs (list of pandas dataframe): List of dandas dataframes containing the kenpom Player of the Year
@@ -408,11 +608,9 @@ def get_kpoy(browser: CloudScraper, season: Optional[str]=None):
 	else:
 		season = 2013
 
-	kpoy = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = kpoy.find_all('table')[0]
-	df = pd.read_html(StringIO(str(table)))
-
-	kpoy_df = df[0]
+	kpoy = parse_html(get_html(browser, url))
+	table = kpoy.table(0)
+	kpoy_df = read_table(table)
 	kpoy_df.columns = ['Rank', 'Player', 'KPOY Rating']
 
 	# Some mildly moronic dataframe tidying.
@@ -422,13 +620,11 @@ def get_kpoy(browser: CloudScraper, season: Optional[str]=None):
 	kpoy_df['Height'] = kpoy_df['Info'].str.replace(r'[a-z]+', '', flags=re.IGNORECASE, regex=True).str.strip('. ').str.strip()
 	kpoy_df = kpoy_df.drop(['Info'], axis=1)
 
-	kpoy_dfs.append(kpoy_df)
+	kpoy_dfs.append(schema.apply(kpoy_df, 'kpoy') if typed else kpoy_df)
 	# Now the MVP table.
 	if int(season) >= 2013:
-		table = kpoy.find_all('table')[-1]
-		df = pd.read_html(StringIO(str(table)))
-
-		mvp_df = df[0]
+		table = kpoy.tables[-1]
+		mvp_df = read_table(table)
 		mvp_df.columns = ['Rank', 'Player', 'Game MVPs']
 
 		# More tidying.
@@ -438,6 +634,6 @@ def get_kpoy(browser: CloudScraper, season: Optional[str]=None):
 		mvp_df['Height'] = mvp_df['Info'].str.replace(r'[a-z]+', '', flags=re.IGNORECASE, regex=True).str.strip('. ').str.strip()
 		mvp_df = mvp_df.drop(['Info'], axis=1)
 
-		kpoy_dfs.append(mvp_df)
+		kpoy_dfs.append(schema.apply(mvp_df, 'kpoy_mvp') if typed else mvp_df)
 
 	return kpoy_dfs
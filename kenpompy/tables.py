@@ -0,0 +1,340 @@
+"""
+The tables module parses kenpom.com pages and extracts their tables into dataframes.
+
+Pages are parsed once with lxml's C parser. Table cells are read straight from that tree and handed to the same
+pandas TextParser `pd.read_html` uses, so the dataframes (headers, dtypes, missing values) match what `pd.read_html`
+produces without serializing each table back to HTML and parsing it a second time.
+"""
+
+import re
+import copy
+import lxml.etree
+import lxml.html
+from pandas.io.parsers import TextParser
+from .instrument import phase
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+def decode_content(content):
+	"""
+	Decodes page content retrieved with `utils.get_html` into text.
+
+	Args:
+		content (bytes or str): The page content. Pages that aren't valid UTF-8 are read as Windows-1252.
+
+	Returns:
+		text (str): The decoded content.
+	"""
+
+	if isinstance(content, bytes):
+		try:
+			return content.decode('utf-8')
+		except UnicodeDecodeError:
+			return content.decode('cp1252', errors='replace')
+	return content
+
+
+class Page:
+	"""A parsed kenpom.com page.
+
+	The page is parsed incrementally, only as far as needed. Asking for a table by its position with `table` or
+	`read_table` stops parsing as soon as that table is complete, which for most getters is near the top of the page.
+	Anything that needs the whole document, such as `root`, `tables`, `find` or a negative table position, parses the
+	rest of it.
+
+	Args:
+		content (bytes or str): Page content, as returned by `utils.get_html`.
+	"""
+
+	# Characters fed to the parser at a time.
+	chunk_size = 1 << 16
+
+	def __init__(self, content):
+		self._content = decode_content(content)
+		self._position = 0
+		self._parser = lxml.etree.HTMLPullParser(events=('start', 'end'), tag='table')
+		self._parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+		self._started = []
+		self._complete = set()
+		self._root = None
+		self._tables = None
+
+	def _feed(self, done=None):
+		# Feeds the parser until `done` returns True, or the whole page has been parsed.
+		with phase('parse'):
+			while self._root is None and not (done and done()):
+				if self._position < len(self._content):
+					chunk = self._content[self._position:self._position + self.chunk_size]
+					self._position += len(chunk)
+					self._parser.feed(chunk)
+				else:
+					self._root = self._parser.close()
+					self._content = None
+				for event, element in self._parser.read_events():
+					if event == 'start':
+						self._started.append(element)
+					else:
+						self._complete.add(element)
+
+	@property
+	def root(self):
+		"""
+		lxml.html.HtmlElement: Root element of the parsed page.
+		"""
+
+		if self._root is None:
+			self._feed()
+		return self._root
+
+	@property
+	def tables(self):
+		"""
+		list: Every table element on the page, in document order.
+		"""
+
+		if self._tables is None:
+			self._tables = self.root.xpath('//table')
+		return self._tables
+
+	@property
+	def text(self):
+		"""
+		str: All text on the page.
+		"""
+
+		return self.root.text_content()
+
+	def table(self, index: int):
+		"""
+		Gets one of the page's tables, parsing the page only until that table is complete.
+
+		Args:
+			index (int): Position of the table in `tables`. Negative positions count from the end.
+
+		Returns:
+			table (lxml.html.HtmlElement): The table element.
+
+		Raises:
+			IndexError if the page doesn't have that many tables.
+		"""
+
+		if index < 0:
+			return self.tables[index]
+		self._feed(lambda: len(self._started) > index and self._started[index] in self._complete)
+		if len(self._started) <= index:
+			raise IndexError('table index out of range')
+		return self._started[index]
+
+	def read_table(self, index: int):
+		"""
+		Reads one of the page's tables into a dataframe.
+
+		Args:
+			index (int): Position of the table in `tables`. Negative positions count from the end.
+
+		Returns:
+			table_df (pandas dataframe): The table's contents.
+		"""
+
+		return read_table(self.table(index))
+
+	def find(self, path: str):
+		"""
+		Finds the first element matching an XPath expression.
+
+		Args:
+			path (str): The XPath expression.
+
+		Returns:
+			element (lxml.html.HtmlElement or None): The first matching element, or None if nothing matches.
+		"""
+
+		found = self.root.xpath(path)
+		return found[0] if found else None
+
+	def find_before(self, index: int, path: str):
+		"""
+		Finds the first element matching an XPath expression in the part of the page up to one of its tables, parsing
+		the page only until that table is complete.
+
+		Args:
+			index (int): Position of the table in `tables`.
+			path (str): The XPath expression.
+
+		Returns:
+			element (lxml.html.HtmlElement or None): The first matching element parsed so far, or None if nothing
+				matches.
+
+		Raises:
+			IndexError if the page doesn't have that many tables.
+		"""
+
+		found = self.table(index).getroottree().getroot().xpath(path)
+		return found[0] if found else None
+
+	def find_all(self, path: str):
+		"""
+		Finds every element matching an XPath expression.
+
+		Args:
+			path (str): The XPath expression.
+
+		Returns:
+			elements (list): The matching elements.
+		"""
+
+		return self.root.xpath(path)
+
+
+def parse_html(content):
+	"""
+	Parses page content retrieved with `utils.get_html`.
+
+	Args:
+		content (bytes or str): The page content.
+
+	Returns:
+		page (Page): The parsed page.
+	"""
+
+	with phase('parse'):
+		return Page(content)
+
+
+def _cell_text(cell):
+	if cell.find('.//br') is None:
+		return _RE_WHITESPACE.sub(' ', cell.text_content().strip())
+	# Line breaks separate words, as in pd.read_html. The tree is left as it is, since other tables of the page share it.
+	text = ''.join(part if isinstance(part, str) else '\n' for part in cell.xpath('.//text()|.//br'))
+	return _RE_WHITESPACE.sub(' ', text.strip())
+
+
+def _cells(row):
+	return row.xpath('./td|./th')
+
+
+def _expand(rows, remainder=None, overflow=True):
+	# Copies the text of cells spanning several rows or columns into every position they cover, like pd.read_html.
+	all_texts = []
+	remainder = remainder if remainder is not None else []
+	for tr in rows:
+		texts = []
+		next_remainder = []
+		index = 0
+		for td in _cells(tr):
+			while remainder and remainder[0][0] <= index:
+				prev_i, prev_text, prev_rowspan = remainder.pop(0)
+				texts.append(prev_text)
+				if prev_rowspan > 1:
+					next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+				index += 1
+
+			text = _cell_text(td)
+			rowspan = int(td.get('rowspan') or 1)
+			colspan = int(td.get('colspan') or 1)
+			for _ in range(colspan):
+				texts.append(text)
+				if rowspan > 1:
+					next_remainder.append((index, text, rowspan - 1))
+				index += 1
+
+		for prev_i, prev_text, prev_rowspan in remainder:
+			texts.append(prev_text)
+			if prev_rowspan > 1:
+				next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+
+		all_texts.append(texts)
+		remainder = next_remainder
+
+	if not overflow:
+		while remainder:
+			next_remainder = []
+			texts = []
+			for prev_i, prev_text, prev_rowspan in remainder:
+				texts.append(prev_text)
+				if prev_rowspan > 1:
+					next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+			all_texts.append(texts)
+			remainder = next_remainder
+
+	return all_texts, remainder
+
+
+def _visible(table):
+	# Hidden elements are left out of the text, as pd.read_html does. Only tables that have any get copied.
+	hidden = [el for el in table.xpath('.//*[@style]') if 'display:none' in el.get('style', '').replace(' ', '')]
+	styles = table.xpath('.//style')
+	if not hidden and not styles:
+		return table
+	table = copy.deepcopy(table)
+	for el in table.xpath('.//style'):
+		el.drop_tree()
+	for el in table.xpath('.//*[@style]'):
+		if 'display:none' in el.get('style', '').replace(' ', ''):
+			el.drop_tree()
+	return table
+
+
+def table_rows(table):
+	"""
+	Extracts the text of every cell in a table, with spanning cells expanded.
+
+	Args:
+		table (lxml.html.HtmlElement): The table element.
+
+	Returns:
+		head, body, foot (tuple of lists): Rows of cell text for the header, body and footer of the table.
+	"""
+
+	table = _visible(table)
+
+	head_rows = []
+	for thead in table.xpath('.//thead'):
+		head_rows.extend(thead.xpath('./tr'))
+		# A <thead> holding cells without a <tr> is treated as a row itself.
+		if thead.xpath('./td|./th'):
+			head_rows.append(thead)
+	body_rows = table.xpath('.//tbody//tr') + table.xpath('./tr')
+	foot_rows = table.xpath('.//tfoot//tr')
+
+	if not head_rows:
+		while body_rows and all(cell.tag == 'th' for cell in _cells(body_rows[0])):
+			head_rows.append(body_rows.pop(0))
+
+	head, remainder = _expand(head_rows)
+	body, remainder = _expand(body_rows, remainder, overflow=len(foot_rows) > 0)
+	foot, _ = _expand(foot_rows, remainder, overflow=False)
+	return head, body, foot
+
+
+def read_table(table):
+	"""
+	Reads a table element into a dataframe, the way `pd.read_html` would.
+
+	Args:
+		table (lxml.html.HtmlElement): The table element, such as one from `Page.tables`.
+
+	Returns:
+		table_df (pandas dataframe): The table's contents.
+	"""
+
+	with phase('read_html'):
+		head, body, foot = table_rows(table)
+		header = None
+		if head:
+			body = head + body
+			if len(head) == 1:
+				header = 0
+			else:
+				header = [i for i, row in enumerate(head) if any(text for text in row)]
+		if foot:
+			body += foot
+
+		width = max(len(row) for row in body)
+		for row in body:
+			if len(row) < width:
+				row += [''] * (width - len(row))
+
+		with TextParser(body, header=header, index_col=None, skiprows=0, parse_dates=False, thousands=',',
+						decimal='.', converters=None, na_values=None, keep_default_na=True) as parser:
+			return parser.read()
@@ -3,16 +3,240 @@ This module contains functions for scraping the team page kenpom.com tables into
 pandas dataframes
 """
 
-import pandas as pd
-from io import StringIO
-from .misc import get_current_season
 import re
 from cloudscraper import CloudScraper
-from bs4 import BeautifulSoup
+import pandas as pd
 from codecs import encode, decode
+from functools import cached_property
 from typing import Optional
-from .utils import get_html
+from .utils import get_html, get_html_many
+from .tables import parse_html, read_table, decode_content
+from .instrument import instrumented
+from .catalog import get_catalog, team_names, note_current_season
+from . import schema
+
+class TeamPage:
+	"""Object to hold a parsed team page (https://kenpom.com/team.php).
+
+	The page is fetched and parsed once when a new instance is created. The schedule, scouting report and roster are
+	only extracted the first time they are accessed, and then kept.
+
+	No extra requests are made to validate the team or season. Seasons before 1999 are rejected before anything is
+	fetched, `current_season` and `valid_teams` are checked if they are given, and otherwise the page itself has to
+	look like a team page.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		team (str): Used to determine which team to scrape.
+		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		current_season (int, optional): The current season, if already known, to reject later seasons.
+		valid_teams (collection, optional): Valid teams for the season, if already known, to reject other teams.
+
+	Attributes:
+		url (str): Full url for the page.
+		team (str): Team name.
+		season (str or None): Season requested.
+		page (Page): The parsed page.
+		schedule (pandas dataframe): The team's schedule, as returned by `get_schedule`.
+		roster (pandas dataframe): The team's player table.
+
+	Raises:
+		ValueError if `season` is less than 1999.
+		ValueError if `season` is greater than `current_season`.
+		ValueError if `team` is not in `valid_teams`, or kenpom has no page for it in the given year.
+	"""
+
+	def __init__(self, browser: CloudScraper, team: str, season: Optional[str]=None,
+				 current_season: Optional[int]=None, valid_teams=None):
+		_check_team(team, season, current_season, valid_teams)
+		self.team = team
+		self.season = season
+		self.url = self._url(team, season)
+		self.page = parse_html(get_html(browser, self.url))
+		self._check_page()
+		self._reports = {}
+
+	@staticmethod
+	def _url(team: str, season: Optional[str]=None):
+		# Sanitize team name
+		team = team.replace(" ", "+")
+		team = team.replace("&", "%26")
+		url = 'https://kenpom.com/team.php'
+		url = url + "?team=" + str(team)
+		if(season):
+			url = url + "&y=" + str(season)
+		return url
+
+	@classmethod
+	def from_html(cls, content, team: str, season: Optional[str]=None):
+		"""
+		Builds a team page from page content that has already been retrieved.
+
+		Args:
+			content (bytes or str): Content of the team page.
+			team (str): Team the page is for.
+			season (str, optional): Season the page is for.
+
+		Returns:
+			team_page (TeamPage): The parsed team page.
+
+		Raises:
+			ValueError if the content isn't a team page.
+		"""
+
+		self = cls.__new__(cls)
+		self.team = team
+		self.season = season
+		self.url = cls._url(team, season)
+		self.page = parse_html(content)
+		self._check_page()
+		self._reports = {}
+		return self
+
+	def _check_page(self):
+		# Unknown teams get a page without the schedule table.
+		try:
+			self.page.table(1)
+		except IndexError:
+			raise ValueError(_INVALID_TEAM) from None
+
+	@cached_property
+	def schedule(self):
+		schedule_df = self.page.read_table(1)
+
+		# Dataframe Tidying
+		# Teams 2010 and earlier do not show their team rank, add column for consistency
+		if(len(schedule_df.columns) == 10):
+			schedule_df.insert(1, 'Team Rank', '')
+		schedule_df.columns = ['Date', 'Team Rank', 'Opponent Rank', 'Opponent Name', 'Result', 'Possession Number',
+						  'A', 'Location', 'Record', 'Conference', 'B']
+		schedule_df = schedule_df.drop(columns = ['A', 'B'])
+		schedule_df = schedule_df.fillna('')
+
+		# Add postseason tournament info to a distinct column. Each tournament's label row names it, and applies to every
+		# game after it until the next label.
+		team_rank = schedule_df['Team Rank'].astype(str)
+		labels = team_rank.str.contains('Tournament') | team_rank.str.contains('Postseason')
+		postseason = schedule_df['Date'].where(labels).str.replace(r'(?:\sConference)?\sTournament.*?$', '', regex=True)
+		postseason = postseason.ffill().astype(object)
+		schedule_df['Postseason'] = postseason.where(postseason.notna(), None)
+		# Remove table data not corresponding to a scheduled competition
+		schedule_df = schedule_df[schedule_df['Date'] != schedule_df['Result']]
+		schedule_df = schedule_df[schedule_df['Date'] != 'Date']
+
+		return schedule_df.reset_index(drop=True)
+
+	def scouting_report(self, conference_only: bool=False):
+		"""
+		Extracts the scouting report stats from the page's inline script.
+
+		Args:
+			conference_only (bool, optional): When True, only conference-related stats are retrieved; otherwise, all stats are fetched.
+
+		Returns:
+			dict: A dictionary containing various team statistics, as returned by `get_scouting_report`.
+		"""
+
+		conference_only = bool(conference_only)
+		if conference_only not in self._reports:
+			self._reports[conference_only] = self._scouting_report(bool(conference_only))
+		return dict(self._reports[conference_only])
+
+	def _scouting_report(self, conference_only: bool):
+		# Find all script tags and filter for ones without src attribute (inline scripts)
+		for script in self.page.find_all('//script[@type="text/javascript"]'):
+			if not script.get('src'):
+				return _scouting_report(script.text or '', conference_only)
+		raise ValueError(_NO_REPORT)
+
+	@cached_property
+	def roster(self):
+		table = self.page.find('//table[@id="player-table"]')
+		if table is None:
+			try:
+				table = self.page.table(2)
+			except IndexError:
+				raise ValueError('the team page has no player table.') from None
+		roster_df = read_table(table)
 
+		# Keep only the bottom row of multi-row headers
+		if roster_df.columns.nlevels > 1:
+			roster_df.columns = roster_df.columns.get_level_values(-1)
+		# Remove repeated headers and rows not holding a player
+		roster_df = roster_df[roster_df.iloc[:, 0] != roster_df.columns[0]]
+		roster_df = roster_df.dropna(how='all')
+
+		return roster_df.reset_index(drop=True)
+
+
+_INVALID_TEAM = 'the team does not exist in kenpom in the given year.  Check that the spelling matches (https://kenpom.com) exactly.'
+_NO_REPORT = 'the team page has no scouting report.'
+
+# Order of the stats in a scouting report. Earlier years might not have all of them.
+_SCOUTING_STATS = ('OE', 'DE', 'Tempo', 'APLO', 'APLD', 'eFG', 'DeFG', 'TOPct', 'DTOPct', 'ORPct', 'DORPct', 'FTR', 'DFTR',
+				   '3Pct', 'D3Pct', '2Pct', 'D2Pct', 'FTPct', 'DFTPct', 'BlockPct', 'DBlockPct', 'StlRate', 'DStlRate',
+				   'NSTRate', 'DNSTRate', '3PARate', 'D3PARate', 'ARate', 'DARate', 'PD3', 'DPD3', 'PD2', 'DPD2', 'PD1', 'DPD1')
+
+_RE_SCRIPT = re.compile(r'<script\b(?![^>]*\bsrc\s*=)[^>]*\btype\s*=\s*["\']text/javascript["\'][^>]*>(.*?)</script>', re.S | re.I)
+_RE_REPORT = re.compile(r"function tableStart\(\) \{([^\}]+)}")
+_RE_CONFERENCE_REPORT = re.compile(r"\$\(':checkbox'\).click\(function\(\) \{([^\}]+)}")
+# One statement filling in a stat cell, such as $("td#OE").html("<a href=...>117.7</a> <span class="seed">5</span>");
+_RE_STAT = re.compile(r'\$\("td#(?P<token>[A-Za-z0-9]+)"\)\.html\("'
+					  r'(?:.*?<a\b[^>]*>(?P<value>[^<]*)</a>)?'
+					  r'(?:.*?<span\b[^>]*\bclass\s*=\s*"(?:[^"]*\s)?seed(?:\s[^"]*)?"[^>]*>(?P<rank>[^<]*)</span>)?'
+					  r'.*"\);')
+
+def _scouting_report(script: str, conference_only: bool=False):
+	# Reads the stats straight from the javascript of a team page, which fills in the scouting report table.
+	pattern = _RE_CONFERENCE_REPORT if conference_only else _RE_REPORT
+	match = pattern.search(script)
+	if match is None:
+		raise ValueError(_NO_REPORT)
+	body = decode(encode(match.group(1), 'latin-1', 'backslashreplace'), 'unicode-escape')
+
+	# Defaulting each stat to '' for earlier years which might not have all the stats
+	stats_df = {key: '' for stat in _SCOUTING_STATS for key in (stat, stat + '.Rank')}
+	# The first two cells aren't stats
+	for stat in list(_RE_STAT.finditer(body))[2:]:
+		token = stat.group('token')
+		stats_df[token] = float(stat.group('value'))
+		stats_df[token + '.Rank'] = int(stat.group('rank'))
+	return stats_df
+
+
+def _check_season(season, current_season=None):
+	if season:
+		if int(season) < 1999:
+			raise ValueError(
+				'season cannot be less than 1999, as data only goes back that far.')
+		if current_season and int(season) > int(current_season):
+			raise ValueError(
+				'season cannot be greater than the current year.')
+
+
+def _check_team(team, season, current_season=None, valid_teams=None):
+	_check_season(season, current_season)
+	if team==None or (valid_teams is not None and team not in valid_teams):
+		raise ValueError(_INVALID_TEAM)
+
+def _season(browser, season):
+	catalog = get_catalog(browser)
+	current_season = catalog.current_season()
+	if not season:
+		season = int(current_season)
+	_check_season(season, current_season)
+	return catalog, season
+
+
+def _team_page(browser, team, season):
+	# The season is checked before the team list for it is fetched, and the team before its page is.
+	catalog, season = _season(browser, season)
+	if team is None or team not in catalog.teams(season):
+		raise ValueError(_INVALID_TEAM)
+	return TeamPage.from_html(get_html(browser, TeamPage._url(team, season)), team, season), season
+
+@instrumented
 def get_valid_teams(browser: CloudScraper, season: Optional[str]=None):
 	"""
 	Scrapes the teams (https://kenpom.com) into a list.
@@ -29,22 +253,19 @@ def get_valid_teams(browser: CloudScraper, season: Optional[str]=None):
 	url = "https://kenpom.com"
 	url = url + '?y=' + str(season)
 
-	teams = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = teams.find_all('table')[0]
-	team_df = pd.read_html(StringIO(str(table)))
+	teams = parse_html(get_html(browser, url))
+	table = teams.table(0)
+	if not season:
+		note_current_season(browser, teams)
+	team_df = read_table(table)
 	# Get only the team column.
-	team_df = team_df[0].iloc[:, 1]
- 	# Remove NCAA tourny seeds for previous seasons.
-	team_df = team_df.str.replace(r'\d+\**', '', regex=True)
-	team_df = team_df.str.rstrip()
-	team_df = team_df.dropna()
-	# Remove leftover team headers
-	team_list = team_df.values.tolist()
-	team_list = [team for team in team_df if team != "Team"]
+	team_list = team_names(team_df.iloc[:, 1])
+	get_catalog(browser).set_teams(season, team_list)
 
 	return team_list
 
-def get_schedule(browser: CloudScraper, team: Optional[str]=None, season: Optional[str]=None):
+@instrumented
+def get_schedule(browser: CloudScraper, team: Optional[str]=None, season: Optional[str]=None, typed: bool=False):
 	"""
 	Scrapes a team's schedule from (https://kenpom.com/team.php) into a dataframe.
 
@@ -53,6 +274,8 @@ def get_schedule(browser: CloudScraper, team: Optional[str]=None, season: Option
 			by the `login` function
 		team (str, optional): Used to determine which team to scrape for schedule.
 		season (str, optional): Used to define different seasons. 1999 is the earliest available season.
+		typed (bool, optional): Whether to return dates as datetimes, ranks and possessions as integers and the record
+			split into Wins and Losses (see `schema`), instead of text. False by default.
 
 	Returns:
 		team_df (pandas dataframe): Dataframe containing a team's schedule for the given season.
@@ -63,63 +286,14 @@ def get_schedule(browser: CloudScraper, team: Optional[str]=None, season: Option
 		ValueError if `team` is not in the valid team list.
 	"""
 
-	url = 'https://kenpom.com/team.php'
-	current_season = get_current_season(browser)
-
-	if season:
-		if int(season) < 1999:
-			raise ValueError(
-				'season cannot be less than 1999, as data only goes back that far.')
-		if int(season) > int(current_season):
-			raise ValueError(
-				'season cannot be greater than the current year.')
-	else:
-		season = current_season
+	team_page, season = _team_page(browser, team, season)
+	schedule_df = team_page.schedule
+	if typed:
+		return schema.apply(schedule_df, 'schedule', season=season)
 
-	if team==None or team not in get_valid_teams(browser, season):
-			raise ValueError(
-				'the team does not exist in kenpom in the given year.  Check that the spelling matches (https://kenpom.com) exactly.')
-	
-	# Sanitize team name
-	team = team.replace(" ", "+")
-	team = team.replace("&", "%26")
-	url = url + "?team=" + str(team)
-	url = url + "&y=" + str(season)
-
-	schedule = BeautifulSoup(get_html(browser, url), "html.parser")
-	table = schedule.find_all('table')[1]
-	schedule_df = pd.read_html(StringIO(str(table)))
-
-	# Dataframe Tidying
-	schedule_df = schedule_df[0]
-	# Teams 2010 and earlier do not show their team rank, add column for consistency
-	if(len(schedule_df.columns) == 10):
-		schedule_df.insert(1, 'Team Rank', '')
-	schedule_df.columns = ['Date', 'Team Rank', 'Opponent Rank', 'Opponent Name', 'Result', 'Possession Number',
-					  'A', 'Location', 'Record', 'Conference', 'B']
-	schedule_df = schedule_df.drop(columns = ['A', 'B'])
-	schedule_df = schedule_df.fillna('')
-
-	# Add postseason tournament info to a distinct column
-	schedule_df['Postseason'] = None
-	# Enumerate tournament names and their row indices
-	postseason_labels = schedule_df[(schedule_df['Team Rank'].str.contains('Tournament')) | (schedule_df['Team Rank'].str.contains('Postseason'))].reset_index()[['index', 'Date']].values.tolist()
-	# Tournament name preprocessing
-	postseason_labels = list(map(lambda x: [x[0], re.sub(r'(?:\sConference)?\sTournament.*?$', '', x[1])], postseason_labels))
-	# Loop tournaments in schedule and apply to associated games
-	i = 0
-	while i < len(postseason_labels):
-		if i != len(postseason_labels) - 1:
-			schedule_df.loc[postseason_labels[i][0]:postseason_labels[i+1][0]-1, 'Postseason'] = postseason_labels[i][1]
-		else:
-			schedule_df.loc[postseason_labels[i][0]:, 'Postseason'] = postseason_labels[i][1]
-		i += 1
-	# Remove table data not corresponding to a scheduled competition
-	schedule_df = schedule_df[schedule_df['Date'] != schedule_df['Result']]
-	schedule_df = schedule_df[schedule_df['Date'] != 'Date']
-
-	return schedule_df.reset_index(drop=True)
+	return schedule_df
 
+@instrumented
 def get_scouting_report(browser: CloudScraper, team: str, season: Optional[int]=None, conference_only: bool=False):
 	"""
     Retrieves and parses team scouting report data from (https://kenpom.com/team.php) into a dictionary.
@@ -138,50 +312,174 @@ def get_scouting_report(browser: CloudScraper, team: str, season: Optional[int]=
 		ValueError if the team name is invalid or not found in the specified year
 	"""
 
-	url = 'https://kenpom.com/team.php'
+	team_page, _ = _team_page(browser, team, season)
+	return team_page.scouting_report(conference_only)
 
-	current_season = get_current_season(browser)
 
-	if season:
-		if int(season) < 1999:
-			raise ValueError(
-				'season cannot be less than 1999, as data only goes back that far.')
-		if int(season) > current_season:
-			raise ValueError(
-				'season cannot be greater than the current year.')
-	else:
-		season = int(current_season)
+@instrumented
+def get_scouting_reports(browser: CloudScraper, season: Optional[int]=None, conference_only: bool=False, max_workers: int=4):
+	"""
+	Retrieves the scouting report of every team in a season from (https://kenpom.com/team.php) into a dataframe.
 
-	if team==None or team not in get_valid_teams(browser, season):
-			raise ValueError(
-				'the team does not exist in kenpom in the given year.  Check that the spelling matches (https://kenpom.com) exactly.')
-	
-	# Sanitize team name
-	team = team.replace(" ", "+")
-	team = team.replace("&", "%26")
-	url = url + "?team=" + str(team)
-	url = url + "&y=" + str(season)
-
-	report = BeautifulSoup(get_html(browser, url), "html.parser")
-	# Find all script tags and filter for ones without src attribute (inline scripts)
-	all_scripts = report.find_all("script", { "type": "text/javascript"})
-	scouting_report_scripts = None
-	for script in all_scripts:
-		if not script.get('src'):  # Find script tag without src attribute
-			scouting_report_scripts = script
-			break
-
-	extraction_pattern = re.compile(r"\$\(\"td#(?P<token>[A-Za-z0-9]+)\"\)\.html\(\"(.+)\"\);")
-	if conference_only:
-		pattern = re.compile(r"\$\(':checkbox'\).click\(function\(\) \{([^\}]+)}")
+	Team pages are fetched concurrently with `utils.get_html_many`, and the stats are read straight from each page's
+	javascript without parsing the rest of the page.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		season (int, optional): Used to define different seasons. 1999 is the earliest available season.
+		conference_only (bool, optional): When True, only conference-related stats are retrieved; otherwise, all stats are fetched.
+		max_workers (int, optional): Maximum number of team pages requested at once. 4 by default.
+
+	Returns:
+		reports_df (pandas dataframe): One row per team, indexed by team name, with the same columns as the
+			dictionaries returned by `get_scouting_report`. Stats missing for a season are NaN, as are all the stats
+			of a team whose page has no scouting report.
+
+	Raises:
+		ValueError if the provided season is earlier than 1999 or greater than the current year
+	"""
+
+	catalog, season = _season(browser, season)
+	teams = sorted(catalog.teams(season))
+	urls = [TeamPage._url(team, season) for team in teams]
+	pages = get_html_many(browser, urls, max_workers=max_workers, return_exceptions=False)
+
+	reports = {}
+	for team, content in zip(teams, pages):
+		script = _RE_SCRIPT.search(decode_content(content))
+		try:
+			reports[team] = _scouting_report(script.group(1) if script else '', conference_only)
+		except ValueError:
+			# One page without a report shouldn't throw away the rest of the season.
+			reports[team] = {}
+
+	reports_df = pd.DataFrame.from_dict(reports, orient='index').reindex(teams).apply(pd.to_numeric, errors='coerce')
+	reports_df.index.name = 'Team'
+	return reports_df
+
+
+@instrumented
+def get_season_schedule(browser: CloudScraper, season: Optional[int]=None, max_workers: int=4, typed: bool=False):
+	"""
+	Scrapes the schedule of every team in a season from (https://kenpom.com/team.php) into a single dataframe.
+
+	Team pages are fetched concurrently with `utils.get_html_many`, and the team list comes from the catalog, so no
+	request is spent on validating teams. Every game between two listed teams appears twice, once from each side; see
+	`get_season_games` for one row per game.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		season (int, optional): Used to define different seasons. 1999 is the earliest available season.
+		max_workers (int, optional): Maximum number of team pages requested at once. 4 by default.
+		typed (bool, optional): Whether to return dates as datetimes, ranks and possessions as integers and the record
+			split into Wins and Losses (see `schema`), instead of text. False by default.
+
+	Returns:
+		schedules_df (pandas dataframe): A Team column followed by the columns of `get_schedule`, for every team
+			whose page has a schedule. Teams whose page has none are left out.
+
+	Raises:
+		ValueError if the provided season is earlier than 1999 or greater than the current year
+	"""
+
+	catalog, season = _season(browser, season)
+	teams = sorted(catalog.teams(season))
+	urls = [TeamPage._url(team, season) for team in teams]
+	pages = get_html_many(browser, urls, max_workers=max_workers, return_exceptions=False)
+
+	schedules = []
+	for team, content in zip(teams, pages):
+		try:
+			schedule_df = TeamPage.from_html(content, team, season).schedule
+		except (ValueError, IndexError):
+			# One page without a schedule shouldn't throw away the rest of the season.
+			continue
+		schedule_df.insert(0, 'Team', team)
+		schedules.append(schedule_df)
+	if schedules:
+		schedules_df = pd.concat(schedules, ignore_index=True)
 	else:
-		pattern = re.compile(r"function tableStart\(\) \{([^\}]+)}")
+		schedules_df = pd.DataFrame(columns=list(schema.SCHEMAS['season_schedule']))
 
-	stats = extraction_pattern.findall(decode(encode(pattern.search(str(scouting_report_scripts.contents[0])).groups()[0], 'latin-1', 'backslashreplace'), 'unicode-escape'))
-	stats = list(map(lambda x: (x[0], float(BeautifulSoup(x[1], "lxml").find('a').contents[0]), int(str(BeautifulSoup(x[1], "lxml").find('span', { "class": "seed" }).contents[0]))), stats[2:]))
-	# Defaulting each stat to '' for earlier years which might not have all the stats
-	stats_df = {'OE': '', 'OE.Rank': '', 'DE': '', 'DE.Rank': '', 'Tempo': '', 'Tempo.Rank': '', 'APLO': '', 'APLO.Rank': '', 'APLD': '', 'APLD.Rank': '', 'eFG': '', 'eFG.Rank': '', 'DeFG': '', 'DeFG.Rank': '', 'TOPct': '', 'TOPct.Rank': '', 'DTOPct': '', 'DTOPct.Rank': '', 'ORPct': '', 'ORPct.Rank': '', 'DORPct': '', 'DORPct.Rank': '', 'FTR': '', 'FTR.Rank': '', 'DFTR': '', 'DFTR.Rank': '', '3Pct': '', '3Pct.Rank': '', 'D3Pct': '', 'D3Pct.Rank': '', '2Pct': '', '2Pct.Rank': '', 'D2Pct': '', 'D2Pct.Rank': '', 'FTPct': '', 'FTPct.Rank': '', 'DFTPct': '', 'DFTPct.Rank': '', 'BlockPct': '', 'BlockPct.Rank': '', 'DBlockPct': '', 'DBlockPct.Rank': '', 'StlRate': '', 'StlRate.Rank': '', 'DStlRate': '', 'DStlRate.Rank': '', 'NSTRate': '', 'NSTRate.Rank': '', 'DNSTRate': '', 'DNSTRate.Rank': '', '3PARate': '', '3PARate.Rank': '', 'D3PARate': '', 'D3PARate.Rank': '', 'ARate': '', 'ARate.Rank': '', 'DARate': '', 'DARate.Rank': '', 'PD3': '', 'PD3.Rank': '', 'DPD3': '', 'DPD3.Rank': '', 'PD2': '', 'PD2.Rank': '', 'DPD2': '', 'DPD2.Rank': '', 'PD1': '', 'PD1.Rank': '', 'DPD1': '', 'DPD1.Rank': ''}	
-	for stat in stats:
-		stats_df[stat[0]] = stat[1]
-		stats_df[stat[0]+'.Rank'] = stat[2]
-	return stats_df
+	if typed:
+		return schema.apply(schedules_df, 'season_schedule', season=season)
+
+	return schedules_df
+
+
+def schedule_games(schedules_df: pd.DataFrame):
+	"""
+	Folds team schedules into one row per game.
+
+	A game is identified by its date and the pair of teams playing it, in alphabetical order, whichever team's schedule
+	it was read from. Rows are matched through a 64-bit hash of that key, which also serves as the index.
+
+	Args:
+		schedules_df (pandas dataframe): Schedules with a Team column, as returned by `get_season_schedule`.
+
+	Returns:
+		games_df (pandas dataframe): One row per game, indexed by GameID, with the date, both teams (Team1 before
+			Team2 alphabetically), the home team (missing on neutral courts), the winner, loser and their scores
+			(missing for games not played yet), possessions and postseason tournament.
+	"""
+
+	team = schedules_df['Team']
+	opponent = schedules_df['Opponent Name']
+	first = team <= opponent
+	result = schedules_df['Result'].astype(str).str.extract(r'^(?P<Outcome>[WL]), (?P<Score>\d+)-(?P<OpponentScore>\d+)')
+	# Games not played yet show a projected result, but no possession count.
+	possessions = schedules_df['Possession Number'].astype(str)
+	played = result['Outcome'].notna() & (possessions.str.strip() != '') & (possessions != 'nan')
+	won = result['Outcome'] == 'W'
+	score = pd.to_numeric(result['Score']).where(played)
+	opponent_score = pd.to_numeric(result['OpponentScore']).where(played)
+	location = schedules_df['Location']
+
+	games_df = pd.DataFrame({
+		'Date': schedules_df['Date'],
+		'Team1': team.where(first, opponent),
+		'Team2': opponent.where(first, team),
+		'HomeTeam': team.where(location == 'Home', opponent.where(location == 'Away')),
+		'Winner': team.where(won, opponent).where(played),
+		'Loser': opponent.where(won, team).where(played),
+		'WinnerScore': score.where(score >= opponent_score, opponent_score),
+		'LoserScore': score.where(score < opponent_score, opponent_score),
+		'Possessions': schedules_df['Possession Number'],
+		'Postseason': schedules_df['Postseason'],
+	})
+
+	game_ids = pd.util.hash_pandas_object(games_df[['Date', 'Team1', 'Team2']].astype(str), index=False)
+	games_df.index = pd.Index(game_ids.to_numpy(), name='GameID')
+	return games_df[~games_df.index.duplicated()]
+
+
+@instrumented
+def get_season_games(browser: CloudScraper, season: Optional[int]=None, max_workers: int=4, typed: bool=False):
+	"""
+	Scrapes every game of a season from the team pages (https://kenpom.com/team.php) into a dataframe with one row per
+	game.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function
+		season (int, optional): Used to define different seasons. 1999 is the earliest available season.
+		max_workers (int, optional): Maximum number of team pages requested at once. 4 by default.
+		typed (bool, optional): Whether to return dates as datetimes, scores as integers and teams as categoricals
+			(see `schema`), instead of text. False by default.
+
+	Returns:
+		games_df (pandas dataframe): One row per game, as returned by `schedule_games`.
+
+	Raises:
+		ValueError if the provided season is earlier than 1999 or greater than the current year
+		ValueError if a team page has no schedule
+	"""
+
+	_, season = _season(browser, season)
+	games_df = schedule_games(get_season_schedule(browser, season, max_workers=max_workers))
+	if typed:
+		return schema.apply(games_df, 'games', season=season)
+
+	return games_df
@@ -0,0 +1,169 @@
+"""
+The transport module provides stand-ins for the CloudScraper browser that `utils.login` and `utils.get_html` make
+requests with, for recording kenpom.com responses to an archive and replaying them later without any network access.
+"""
+
+import json
+import time
+import zipfile
+import hashlib
+import threading
+from typing import Optional
+from .cache import normalize_url
+
+class Response:
+	"""Minimal response returned by transports, with the attributes kenpompy reads from a `requests` response.
+
+	Args:
+		url (str): The url that was requested.
+		status_code (int): HTTP status code.
+		content (bytes): Response body.
+		headers (dict, optional): Response headers.
+
+	Attributes:
+		url (str): The url that was requested.
+		status_code (int): HTTP status code.
+		content (bytes): Response body.
+		headers (dict): Response headers.
+	"""
+
+	def __init__(self, url: str, status_code: int, content: bytes, headers: Optional[dict]=None):
+		self.url = url
+		self.status_code = status_code
+		self.content = content
+		self.headers = headers or {}
+
+	@property
+	def text(self):
+		return self.content.decode('utf-8', errors='replace')
+
+
+class Transport:
+	"""Interface for anything that can stand in for the browser returned by `utils.login`.
+
+	A CloudScraper browser already satisfies it. Subclasses implement `request`; `get` and `post` are built on it.
+	"""
+
+	def request(self, method: str, url: str, **kwargs):
+		"""
+		Performs a request.
+
+		Args:
+			method (str): HTTP method, such as 'GET' or 'POST'.
+			url (str): The url to request.
+			**kwargs: Keyword arguments accepted by `requests.Session.request`.
+
+		Returns:
+			response: Object with `status_code`, `content`, `text` and `headers` attributes.
+		"""
+
+		raise NotImplementedError
+
+	def get(self, url: str, **kwargs):
+		return self.request('GET', url, **kwargs)
+
+	def post(self, url: str, data=None, **kwargs):
+		return self.request('POST', url, data=data, **kwargs)
+
+
+def _archive_key(method: str, url: str, allow_redirects: bool=True):
+	key = method.upper() + ' ' + normalize_url(url)
+	if not allow_redirects:
+		key += ' [no redirects]'
+	return key
+
+
+class RecordingTransport(Transport):
+	"""Transport that passes requests through to a real browser and records every response to a zip archive.
+
+	Form data sent with POST requests (such as login credentials) is never recorded. The archive is written when
+	`save` is called, or when the transport is used as a context manager and the block exits.
+
+	Args:
+		browser (CloudScraper): Browser that performs the actual requests, such as one from `cloudscraper.create_scraper`.
+		path (str): Archive file to write.
+
+	Attributes:
+		browser (CloudScraper): Browser that performs the actual requests.
+		path (str): Archive file to write.
+	"""
+
+	def __init__(self, browser, path: str):
+		self.browser = browser
+		self.path = path
+		self._responses = {}
+		self._lock = threading.Lock()
+
+	def __getattr__(self, name):
+		# Anything else (cookies, headers...) comes straight from the wrapped browser.
+		return getattr(self.__dict__['browser'], name)
+
+	def request(self, method: str, url: str, **kwargs):
+		response = self.browser.request(method, url, **kwargs)
+		key = _archive_key(method, url, kwargs.get('allow_redirects', True))
+		with self._lock:
+			self._responses[key] = Response(url, response.status_code, response.content,
+				{k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'retry-after')})
+		return response
+
+	def save(self):
+		"""
+		Writes every response recorded so far to the archive, replacing any previous archive at `path`.
+		"""
+
+		with self._lock:
+			responses = dict(self._responses)
+		index = {}
+		with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+			for key, response in responses.items():
+				name = 'responses/' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+				archive.writestr(name, response.content)
+				index[key] = {'url': response.url, 'status_code': response.status_code,
+							  'headers': response.headers, 'file': name}
+			archive.writestr('index.json', json.dumps(index, indent=1))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.save()
+
+
+class ReplayTransport(Transport):
+	"""Transport that serves responses from an archive written by `RecordingTransport`, with no network access.
+
+	Requests that aren't in the archive get a 404 response. Responses can be delayed to simulate network latency.
+
+	Args:
+		path (str): Archive file to read.
+		latency (float, optional): Seconds to wait before returning each response. 0 by default.
+
+	Attributes:
+		path (str): Archive file being read.
+		latency (float): Seconds to wait before returning each response.
+		headers (dict): Request headers, kept for compatibility with code that reads them from a browser.
+		cookies (dict): Cookies, kept for compatibility with code that reads them from a browser.
+	"""
+
+	def __init__(self, path: str, latency: float=0.0):
+		self.path = path
+		self.latency = latency
+		self.headers = {}
+		self.cookies = {}
+		self._responses = {}
+		with zipfile.ZipFile(path) as archive:
+			index = json.loads(archive.read('index.json'))
+			for key, entry in index.items():
+				self._responses[key] = Response(entry['url'], entry['status_code'], archive.read(entry['file']),
+												entry['headers'])
+
+	def __contains__(self, url: str):
+		return _archive_key('GET', url) in self._responses
+
+	def request(self, method: str, url: str, **kwargs):
+		if self.latency:
+			time.sleep(self.latency)
+		response = self._responses.get(_archive_key(method, url, kwargs.get('allow_redirects', True)))
+		if response is None:
+			return Response(url, 404, b'Not recorded: ' + url.encode('utf-8'))
+		return response
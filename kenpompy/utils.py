@@ -2,22 +2,104 @@
 The utils module provides utility functions, such as logging in.
 """
 
+import os
+import json
+import time
+import threading
+import contextvars
 import cloudscraper
 from cloudscraper import CloudScraper
+from typing import Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from .cache import ResponseCache, normalize_url, url_season
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, RetryError, NO_RETRY, parse_retry_after
+from .instrument import instrumented, phase, current_span
+from ._FileLock import FileLock
+from .catalog import get_catalog
 
-def login(email: str, password: str):
+_cache = None
+# kenpom.com is asked for at most one page a second unless callers set another limiter, or none.
+_rate_limiter = RateLimiter(rate=1.0, burst=1)
+_retry_policy = RetryPolicy()
+# Guards the counters of a span shared by the workers of `get_html_many`.
+_span_lock = threading.Lock()
+
+class _SingleFlight:
+	"""
+	Merges concurrent calls for the same key, so that only the first one does the work and the rest wait for its result.
+	"""
+
+	class _Call:
+		def __init__(self):
+			self.done = threading.Event()
+			self.result = None
+			self.error = None
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._calls = {}
+
+	def do(self, key, func, *args):
+		with self._lock:
+			call = self._calls.get(key)
+			leader = call is None
+			if leader:
+				call = self._calls[key] = self._Call()
+
+		if not leader:
+			call.done.wait()
+		else:
+			try:
+				call.result = func(*args)
+			except BaseException as e:
+				call.error = e
+			finally:
+				with self._lock:
+					del self._calls[key]
+				call.done.set()
+
+		if call.error is not None:
+			raise call.error
+		return call.result
+
+_single_flight = _SingleFlight()
+
+def login(email: str, password: str, session_path: Optional[str]=None, transport=None):
 	"""
 	Logs in to kenpom.com using user credentials.
 
+	If `session_path` is given, a session saved there by an earlier login is restored instead, and a full login only
+	happens when that session has expired. The new session is then saved for next time. The session file is locked
+	while this happens, so many processes can share one session file safely.
+
 	Args:
 		email (str): User e-mail for login to kenpom.com.
 		password (str): User password for login to kenpom.com.
+		session_path (str, optional): File to restore the session from and save it to.
+		transport (Transport, optional): Transport to make requests with instead of a new CloudScraper browser, such as
+			a `RecordingTransport` or `ReplayTransport`. The transport is returned as the browser once logged in.
 
 	Returns:
 		browser (mechanicalsoup StatefulBrowser): Authenticated browser with full access to kenpom.com.
 	"""
 
-	browser = cloudscraper.create_scraper()
+	if transport is not None:
+		return _login(email, password, transport)
+	if session_path is None:
+		return _login(email, password)
+
+	with FileLock(session_path + '.lock'):
+		browser = _read_session(session_path)
+		if browser is not None and _is_logged_in(browser):
+			return browser
+		browser = _login(email, password)
+		_write_session(browser, session_path)
+	return browser
+
+def _login(email: str, password: str, browser=None):
+	if browser is None:
+		browser = cloudscraper.create_scraper()
 	browser.get('https://kenpom.com/index.php')
 
 	form_data = {
@@ -33,15 +115,176 @@ def login(email: str, password: str):
 		allow_redirects=True
 	)
 
-	home_page = browser.get('https://kenpom.com/')
-	if 'Logged in as' not in home_page.text:
+	if not _is_logged_in(browser):
 		raise Exception('Logging in failed - check your credentials')
 
 	return browser
 
+def _is_logged_in(browser: CloudScraper):
+	home_page = browser.get('https://kenpom.com/')
+	return 'Logged in as' in home_page.text
+
+def save_session(browser: CloudScraper, path: str):
+	"""
+	Saves an authenticated browser's cookies, including the Cloudflare clearance cookies, to a file.
+
+	The User-Agent is saved too, as Cloudflare only honors its clearance cookie for the User-Agent it was issued to.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function.
+		path (str): File to save the session to.
+	"""
+
+	with FileLock(path + '.lock'):
+		_write_session(browser, path)
+
+def load_session(path: str, validate: bool=True):
+	"""
+	Restores a browser from a session file written by `save_session` or `login`.
+
+	Args:
+		path (str): File to restore the session from.
+		validate (bool, optional): When True, a single request to the kenpom.com home page checks that the session is
+			still logged in. True by default.
+
+	Returns:
+		browser (CloudScraper or None): The restored browser, or None if there is no saved session, every cookie in it
+			has expired, or it is no longer logged in.
+	"""
+
+	with FileLock(path + '.lock'):
+		browser = _read_session(path)
+	if browser is not None and validate and not _is_logged_in(browser):
+		return None
+	return browser
+
+def _write_session(browser: CloudScraper, path: str):
+	session = {
+		'headers': {'User-Agent': browser.headers.get('User-Agent')},
+		'cookies': [{
+			'name': cookie.name,
+			'value': cookie.value,
+			'domain': cookie.domain,
+			'path': cookie.path,
+			'expires': cookie.expires,
+			'secure': cookie.secure,
+			'rest': cookie._rest,
+		} for cookie in browser.cookies],
+	}
+	tmp = path + '.' + str(os.getpid()) + '.tmp'
+	# The cookies act as credentials, so only the owner may read the file.
+	with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+		json.dump(session, f)
+	os.replace(tmp, path)
+
+def _read_session(path: str):
+	try:
+		with open(path) as f:
+			session = json.load(f)
+	except (OSError, ValueError):
+		return None
+
+	now = time.time()
+	cookies = [cookie for cookie in session['cookies'] if cookie['expires'] is None or cookie['expires'] > now]
+	if not cookies:
+		return None
+
+	browser = cloudscraper.create_scraper()
+	if session['headers'].get('User-Agent'):
+		browser.headers['User-Agent'] = session['headers']['User-Agent']
+	for cookie in cookies:
+		browser.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'],
+			expires=cookie['expires'], secure=cookie['secure'], rest=cookie['rest'])
+	return browser
+
+def set_cache(cache: Optional[ResponseCache]):
+	"""
+	Sets the response cache consulted by `get_html` before requesting a page from kenpom.com.
+
+	Args:
+		cache (ResponseCache or None): Cache to use for all subsequent requests, or None to disable caching.
+
+	Returns:
+		previous (ResponseCache or None): The cache that was in use before.
+	"""
+
+	global _cache
+	previous = _cache
+	_cache = cache
+	return previous
+
+def get_cache():
+	"""
+	Gets the response cache consulted by `get_html`.
+
+	Returns:
+		cache (ResponseCache or None): Cache currently in use, or None if caching is disabled.
+	"""
+
+	return _cache
+
+def set_rate_limiter(rate_limiter: Optional[RateLimiter]):
+	"""
+	Sets the rate limiter that every request made by `get_html` waits on.
+
+	Args:
+		rate_limiter (RateLimiter or None): Rate limiter to use for all subsequent requests, or None to disable rate
+			limiting. Requests are limited to one a second by default.
+
+	Returns:
+		previous (RateLimiter or None): The rate limiter that was in use before.
+	"""
+
+	global _rate_limiter
+	previous = _rate_limiter
+	_rate_limiter = rate_limiter
+	return previous
+
+def get_rate_limiter():
+	"""
+	Gets the rate limiter that every request made by `get_html` waits on.
+
+	Returns:
+		rate_limiter (RateLimiter or None): Rate limiter currently in use, or None if rate limiting is disabled.
+	"""
+
+	return _rate_limiter
+
+def set_retry_policy(retry_policy: Optional[RetryPolicy]):
+	"""
+	Sets the policy `get_html` follows to retry requests that fail transiently.
+
+	Args:
+		retry_policy (RetryPolicy or None): Retry policy to use for all subsequent requests, or None to never retry.
+
+	Returns:
+		previous (RetryPolicy or None): The retry policy that was in use before.
+	"""
+
+	global _retry_policy
+	previous = _retry_policy
+	_retry_policy = retry_policy
+	return previous
+
+def get_retry_policy():
+	"""
+	Gets the policy `get_html` follows to retry requests that fail transiently.
+
+	Returns:
+		retry_policy (RetryPolicy or None): Retry policy currently in use, or None if requests are never retried.
+	"""
+
+	return _retry_policy
+
+@instrumented
 def get_html(browser: CloudScraper, url: str):
 	"""
-	Performs a get request on the specified url.
+	Performs a get request on the specified url, or serves it from the response cache if one is set with `set_cache`.
+	Requests that do go to kenpom.com first wait on the rate limiter set with `set_rate_limiter` (one request a second
+	by default), and transient failures are retried according to the retry policy set with `set_retry_policy`.
+	Concurrent calls for the same url with the same browser are merged into a single request whose content goes to
+	every caller.
 
 	Args:
 		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
@@ -52,9 +295,118 @@ def get_html(browser: CloudScraper, url: str):
 		html (Bytes | Any): The return content.
 	
 	Raises:
-		Exception if get request gets a non-200 response code.
-	"""	
-	response = browser.get(url)
-	if response.status_code != 200:
-		raise Exception(f'Failed to retrieve {url} (status code: {response.status_code})')
-	return response.content
\ No newline at end of file
+		Exception if get request gets a non-200 response code that isn't worth retrying.
+		RetryError if every attempt allowed by the retry policy failed.
+	"""
+	with phase('fetch') as span:
+		return _fetch(browser, url, span)
+
+def _fetch(browser: CloudScraper, url: str, span):
+	content = _single_flight.do((id(browser), normalize_url(url)), _get_html, browser, url)
+	if span is not None:
+		with _span_lock:
+			span.urls.append(url)
+			span.bytes += len(content)
+	return content
+
+def _get_html(browser: CloudScraper, url: str):
+	cache = _cache
+	current_season = None
+	if cache is not None:
+		if cache.current_season is None and url_season(url) is not None:
+			# Read on every lookup, so the cache follows the catalog when a new season starts.
+			current_season = get_catalog(browser).current_season()
+		content = cache.get(url, current_season)
+		if content is not None:
+			span = current_span()
+			if span is not None:
+				with _span_lock:
+					span.cache_hits += 1
+			return content
+
+	response = _request(browser, url)
+
+	if cache is not None:
+		cache.set(url, response.content, current_season)
+	return response.content
+
+def _request(browser: CloudScraper, url: str):
+	policy = _retry_policy or NO_RETRY
+	start = time.monotonic()
+	attempt = 0
+	while True:
+		attempt += 1
+		rate_limiter = _rate_limiter
+		if rate_limiter is not None:
+			rate_limiter.acquire()
+
+		retry_after = None
+		try:
+			response = browser.get(url)
+		except policy.exceptions as e:
+			error, status_code = e, None
+		else:
+			span = current_span()
+			if span is not None:
+				span.status_codes.append(response.status_code)
+			if response.status_code == 200:
+				return response
+			if response.status_code not in policy.status_codes:
+				raise Exception(f'Failed to retrieve {url} (status code: {response.status_code})')
+			error, status_code = None, response.status_code
+			retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+		wait = policy.backoff(attempt, retry_after)
+		if attempt >= policy.max_attempts or time.monotonic() - start + wait > policy.max_time:
+			if attempt == 1:
+				# Nothing was retried, so the failure is surfaced as is.
+				if error is not None:
+					raise error
+				raise Exception(f'Failed to retrieve {url} (status code: {status_code})')
+			raise RetryError(url, attempt, status_code) from error
+		time.sleep(wait)
+
+def get_html_many(browser: CloudScraper, urls: Iterable[str], max_workers: int=4, return_exceptions: bool=True):
+	"""
+	Performs get requests on many urls at once, using a bounded pool of worker threads that share `browser`.
+
+	Each url goes through `get_html`, so the response cache applies to every request.
+
+	Args:
+		browser (CloudScraper): Authenticated browser with full access to kenpom.com generated
+			by the `login` function.
+		urls (iterable of str): The urls to perform the get requests on.
+		max_workers (int, optional): Maximum number of requests in flight at once. 4 by default.
+		return_exceptions (bool, optional): When True, a url that fails has the raised exception in its place in the
+			results. When False, the first failure (in input order) is raised once all requests have finished.
+			True by default.
+
+	Returns:
+		results (list): Content of each url (or the exception it raised), in the same order as `urls`.
+
+	Raises:
+		ValueError if `max_workers` is less than 1.
+		Exception raised by the first failing url if `return_exceptions` is False.
+	"""
+
+	if max_workers < 1:
+		raise ValueError('max_workers must be at least 1.')
+
+	def fetch(url):
+		try:
+			return _fetch(browser, url, span)
+		except Exception as e:
+			return e
+
+	urls = list(urls)
+	# Workers run in a copy of the caller's context, so that their requests are recorded on the caller's span. The
+	# pool is timed as a single fetch phase, since the workers' requests overlap.
+	with phase('fetch') as span, ThreadPoolExecutor(max_workers=min(max_workers, max(len(urls), 1))) as executor:
+		futures = [executor.submit(contextvars.copy_context().run, fetch, url) for url in urls]
+		results = [future.result() for future in futures]
+
+	if not return_exceptions:
+		for result in results:
+			if isinstance(result, Exception):
+				raise result
+	return results
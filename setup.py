@@ -22,6 +22,7 @@ setuptools.setup(
         "Intended Audience :: Science/Research",
         "Intended Audience :: Developers"
     ],
-    install_requires = ["mechanicalsoup", "pandas", "bs4", "cloudscraper"],
+    install_requires = ["mechanicalsoup", "pandas>=2.0", "bs4", "cloudscraper", "lxml"],
+    extras_require = {"arrow": ["pyarrow>=14"], "polars": ["pyarrow>=14", "polars"]},
     python_requires='>=3.8',
 )
\ No newline at end of file
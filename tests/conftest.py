@@ -1,19 +1,75 @@
 import os
 import pytest
-from kenpompy.utils import login
+import cloudscraper
+from kenpompy.utils import login, set_rate_limiter
+from kenpompy.transport import RecordingTransport, ReplayTransport
 import time
 from random import randint
 
 @pytest.fixture(scope="session")
 def browser():
+	# KENPOMPY_REPLAY runs the suite offline against an archive recorded with KENPOMPY_RECORD.
+	if os.environ.get("KENPOMPY_REPLAY"):
+		# Replayed responses don't reach kenpom.com, so there is nothing to throttle.
+		previous = set_rate_limiter(None)
+		yield login("", "", transport=ReplayTransport(os.environ["KENPOMPY_REPLAY"]))
+		set_rate_limiter(previous)
+		return
+
+	transport = None
+	if os.environ.get("KENPOMPY_RECORD"):
+		transport = RecordingTransport(cloudscraper.create_scraper(), os.environ["KENPOMPY_RECORD"])
 	try:
-		browser = login(os.environ["EMAIL"], os.environ["PASSWORD"])
+		browser = login(os.environ["EMAIL"], os.environ["PASSWORD"], transport=transport)
 	except Exception as e:
 		pytest.exit(e)
 
-	return browser
+	yield browser
+	if transport is not None:
+		transport.save()
+
+class FakeResponse:
+	def __init__(self, content, status_code=200, headers=None):
+		self.content = content
+		self.status_code = status_code
+		self.headers = headers or {}
+
+	@property
+	def text(self):
+		return self.content.decode('utf-8')
+
+class FakeBrowser:
+	"""Stands in for an authenticated browser, echoing each url back unless a response is queued for it."""
+
+	def __init__(self):
+		self.requested = []
+		self.responses = {}
+
+	def request(self, method, url, **kwargs):
+		if method == 'GET':
+			return self.get(url, **kwargs)
+		return FakeResponse(b'')
+
+	def get(self, url, **kwargs):
+		self.requested.append(url)
+		queued = self.responses.get(url)
+		if queued:
+			response = queued.pop(0)
+			if isinstance(response, Exception):
+				raise response
+			return response
+		return FakeResponse(url.encode('utf-8'))
+
+@pytest.fixture
+def fake_browser():
+	# Fake responses don't reach kenpom.com, so there is nothing to throttle.
+	previous = set_rate_limiter(None)
+	yield FakeBrowser()
+	set_rate_limiter(previous)
 
 @pytest.fixture(autouse=True)
-def brakes():
+def brakes(request):
     yield
-    time.sleep(randint(2, 10))
+    # Only tests that hit kenpom.com need to slow down.
+    if 'browser' in request.fixturenames:
+        time.sleep(randint(2, 10))
@@ -0,0 +1,36 @@
+import asyncio
+import kenpompy.aio as kpaio
+from tests.conftest import FakeResponse
+from tests.test_conference import CONF_PAGE
+from tests.test_team import TEAM_PAGE
+
+def test_gather_get_html(fake_browser):
+	urls = ['https://kenpom.com/team.php?team=Team+' + str(i) for i in range(50)]
+
+	async def crawl():
+		return await asyncio.gather(*[kpaio.get_html(fake_browser, url) for url in urls])
+
+	results = asyncio.run(crawl())
+	assert results == [url.encode('utf-8') for url in urls]
+	assert sorted(fake_browser.requested) == sorted(urls)
+
+def test_awaitable_metadata():
+	assert kpaio.get_efficiency.__name__ == 'get_efficiency'
+	assert asyncio.iscoroutinefunction(kpaio.get_schedule)
+	assert asyncio.iscoroutinefunction(kpaio.FanMatch)
+
+def test_pages_parsed_off_loop(fake_browser):
+	fake_browser.responses['https://kenpom.com/conf.php?c=B10&y=2021'] = [FakeResponse(CONF_PAGE)]
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)]
+
+	async def crawl():
+		return await asyncio.gather(kpaio.ConferencePage(fake_browser, 'B10', season='2021'),
+									kpaio.TeamPage(fake_browser, 'Purdue', season=2023))
+
+	conf_page, team_page = asyncio.run(crawl())
+	# Every table was extracted on the worker pool, so reading them doesn't parse anything on the loop.
+	assert {'standings', 'offense', 'defense', 'aggregate_stats', 'conferences'} <= set(vars(conf_page))
+	assert {'schedule', 'roster'} <= set(vars(team_page))
+	assert set(team_page._reports) == {False, True}
+	assert conf_page.conferences == ['ACC', 'B10']
+	assert team_page.roster['Player'].to_list() == ['Zach Edey', 'Braden Smith']
@@ -0,0 +1,58 @@
+import pytest
+from kenpompy import bulk, export, misc, summary
+from tests.conftest import FakeResponse
+from tests.test_bulk import OLD, NEW
+
+pa = pytest.importorskip('pyarrow')
+
+RATINGS = ('<html><body><table><thead><tr><th colspan="4"></th><th colspan="17">Strength of Schedule</th></tr>'
+		   '<tr><th>Rk</th><th>Team</th><th>Conf</th><th>W-L</th>' + '<th>x</th>' * 17 + '</tr></thead><tbody>'
+		   '<tr><td>1</td><td>Virginia 1</td><td>ACC</td><td>35-3</td><td>+34.22</td>' + '<td>123.4</td><td>2</td>' * 8 +
+		   '</tr><tr><td>Rk</td><td>Team</td>' + '<td></td>' * 19 + '</tr>'
+		   '<tr><td>2</td><td>Gonzaga</td><td>WCC</td><td>33-4</td><td>+32.85</td>' + '<td>124.5</td><td>1</td>' * 8 +
+		   '</tr></tbody></table></body></html>').encode('utf-8')
+
+@pytest.fixture
+def pages(fake_browser):
+	fake_browser.responses['https://kenpom.com/summary.php?y=2008'] = [FakeResponse(OLD)] * 2
+	fake_browser.responses['https://kenpom.com/summary.php?y=2019'] = [FakeResponse(NEW)] * 4
+	fake_browser.responses['https://kenpom.com/index.php?y=2019'] = [FakeResponse(RATINGS)] * 4
+	return fake_browser
+
+def test_arrow_backend(pages):
+	eff = summary.get_efficiency(pages, season=2019, backend='arrow')
+	assert isinstance(eff, pa.Table)
+	assert eff.column_names == summary.get_efficiency(pages, season=2019).columns.to_list()
+	assert eff.column('Team').to_pylist() == ['Louisville']
+	assert eff.column('Tempo-Adj').to_pylist() == ['67.2']
+
+	# Typed tables match exported pandas ones, column for column.
+	typed = summary.get_efficiency(pages, season=2019, typed=True, backend='arrow')
+	expected = export.to_arrow(summary.get_efficiency(pages, season=2019, typed=True), 'efficiency')
+	assert typed.schema == expected.schema and typed.to_pydict() == expected.to_pydict()
+
+	ratings = misc.get_pomeroy_ratings(pages, season=2019, typed=True, backend='arrow')
+	expected = export.to_arrow(misc.get_pomeroy_ratings(pages, season=2019, typed=True), 'pomeroy_ratings')
+	assert ratings.schema == expected.schema and ratings.to_pydict() == expected.to_pydict()
+	assert ratings.column('Team').to_pylist() == ['Virginia', 'Gonzaga']
+	assert ratings.column('Seed').to_pylist() == [1, None]
+	assert ratings.column('Wins').to_pylist() == [35, 33]
+
+	with pytest.raises(ValueError):
+		summary.get_efficiency(pages, season=2019, backend='numpy')
+
+def test_get_seasons_arrow(pages):
+	seasons = bulk.get_seasons(pages, 'efficiency', [2008, 2019], backend='arrow')
+	assert seasons.column_names[:4] == ['Season', 'Team', 'Conference', 'Tempo-Adj']
+	assert seasons.column('Season').to_pylist() == [2008, 2019]
+	assert seasons.column('Avg. Poss Length-Offense').to_pylist() == [None, '17.6']
+
+	typed = bulk.get_seasons(pages, 'efficiency', [2019], typed=True, backend='arrow')
+	assert typed.schema.field('Season').type == pa.int16()
+	assert typed.column('Conference').type == pa.dictionary(pa.int32(), pa.string())
+
+def test_polars_backend(pages):
+	pl = pytest.importorskip('polars')
+	eff = summary.get_efficiency(pages, season=2019, typed=True, backend='polars')
+	assert isinstance(eff, pl.DataFrame)
+	assert eff['Tempo-Adj.Rank'].to_list() == [199]
@@ -0,0 +1,44 @@
+import pytest
+from kenpompy import bulk
+from tests.conftest import FakeResponse
+
+def efficiency_page(rows):
+	body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+	return f'<html><body><table><thead><tr><th>Team</th></tr></thead><tbody>{body}</tbody></table></body></html>'.encode('utf-8')
+
+OLD = efficiency_page([['Louisville 3', 'BE', '65.3', '160', '67.1', '169', '113.1', '40', '107.3', '67', '87.7', '4', '91.2', '7']])
+NEW = efficiency_page([['Louisville', 'ACC', '67.2', '199', '68.3', '217', '17.6', '183', '17.5', '175', '113.7', '28', '107.6',
+						'75', '94.4', '24', '98.8', '62']])
+
+@pytest.fixture
+def efficiency_browser(fake_browser):
+	fake_browser.responses['https://kenpom.com/summary.php?y=2008'] = [FakeResponse(OLD)]
+	fake_browser.responses['https://kenpom.com/summary.php?y=2019'] = [FakeResponse(NEW)]
+	return fake_browser
+
+def test_get_seasons(efficiency_browser):
+	df = bulk.get_seasons(efficiency_browser, 'efficiency', [2008, 2019])
+	assert df['Season'].to_list() == [2008, 2019]
+	assert df.columns.to_list()[:6] == ['Season', 'Team', 'Conference', 'Tempo-Adj', 'Tempo-Adj.Rank', 'Tempo-Raw']
+	assert df.shape == (2, 19)
+	assert str(df.loc[0, 'Off. Efficiency-Adj']) == '113.1'
+	assert df['Avg. Poss Length-Offense'].isna().to_list() == [True, False]
+
+def test_get_seasons_typed(efficiency_browser):
+	df = bulk.get_seasons(efficiency_browser, 'efficiency', [2008, 2019], typed=True)
+	assert df['Season'].dtype == 'Int16'
+	assert df['Conference'].dtype == 'category'
+	assert df['Conference'].cat.categories.to_list() == ['ACC', 'BE']
+	assert df['Tempo-Adj.Rank'].to_list() == [160, 199]
+
+def test_iter_seasons(efficiency_browser):
+	results = dict(bulk.iter_seasons(efficiency_browser, 'efficiency', [2008, 2019], max_workers=1))
+	assert sorted(results) == [2008, 2019]
+	assert results[2019]['Season'].to_list() == [2019]
+
+	with pytest.raises(KeyError):
+		bulk.get_seasons(efficiency_browser, 'not_a_table', [2019])
+	with pytest.raises(ValueError):
+		bulk.get_seasons(efficiency_browser, 'efficiency', [])
+	with pytest.raises(ValueError):
+		bulk.get_seasons(efficiency_browser, 'efficiency', [1998])
@@ -0,0 +1,71 @@
+import os
+import time
+import pytest
+import kenpompy.utils as kputils
+from kenpompy.cache import ResponseCache, normalize_url, url_season
+from kenpompy.catalog import get_catalog
+
+@pytest.fixture
+def cache(tmp_path):
+	cache = ResponseCache(str(tmp_path), ttl=60, current_season=2025)
+	previous = kputils.set_cache(cache)
+	yield cache
+	kputils.set_cache(previous)
+
+def test_normalize_url():
+	assert normalize_url('https://kenpom.com?y=2021') == 'https://kenpom.com/index.php?y=2021'
+	assert normalize_url('https://KenPom.com/') == normalize_url('https://kenpom.com/index.php')
+	assert normalize_url('https://kenpom.com/team.php?y=2019&team=Duke') == normalize_url('https://kenpom.com/team.php?team=Duke&y=2019')
+
+def test_url_season():
+	assert url_season('https://kenpom.com/summary.php?y=2019') == 2019
+	assert url_season('https://kenpom.com/fanmatch.php?d=2020-01-29') == 2020
+	assert url_season('https://kenpom.com/fanmatch.php?d=2019-11-29') == 2020
+	assert url_season('https://kenpom.com/index.php?y=None') is None
+	assert url_season('https://kenpom.com/trends.php') is None
+
+def test_get_html_cached(cache, fake_browser):
+	browser = fake_browser
+	url = 'https://kenpom.com/summary.php?y=2019'
+	assert kputils.get_html(browser, url) == url.encode('utf-8')
+	assert kputils.get_html(browser, 'https://kenpom.com/summary.php?y=2019') == url.encode('utf-8')
+	assert browser.requested == [url]
+	assert cache.hits == 1
+
+def test_current_season_expires(cache, fake_browser):
+	browser = fake_browser
+	past = 'https://kenpom.com/summary.php?y=2019'
+	current = 'https://kenpom.com/summary.php?y=2025'
+	kputils.get_html(browser, past)
+	kputils.get_html(browser, current)
+
+	# Age both entries beyond the ttl; only the current season page should be refetched.
+	stale = time.time() - 120
+	for root, _, files in os.walk(cache.path):
+		for file in files:
+			os.utime(os.path.join(root, file), (stale, stale))
+	kputils.get_html(browser, past)
+	kputils.get_html(browser, current)
+	assert browser.requested == [past, current, current]
+
+def test_current_season_follows_catalog(tmp_path, fake_browser):
+	# A cache not given the current season follows the catalog, so the finished season becomes permanent.
+	browser = fake_browser
+	cache = ResponseCache(str(tmp_path), ttl=60)
+	previous = kputils.set_cache(cache)
+	try:
+		get_catalog(browser).set_current_season(2025)
+		url = 'https://kenpom.com/summary.php?y=2025'
+		kputils.get_html(browser, url)
+		assert not cache.is_permanent(url, get_catalog(browser).current_season())
+
+		get_catalog(browser).set_current_season(2026)
+		stale = time.time() - 120
+		for root, _, files in os.walk(cache.path):
+			for file in files:
+				os.utime(os.path.join(root, file), (stale, stale))
+		kputils.get_html(browser, url)
+		assert browser.requested == [url]
+		assert cache.current_season is None
+	finally:
+		kputils.set_cache(previous)
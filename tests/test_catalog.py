@@ -0,0 +1,66 @@
+import pytest
+import kenpompy.team as kpteam
+from kenpompy.catalog import get_catalog, note_current_season
+from kenpompy.tables import Page, parse_html
+from tests.conftest import FakeResponse
+
+def index_page(season, teams):
+	rows = ''.join(f'<tr><td>{rank}</td><td>{team}</td></tr>' for rank, team in enumerate(teams, 1))
+	return (f'<html><body><div id="content-header"><h2>{season} Pomeroy College Basketball Ratings</h2></div>'
+		f'<table><thead><tr><th>Rk</th><th>Team</th></tr></thead><tbody>{rows}</tbody></table></body></html>').encode('utf-8')
+
+def test_catalog(fake_browser):
+	fake_browser.responses['https://kenpom.com/index.php'] = [FakeResponse(index_page(2023, ['Purdue 1', 'Houston 1*']))] * 2
+	fake_browser.responses['https://kenpom.com?y=2023'] = [FakeResponse(index_page(2023, ['Purdue 1', 'Houston 1*']))]
+	catalog = get_catalog(fake_browser)
+	assert get_catalog(fake_browser) is catalog
+
+	assert catalog.current_season() == 2023
+	assert catalog.teams('2023') == frozenset(['Purdue', 'Houston'])
+	assert catalog.is_valid_team('Houston', 2023)
+	assert not catalog.is_valid_team('Purdoo', 2023)
+	assert catalog.current_season() == 2023
+	assert len(fake_browser.requested) == 2
+
+	# Invalid teams are rejected from the catalog, without loading any team page.
+	with pytest.raises(ValueError):
+		kpteam.get_schedule(fake_browser, team='Purdoo', season=2023)
+	with pytest.raises(ValueError):
+		kpteam.get_scouting_report(fake_browser, 'Purdue', season=2024)
+	assert len(fake_browser.requested) == 2
+
+	catalog.invalidate()
+	assert catalog.current_season() == 2023
+	assert len(fake_browser.requested) == 3
+
+def test_catalog_seeding(fake_browser):
+	catalog = get_catalog(fake_browser)
+	catalog.set_teams(2023, ['Purdue'])
+	catalog.set_conferences(2023, ['B10', 'ACC'])
+	assert catalog.teams(2023) == frozenset(['Purdue'])
+	assert 'B10' in catalog.conferences('2023')
+
+	catalog.invalidate(2023)
+	fake_browser.responses['https://kenpom.com?y=2023'] = [FakeResponse(index_page(2023, ['Purdue 1', 'Houston 1*']))]
+	assert 'Houston' in catalog.teams(2023)
+	assert fake_browser.requested == ['https://kenpom.com?y=2023']
+
+def test_catalog_current_season(fake_browser):
+	fake_browser.responses['https://kenpom.com?y=None'] = [FakeResponse(index_page(2023, ['Purdue 1', 'Houston 1*']))]
+	assert kpteam.get_valid_teams(fake_browser) == ['Purdue', 'Houston']
+
+	# Teams of the current season are filed under its number, so getters asking for it by number reuse them.
+	catalog = get_catalog(fake_browser)
+	assert catalog.current_season() == 2023
+	assert catalog.teams(2023) == catalog.teams() == frozenset(['Purdue', 'Houston'])
+	with pytest.raises(ValueError):
+		kpteam.get_schedule(fake_browser, team='Purdoo')
+	assert fake_browser.requested == ['https://kenpom.com?y=None']
+
+def test_note_current_season_streams(fake_browser, monkeypatch):
+	# The season is read from the header parsed so far, leaving the rest of the page unparsed.
+	monkeypatch.setattr(Page, 'chunk_size', 64)
+	page = parse_html(index_page(2023, ['Purdue 1']) + b'<p>filler</p>' * 1000)
+	assert note_current_season(fake_browser, page) == 2023
+	assert page._root is None
+	assert get_catalog(fake_browser).current_season() == 2023
@@ -1,3 +1,4 @@
+from tests.conftest import FakeResponse
 import kenpompy.conference as kpconf
 
 def test_get_valid_conferences(browser):
@@ -120,4 +121,44 @@ def test_get_defense(browser):
 	assert confs_2003.iloc[0, :]['Stl%.Rank'] == expectedTeam1StlRank
 
 	confs_2021 = kpconf.get_defense(browser, 'BW', season = '2021')
-	assert confs_2021.loc[5]['Team'] == 'Cal St. Bakersfield'
\ No newline at end of file
+	assert confs_2021.loc[5]['Team'] == 'Cal St. Bakersfield'
+
+def table(header, rows):
+	head = '<tr>' + ''.join(f'<th>{cell}</th>' for cell in header) + '</tr>'
+	body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+	return f'<table><thead>{head}</thead><tbody>{body}</tbody></table>'
+
+CONF_PAGE = ('<html><body>'
+	+ table(['Team', 'ORtg', 'ORtg'], [['Michigan 2', '117.6', '9'], ['Iowa', '115.0', '12']])
+	+ table(['Team', 'Tempo', 'Tempo'], [['Iowa', '69', '4']])
+	+ table(['Team', 'Stl%', 'Stl%'], [['Michigan', '6.4', '12']])
+	+ table(['Stat', '', 'Value', 'Rank'], [['Tempo (poss)', '', '67.9', '20']])
+	+ table(['Stat', '', 'Value', 'Rank'], [['Home win%', '', '60.3%', '8']])
+	+ '<table><tr><td><a href="conf.php?c=B10">B10</a><a href="conf.php?c=ACC">ACC</a></td></tr></table>'
+	+ '</body></html>').encode('utf-8')
+
+def test_conference_page(fake_browser):
+	fake_browser.responses['https://kenpom.com/conf.php?c=B10&y=2021'] = [FakeResponse(CONF_PAGE)]
+	page = kpconf.ConferencePage(fake_browser, 'B10', season='2021')
+
+	assert page.standings.iloc[0]['Team'] == 'Michigan'
+	assert page.standings.iloc[0]['Seed'] == '2'
+	assert page.standings.iloc[0]['ORtg.Rank'] == 9
+	assert page.offense.iloc[0]['Tempo.Rank'] == 4
+	assert page.defense.iloc[0]['Stl%'] == 6.4
+	assert page.aggregate_stats.loc['Tempo', 'Value'] == 67.9
+	assert page.aggregate_stats.loc['Home win%', 'Rank'] == 8
+	assert page.conferences == ['ACC', 'B10']
+	assert len(fake_browser.requested) == 1
+
+def test_conference_typed(fake_browser):
+	fake_browser.responses['https://kenpom.com/conf.php?c=B10&y=2021'] = [FakeResponse(CONF_PAGE)] * 3
+	standings = kpconf.get_standings(fake_browser, 'B10', season='2021', typed=True)
+	assert standings['Team'].dtype == 'category'
+	assert standings['Seed'].to_list()[0] == 2
+	assert standings['ORtg.Rank'].dtype == 'Int16'
+	assert standings['ORtg'].dtype == 'float32'
+	assert kpconf.get_defense(fake_browser, 'B10', season='2021', typed=True)['Stl%.Rank'].to_list() == [12]
+	aggregate = kpconf.get_aggregate_stats(fake_browser, 'B10', season='2021', typed=True)
+	assert aggregate.loc['Tempo', 'Rank'] == 20
+	assert aggregate['Rank'].dtype == 'Int16'
@@ -0,0 +1,58 @@
+import os
+import pytest
+import pandas as pd
+from kenpompy import export
+from kenpompy.FanMatch import FanMatch
+from tests.test_fanmatch import FANMATCH_PAGE
+
+pytest.importorskip('pyarrow')
+
+EFFICIENCY = pd.DataFrame({'Season': [2008, 2019], 'Team': ['Louisville', 'Louisville'], 'Conference': ['BE', 'ACC'],
+						   'Tempo-Adj': ['65.3', '67.2'], 'Tempo-Adj.Rank': ['160', '199']})
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_write_dataset(tmp_path, format):
+	paths = export.write_dataset(EFFICIENCY, tmp_path, 'efficiency', format=format)
+	assert [os.path.basename(p) for p in paths] == ['Season=2008', 'Season=2019']
+
+	df = export.read_dataset(tmp_path, 'efficiency', format=format)
+	assert df['Season'].to_list() == [2008, 2019]
+	assert df.columns.to_list() == ['Season'] + export.arrow_schema('efficiency').names
+	assert df['Tempo-Adj.Rank'].to_list() == [160, 199]
+	assert df['Conference'].dtype == 'category'
+
+	# Appending a season leaves the others alone, and replacing only touches the seasons written.
+	before = sorted(p.name for p in (tmp_path / 'efficiency' / 'Season=2008').iterdir())
+	export.write_dataset(EFFICIENCY[EFFICIENCY.Season == 2019], tmp_path, 'efficiency', format=format)
+	assert len(export.read_dataset(tmp_path, 'efficiency', seasons=[2019], format=format)) == 2
+	export.write_dataset(EFFICIENCY[EFFICIENCY.Season == 2019], tmp_path, 'efficiency', format=format, replace=True)
+	assert len(export.read_dataset(tmp_path, 'efficiency', seasons=[2019], format=format)) == 1
+	assert sorted(p.name for p in (tmp_path / 'efficiency' / 'Season=2008').iterdir()) == before
+
+def test_to_arrow():
+	# Typed and untyped results get the same schema.
+	typed = export.to_arrow(EFFICIENCY.drop(columns='Season').astype({'Tempo-Adj': float}), 'efficiency')
+	assert typed.schema.names == export.to_arrow(EFFICIENCY.drop(columns='Season'), 'efficiency').schema.names[:len(typed.schema)]
+	assert str(typed.schema.field('Tempo-Adj.Rank').type) == 'int16'
+
+	report = export.to_arrow({'OE': 117.7, 'OE.Rank': 5})
+	assert report.num_rows == 1
+
+	games = pd.DataFrame({'Date': ['Sat Dec 15'], 'Team1': ['Duke'], 'Team2': ['UNC']}, index=pd.Index([7], name='GameID'))
+	games = export.to_arrow(games, 'games', season=2019)
+	assert games.column('Date').to_pylist()[0] == pd.Timestamp('2018-12-15')
+	assert games.column('GameID').to_pylist() == [7]
+
+	with pytest.raises(ValueError):
+		export.write_dataset(EFFICIENCY.drop(columns='Season'), '.', 'efficiency')
+	with pytest.raises(TypeError):
+		export.to_arrow('not a table')
+
+def test_write_fanmatch(tmp_path):
+	fm = FanMatch.from_html(FANMATCH_PAGE, '2020-01-29')
+	export.write_dataset(fm, tmp_path, 'fanmatch', season=2020)
+	export.write_dataset(fm.fm_df.assign(Date='2020-01-30'), tmp_path, 'fanmatch', season=2020)
+
+	df = export.read_dataset(tmp_path, 'fanmatch')
+	assert df['Date'].dt.strftime('%Y-%m-%d').to_list() == ['2020-01-29'] * 3 + ['2020-01-30'] * 3
+	assert df['WinnerScore'].to_list()[:2] == [84, 70]
@@ -1,4 +1,9 @@
+import datetime
+import pytest
+import pandas as pd
+import kenpompy.FanMatch as kpfanmatch
 from kenpompy.FanMatch import FanMatch
+from tests.conftest import FakeResponse
 
 def test_fanmatch(browser):
 	date = "2020-01-29"
@@ -66,3 +71,108 @@ def test_fanmatch(browser):
 	date = "2024-10-30"
 	fm = FanMatch(browser, date)
 	assert fm.fm_df is None
+
+def fanmatch_page(games, lines):
+	header = ['Prediction', 'Time (ET)', 'Game', 'Location', 'Thrill Score', 'Come back', 'Excite ment']
+	rows = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in game) + '</tr>' for game in games)
+	rows += ''.join(f'<tr><td colspan="7">{line}</td></tr>' for line in lines)
+	return ('<html><body><div class="lh12">Games for Wednesday, January 29th</div><table><thead><tr>'
+		+ ''.join(f'<th>{cell}</th>' for cell in header) + f'</tr></thead><tbody>{rows}</tbody></table></body></html>').encode('utf-8')
+
+FANMATCH_PAGE = fanmatch_page([
+	['Marquette 73-72 (51%)', '7:00 pm', '31 Marquette 84, 59 Xavier 82 (2OT) [79] MVP: Sacar Anim (28p/5r/2a/1b/4s)',
+	 'Cincinnati, OH Cintas Center', '68.2 2', '8', '2.94'],
+	["Gonzaga 80-70 (81%) [68]", '11:00 pm', "12 Gonzaga 70, 20 Saint Mary's 65 [66] WCC-T", 'Las Vegas, NV Orleans Arena', '60.0 4', '5', '1.5'],
+	['Purdue 75-70 (68%) [67]', '7:00 pm', '5 Purdue at 20 Michigan St.', 'East Lansing, MI Breslin Center', '70.1 1', '', ''],
+], [
+	'Lines of the night',
+	"1. Max Mahoney, Boston University • 29 pts (11-15 2's, 7-11 FT's)",
+	'Notes',
+	'Mean absolute error of predicted MOV: 7.8: 40-13 (expected: 38-15) in 1 of 53',
+	'Mean absolute error of predicted total score: 15.8 • Bias: -1.6',
+	'Stats for the day: Points per game: 71.5 • Efficiency: 101.9 • Possessions: 68.7',
+])
+
+def test_fanmatch_from_html():
+	fm = FanMatch.from_html(FANMATCH_PAGE, "2020-01-29")
+	assert fm.url == 'https://kenpom.com/fanmatch.php?d=2020-01-29'
+	assert [str(x) for x in fm.fm_df.iloc[0,]] == ["31 Marquette 84, 59 Xavier 82 (2OT)", "Cincinnati, OH Cintas Center",
+		"68.2", "8", "2.94", "2", "nan", "nan", "Sacar Anim (28p/5r/2a/1b/4s)", "nan", "79", "Marquette", "73-72", "51%",
+		"nan", "1", "Xavier", "2OT", "Xavier", "59", "82", "Marquette", "31", "84", "2.0"]
+	assert fm.fm_df.Tournament.tolist()[1] == "WCC-T"
+	assert fm.fm_df.PredictedLoser.tolist() == ["Xavier", "Saint Mary's", "Michigan St."]
+	assert fm.fm_df.ActualMOV.tolist()[:2] == [2, 5]
+	assert fm.fm_df.Possessions.tolist()[:2] == ["79", "66"]
+	assert fm.fm_df.PredictedPossessions.tolist()[1:] == [68.0, 67.0]
+	assert fm.lines_o_night == ["1. Max Mahoney, Boston University • 29 pts (11-15 2's, 7-11 FT's)"]
+	assert fm.ppg == 71.5
+	assert fm.mean_abs_err_pred_total_score == 15.8
+	assert fm.record_favs == "40-13"
+	assert fm.exact_mov == "1/53"
+
+	typed = FanMatch.from_html(FANMATCH_PAGE, "2020-01-29", typed=True).fm_df
+	assert typed.columns.to_list() == list(kpfanmatch.schema.SCHEMAS['fanmatch_day'])
+	assert typed.WinnerScore.to_list()[:2] == [84, 70]
+	assert typed.Winner.dtype == 'category'
+
+	# A page for another day, as served when no games were scheduled, is ignored.
+	assert FanMatch.from_html(FANMATCH_PAGE, "2020-01-30").fm_df is None
+
+def test_get_fanmatch(fake_browser, monkeypatch):
+	monkeypatch.setattr(kpfanmatch, '_date', type('date', (), {'today': staticmethod(lambda: datetime.date(2020, 1, 31))}))
+	fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-29'] = [FakeResponse(FANMATCH_PAGE)]
+	fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-30'] = [FakeResponse(FANMATCH_PAGE.replace(b'29th', b'30th'))] * 4
+	fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-31'] = [FakeResponse(b'<html><body>Sorry, no games today.</body></html>')] * 4
+
+	games_df, summary_df = kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31')
+	assert games_df.Date.tolist() == ['2020-01-29'] * 3 + ['2020-01-30'] * 3
+	assert games_df.columns.tolist() == ['Date'] + FanMatch.from_html(FANMATCH_PAGE, '2020-01-29').fm_df.columns.tolist()
+	assert games_df.Winner.tolist()[:2] == ['Marquette', 'Gonzaga']
+	assert summary_df.Games.tolist() == [3, 3, 0]
+	assert summary_df.ppg.tolist()[:2] == [71.5, 71.5]
+	# Purdue hasn't played yet, and the last day isn't over.
+	assert summary_df.Complete.tolist() == [False, False, False]
+
+	fake_browser.requested.clear()
+	fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-29'] = [FakeResponse(FANMATCH_PAGE.replace(b'at 20 Michigan St.', b'70, 20 Michigan St. 60'))]
+	games_df, summary_df = kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31', previous=(games_df, summary_df))
+	assert summary_df.Complete.tolist() == [True, False, False]
+	assert games_df.ActualMOV.tolist()[2] == 10
+
+	# Complete days aren't fetched again.
+	fake_browser.requested.clear()
+	games_df, summary_df = kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31', previous=(games_df, summary_df))
+	assert fake_browser.requested == ['https://kenpom.com/fanmatch.php?d=2020-01-30', 'https://kenpom.com/fanmatch.php?d=2020-01-31']
+	assert len(games_df) == 6
+
+	typed_games, typed_summary = kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31', previous=(games_df, summary_df), typed=True)
+	assert typed_games['Date'].dtype == 'datetime64[ns]'
+	assert typed_games['WinnerScore'].to_list()[:3] == [84, 70, 70]
+	assert typed_games['WinProbability'].to_list()[0] == 51.0
+	assert typed_summary['Games'].to_list() == [3, 3, 0]
+	assert typed_games['Winner'].dtype == 'category'
+
+	# The text of a typed result can't be recovered for an untyped call.
+	with pytest.raises(ValueError):
+		kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31', previous=(typed_games, typed_summary))
+
+def test_get_fanmatch_incremental(fake_browser, monkeypatch):
+	monkeypatch.setattr(kpfanmatch, '_date', type('date', (), {'today': staticmethod(lambda: datetime.date(2020, 2, 1))}))
+	finished = FANMATCH_PAGE.replace(b'at 20 Michigan St.', b'70, 20 Michigan St. 60')
+	pages = {29: finished, 30: finished.replace(b'29th', b'30th'), 31: b'<html><body>Sorry, no games today.</body></html>'}
+
+	def crawl(start, end, **kwargs):
+		for day, page in pages.items():
+			fake_browser.responses[f'https://kenpom.com/fanmatch.php?d=2020-01-{day}'] = [FakeResponse(page)]
+		return kpfanmatch.get_fanmatch(fake_browser, start, end, **kwargs)
+
+	# Continuing an earlier crawl gives the same result as crawling every day at once, typed or not.
+	first = crawl('2020-01-29', '2020-01-30')
+	typed_first = crawl('2020-01-29', '2020-01-30', typed=True)
+	for typed, previous in [(False, first), (True, first), (True, typed_first)]:
+		full = crawl('2020-01-29', '2020-01-31', typed=typed)
+		fake_browser.requested.clear()
+		incremental = crawl('2020-01-29', '2020-01-31', previous=previous, typed=typed)
+		assert fake_browser.requested == ['https://kenpom.com/fanmatch.php?d=2020-01-31']
+		pd.testing.assert_frame_equal(incremental[0], full[0])
+		pd.testing.assert_frame_equal(incremental[1], full[1])
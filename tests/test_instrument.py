@@ -0,0 +1,66 @@
+import datetime
+import kenpompy.summary as kpsummary
+import kenpompy.FanMatch as kpfanmatch
+import kenpompy.instrument as kpinstrument
+from tests.conftest import FakeResponse
+from tests.test_fanmatch import FANMATCH_PAGE
+
+HEADER = ['Team', 'Conf', 'AdjT', 'Rk', 'RawT', 'Rk', 'AdjO', 'Rk', 'RawO', 'Rk', 'AdjD', 'Rk', 'RawD', 'Rk']
+
+def summary_page(teams):
+	rows = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in [team, 'ACC'] + ['70.1', '5'] * 6) + '</tr>' for team in teams)
+	header = '<tr>' + ''.join(f'<th>{cell}</th>' for cell in HEADER) + '</tr>'
+	return f'<html><body><table><thead>{header}</thead><tbody>{rows}{header}</tbody></table></body></html>'.encode('utf-8')
+
+def test_getter_spans(fake_browser):
+	url = 'https://kenpom.com/summary.php?y=2019'
+	fake_browser.responses[url] = [FakeResponse(summary_page(['Duke 1', 'Virginia 1', 'Kansas 4']))]
+
+	spans = []
+	kpinstrument.add_hook(spans.append)
+	try:
+		eff_df = kpsummary.get_efficiency(fake_browser, season='2019')
+	finally:
+		kpinstrument.remove_hook(spans.append)
+
+	assert eff_df['Team'].tolist() == ['Duke', 'Virginia', 'Kansas']
+	assert len(spans) == 1
+	span = spans[0]
+	assert span.function == 'get_efficiency'
+	assert span.season == '2019'
+	assert span.urls == [url]
+	assert span.status_codes == [200]
+	assert span.bytes == len(summary_page(['Duke 1', 'Virginia 1', 'Kansas 4']))
+	assert span.rows == 3
+	assert set(span.phases) == {'fetch', 'parse', 'read_html', 'tidy'}
+	assert sum(span.phases.values()) <= span.duration + 1e-6
+
+def test_no_hooks(fake_browser):
+	assert kpinstrument.current_span() is None
+	with kpinstrument.phase('parse') as span:
+		assert span is None
+
+def test_bulk_getter_spans(fake_browser, monkeypatch):
+	monkeypatch.setattr(kpfanmatch, '_date', type('date', (), {'today': staticmethod(lambda: datetime.date(2020, 2, 1))}))
+	urls = [f'https://kenpom.com/fanmatch.php?d=2020-01-{day}' for day in (29, 30, 31)]
+	fake_browser.responses[urls[0]] = [FakeResponse(FANMATCH_PAGE)]
+	for url in urls[1:]:
+		fake_browser.responses[url] = [FakeResponse(b'<html><body>Sorry, no games today.</body></html>')]
+
+	spans = []
+	kpinstrument.add_hook(spans.append)
+	try:
+		games_df, _ = kpfanmatch.get_fanmatch(fake_browser, '2020-01-29', '2020-01-31')
+	finally:
+		kpinstrument.remove_hook(spans.append)
+
+	# The pages fetched by the worker threads are recorded on the getter's span.
+	assert len(games_df) == 3
+	assert len(spans) == 1
+	span = spans[0]
+	assert span.function == 'get_fanmatch'
+	assert sorted(span.urls) == urls
+	assert span.status_codes == [200] * 3
+	assert span.bytes == len(FANMATCH_PAGE) + 2 * len(b'<html><body>Sorry, no games today.</body></html>')
+	assert 'fetch' in span.phases
+	assert sum(span.phases.values()) <= span.duration + 1e-6
@@ -1,5 +1,7 @@
 import pytest
+import pandas as pd
 import kenpompy.misc as kpmisc
+from tests.conftest import FakeResponse
 
 def test_get_current_season(browser):
 	current_season = kpmisc.get_current_season(browser)
@@ -26,6 +28,10 @@ def test_get_pomeroy_ratings(browser):
     expected = (353, 22)
     assert df.shape == expected
 
+    typed_df = kpmisc.get_pomeroy_ratings(browser, season=2019, typed=True)
+    assert typed_df.iloc[0][['Wins', 'Losses', 'AdjO.Rank', 'Seed']].to_list() == [35, 3, 2, 1]
+    assert typed_df['Team'].dtype == 'category'
+
 def test_get_trends(browser):
 	expected = ["2019","103.2","69.0","50.7","18.5","28.4","33.0","50.1","34.4","38.7","70.7","51.9","9.3","8.9","9.7",
 				"76.8","47.8","59.0","71.9"]
@@ -90,4 +96,26 @@ def test_get_gameattribs(browser):
 def test_get_program_ratings(browser):
 	df = kpmisc.get_program_ratings(browser)
 	expected = (364, 17)
-	assert df.shape[1] == expected[1]
\ No newline at end of file
+	assert df.shape[1] == expected[1]
+
+
+def page(header, rows):
+	head = '<tr>' + ''.join(f'<th>{cell}</th>' for cell in header) + '</tr>'
+	body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+	return f'<html><body><table><thead>{head}</thead><tbody>{body}</tbody></table></body></html>'.encode('utf-8')
+
+def test_typed_misc_tables(fake_browser):
+	fake_browser.responses['https://kenpom.com/arenas.php?y=2019'] = [FakeResponse(page(
+		['Rk', 'Team', 'Conf', 'Arena', 'Alternate'],
+		[['3', 'Louisville', 'ACC', 'KFC Yum! Center (22,000)', ''], ['4', 'Duke', 'ACC', 'Cameron Indoor Stadium (9,314)', 'Madison Square Garden (19,812)']]))]
+	arenas_df = kpmisc.get_arenas(fake_browser, season='2019', typed=True)
+	assert arenas_df['Arena.Capacity'].to_list() == [22000, 9314]
+	assert arenas_df['Team'].dtype == 'category'
+	assert arenas_df['Alternate.Capacity'].isna().to_list() == [True, False]
+
+	fake_browser.responses['https://kenpom.com/officials.php?y=2019'] = [FakeResponse(page(
+		['Rk', 'Official', 'Rating', 'Gms', 'Last Game', 'Game Score', 'Box'],
+		[['2', 'Keith Kimble', '67.08', '107', 'Sat 4/6', '1 Virginia 63, 11 Auburn 62 (Minneapolis, MN)', '']]))]
+	refs_df = kpmisc.get_refs(fake_browser, season='2019', typed=True)
+	assert refs_df.iloc[0][['Rank', 'Rating', 'Games']].to_list() == [2, pytest.approx(67.08), 107]
+	assert refs_df['Last Game'].to_list() == [pd.Timestamp('2019-04-06')]
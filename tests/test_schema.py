@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from kenpompy import schema
+
+def test_apply():
+	df = pd.DataFrame({'Rk': ['1', '2'], 'Team': ['Virginia', 'Gonzaga'], 'Conf': ['ACC', 'WCC'], 'W-L': ['35-3', '33-4'],
+					   'AdjEM': ['+34.22', '+32.85'], 'Luck': ['+.050', '-.018'], 'Seed': ['1', ''], 'Extra': ['a', 'b']})
+	typed_df = schema.apply(df, 'pomeroy_ratings')
+
+	assert typed_df.columns.to_list() == ['Rk', 'Team', 'Conf', 'Wins', 'Losses'] + list(schema.SCHEMAS['pomeroy_ratings'])[4:]
+	assert typed_df['Rk'].dtype == 'Int16'
+	assert typed_df['Team'].dtype == 'category'
+	assert typed_df['Wins'].to_list() == [35, 33]
+	assert typed_df['Losses'].to_list() == [3, 4]
+	assert typed_df['AdjEM'].dtype == 'float32'
+	assert typed_df['Luck'].to_list() == pytest.approx([0.05, -0.018])
+	assert typed_df['Seed'].isna().to_list() == [False, True]
+	# Columns missing from the page are added empty.
+	assert typed_df['AdjO'].isna().all()
+
+	typed_df = schema.apply(df, 'pomeroy_ratings', fill=False)
+	assert typed_df.columns.to_list() == ['Rk', 'Team', 'Conf', 'Wins', 'Losses', 'AdjEM', 'Luck', 'Seed']
+
+	with pytest.raises(KeyError):
+		schema.apply(df, 'not_a_table')
+
+def test_convert():
+	assert schema.convert(pd.Series(['51%', '', None]), schema.FLOAT).to_list()[0] == 51.0
+	assert schema.convert(pd.Series(['51%', '', None]), schema.FLOAT).isna().to_list() == [False, True, True]
+	assert schema.convert(pd.Series(['2020-01-29']), schema.DATE).dtype == 'datetime64[ns]'
+	assert schema.convert(pd.Series(['ACC', '']), schema.CATEGORY).cat.categories.to_list() == ['ACC']
+	assert schema.convert(pd.Series([67.0, None]), schema.COUNT).to_list()[0] == 67
+
+def test_convert_dates():
+	# Only dates shown without a year take it from the season.
+	dates = schema.convert(pd.Series(['Sat Dec 15', 'Mon Mar 4', '2020-01-29', '']), schema.DATE, season=2019)
+	assert dates[:3].dt.strftime('%Y-%m-%d').to_list() == ['2018-12-15', '2019-03-04', '2020-01-29']
+	assert pd.isna(dates[3])
+	assert schema.apply(pd.DataFrame({'Date': ['2020-01-29']}), 'fanmatch', season=2020)['Date'][0] == pd.Timestamp('2020-01-29')
+
+def test_apply_other_columns():
+	# Columns that change with the season are kept, as numbers, with their ranks as integers.
+	df = pd.DataFrame({'Team': ['Michigan', 'Iowa'], 'ORtg': ['117.6', '115.0'], 'ORtg.Rank': ['9', '12'],
+					   'Seed': ['2', None]})
+	typed_df = schema.apply(df, 'conference_standings')
+	assert typed_df.columns.to_list() == ['Team', 'Wins', 'Losses', 'Seed', 'ORtg', 'ORtg.Rank']
+	assert typed_df['ORtg'].dtype == 'float32'
+	assert typed_df['ORtg.Rank'].to_list() == [9, 12]
+	assert typed_df['ORtg.Rank'].dtype == 'Int16'
+	assert schema.apply(typed_df, 'conference_standings').columns.to_list() == typed_df.columns.to_list()
+
+def test_convert_separators_and_short_dates():
+	assert schema.convert(pd.Series(['22,000', '']), 'Int32').to_list()[0] == 22000
+	dates = schema.convert(pd.Series(['Sat 4/6', 'Tue 11/13']), schema.DATE, season=2019)
+	assert dates.dt.strftime('%Y-%m-%d').to_list() == ['2019-04-06', '2018-11-13']
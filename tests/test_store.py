@@ -0,0 +1,94 @@
+import datetime
+import pytest
+import pandas as pd
+import kenpompy.FanMatch as kpfanmatch
+import kenpompy.summary as kpsummary
+from kenpompy import schema
+from kenpompy.catalog import get_catalog
+from kenpompy.store import Store
+from tests.conftest import FakeResponse
+from tests.test_bulk import OLD, NEW, efficiency_page
+from tests.test_fanmatch import FANMATCH_PAGE
+
+@pytest.fixture
+def efficiency_browser(fake_browser):
+	get_catalog(fake_browser).set_current_season(2019)
+	fake_browser.responses['https://kenpom.com/summary.php?y=2008'] = [FakeResponse(OLD)]
+	fake_browser.responses['https://kenpom.com/summary.php?y=2019'] = [FakeResponse(NEW)]
+	return fake_browser
+
+def test_sync(efficiency_browser, tmp_path):
+	path = str(tmp_path / 'kenpom.db')
+	with Store(path) as store:
+		assert store.sync(efficiency_browser, 'efficiency', [2008, 2019]) == [('efficiency', 2008), ('efficiency', 2019)]
+		# Both are up to date, so nothing is fetched.
+		assert store.sync(efficiency_browser, 'efficiency', [2008, 2019]) == []
+		assert store.loads()['Rows'].to_list() == [1, 1]
+
+	# Reads and queries work from the file alone.
+	with Store(path, ttl=0) as store:
+		df = store.read('efficiency')
+		assert df['Season'].to_list() == [2008, 2019]
+		assert df['Conference'].to_list() == ['BE', 'ACC']
+		assert df['Tempo-Adj.Rank'].to_list() == [160, 199]
+		assert df['Avg. Poss Length-Offense'].isna().to_list() == [True, False]
+		assert store.query('SELECT Team FROM efficiency WHERE Season = ?', (2019,))['Team'].to_list() == ['Louisville']
+
+		# The current season goes stale, and teams no longer listed are removed when it is loaded again.
+		efficiency_browser.requested.clear()
+		row = ['Kentucky', 'SEC', '68.0', '100', '68.3', '217', '17.6', '183', '17.5', '175', '113.7', '28', '107.6', '75',
+			   '94.4', '24', '98.8', '62']
+		efficiency_browser.responses['https://kenpom.com/summary.php?y=2019'] = [FakeResponse(efficiency_page([row]))]
+		assert store.sync(efficiency_browser, 'efficiency', [2008, 2019]) == [('efficiency', 2019)]
+		assert efficiency_browser.requested == ['https://kenpom.com/summary.php?y=2019']
+		assert store.read('efficiency', 2019)['Team'].to_list() == ['Kentucky']
+		assert len(store.read('efficiency')) == 2
+
+		with pytest.raises(KeyError):
+			store.read('not_a_table')
+		with pytest.raises(ValueError):
+			store.sync(efficiency_browser, 'efficiency', 2019, conf='ACC')
+
+def test_sync_fanmatch(fake_browser, monkeypatch):
+	monkeypatch.setattr(kpfanmatch, '_date', type('date', (), {'today': staticmethod(lambda: datetime.date(2020, 1, 31))}))
+	get_catalog(fake_browser).set_current_season(2020)
+	fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-29'] = [FakeResponse(FANMATCH_PAGE)]
+	get = fake_browser.get
+	def get_day(url, **kwargs):
+		if not fake_browser.responses.get(url):
+			fake_browser.responses[url] = [FakeResponse(b'<html><body>Sorry, no games today.</body></html>')]
+		return get(url, **kwargs)
+	monkeypatch.setattr(fake_browser, 'get', get_day)
+
+	with Store(':memory:', ttl=0) as store:
+		store.sync(fake_browser, 'fanmatch')
+		games = store.read('fanmatch')
+		assert len(games) == 3
+		assert games['Date'].dt.strftime('%Y-%m-%d').to_list() == ['2020-01-29'] * 3
+		summary = store.read('fanmatch_summary').set_index('Date')
+		assert not summary.loc['2020-01-29', 'Complete']
+		assert summary.loc['2019-11-01', 'Complete']
+
+		# Only days that weren't complete are fetched again.
+		fake_browser.requested.clear()
+		fake_browser.responses['https://kenpom.com/fanmatch.php?d=2020-01-29'] = [FakeResponse(FANMATCH_PAGE.replace(b'at 20 Michigan St.', b'70, 20 Michigan St. 60'))]
+		store.sync(fake_browser, 'fanmatch')
+		assert 'https://kenpom.com/fanmatch.php?d=2019-11-01' not in fake_browser.requested
+		assert 'https://kenpom.com/fanmatch.php?d=2020-01-29' in fake_browser.requested
+		assert store.read('fanmatch')['ActualMOV'].to_list()[2] == 10
+		assert store.read('fanmatch_summary').set_index('Date').loc['2020-01-29', 'Complete']
+
+def test_sync_players(fake_browser, monkeypatch):
+	# Players sharing a name and team are kept apart by their PlayerID, players without one by their name and team.
+	players_df = pd.DataFrame({'PlayerID': pd.array([1, 2, None, None], dtype='Int32'),
+							   'Player': ['Jalen Smith', 'Jalen Smith', 'Zach Edey', 'Zach Edey'],
+							   'Team': ['Purdue', 'Purdue', 'Purdue', 'Purdue']})
+	monkeypatch.setattr(kpsummary, 'get_all_playerstats', lambda browser, **kwargs: schema.apply(players_df, 'players'))
+	get_catalog(fake_browser).set_current_season(2024)
+
+	with Store(':memory:') as store:
+		store.sync(fake_browser, 'players')
+		stored = store.read('players')
+		assert stored['PlayerID'].to_list() == [1, 2, pd.NA]
+		assert 'PlayerKey' not in stored.columns
+		assert stored['Player'].to_list() == ['Jalen Smith', 'Jalen Smith', 'Zach Edey']
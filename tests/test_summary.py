@@ -1,5 +1,7 @@
 import pytest
 import kenpompy.summary as kpsum
+from kenpompy.catalog import get_catalog
+from tests.conftest import FakeResponse
 
 def test_get_efficiency(browser):
 	expected = ['Louisville', 'ACC', '67.2', '199', '68.3', '217', '17.6', '183', '17.5', '175', '113.7', '28', '107.6',
@@ -15,6 +17,12 @@ def test_get_efficiency(browser):
 	df = kpsum.get_efficiency(browser, season = '2008')
 	assert [str(i) for i in df[df.Team == 'Louisville'].iloc[0].to_list()] == expected
 
+	# Typed tables have the same columns in every season.
+	typed_df = kpsum.get_efficiency(browser, season = '2008', typed = True)
+	assert typed_df.columns.to_list() == kpsum.get_efficiency(browser, season = '2019', typed = True).columns.to_list()
+	assert typed_df['Avg. Poss Length-Offense'].isna().all()
+	assert typed_df.loc[typed_df.Team == 'Louisville', 'Tempo-Adj.Rank'].iloc[0] == 160
+
 	with pytest.raises(ValueError):
 		kpsum.get_efficiency(browser, season = '1998')
 
@@ -126,3 +134,42 @@ def test_get_kpoy(browser):
 
 	with pytest.raises(ValueError):
 		kpsum.get_kpoy(browser, season = '2010')
+
+
+def player_table(rows, columns=1):
+	header = ['Rk', 'Player', 'Team'] + ['Stat'] * columns + ['Ht', 'Wt', 'Yr']
+	head = '<tr>' + ''.join(f'<th>{cell}</th>' for cell in header) + '</tr>'
+	body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+	return f'<table><thead>{head}</thead><tbody>{body}</tbody></table>'
+
+def test_get_all_playerstats(fake_browser):
+	edey = '<a href="player.php?p=70001">Zach Edey</a>'
+	smith = '<a href="player.php?p=70002">Braden Smith</a>'
+	for metric in ['ORtg', 'Min', 'eFG', 'Poss', 'Shots', 'OR', 'DR', 'TO', 'ARate', 'Blk', 'FTRate', 'Stl', 'TS', 'FC40',
+				   'FD40', '2P', '3P', 'FT']:
+		if metric == 'ORtg':
+			restricted = player_table([['1', edey, 'Purdue', '127.1 (32.0)', '7-4', '300', 'Sr']])
+			html = restricted * 3 + player_table([['1', smith, 'Purdue', '129.9 (18.1)', '6-0', '170', 'So'],
+												  ['2', edey, 'Purdue', '127.1 (32.0)', '7-4', '300', 'Sr']])
+		elif metric in ['2P', '3P', 'FT']:
+			html = player_table([['1', edey, 'Purdue', '300', '480', '62.5', '7-4', '300', 'Sr']], columns=3)
+		else:
+			html = player_table([['1', edey, 'Purdue', '62.5', '7-4', '300', 'Sr'], ['Rk', 'Player', 'Team', 'Stat', 'Ht', 'Wt', 'Yr'],
+								 ['2', 'Lance Jones', 'Purdue', '50.0', '6-1', '200', 'Sr']])
+		url = kpsum._playerstats_url(metric, 2024, 'B10')
+		fake_browser.responses[url] = [FakeResponse(f'<html><body>{html}</body></html>'.encode('utf-8'))]
+	get_catalog(fake_browser).set_conferences(2024, ['B10'])
+
+	df = kpsum.get_all_playerstats(fake_browser, season=2024, conf='all', typed=True)
+	assert len(fake_browser.requested) == 18
+	assert df['Player'].to_list() == ['Braden Smith', 'Zach Edey', 'Lance Jones']
+	assert df['PlayerID'].to_list()[:2] == [70002, 70001]
+	assert df['PlayerID'].isna().to_list() == [False, False, True]
+	assert df.columns.to_list() == list(kpsum.schema.SCHEMAS['players'])
+	edey = df.iloc[1]
+	assert edey['ORtg'] == pytest.approx(127.1)
+	assert edey['ORTG.Rank'] == 2
+	assert edey['2PA'] == 480
+	assert edey['EFG.Rank'] == 1
+	assert df['EFG'].isna().to_list() == [True, False, False]
+	assert df.iloc[2]['EFG.Rank'] == 2
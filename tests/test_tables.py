@@ -0,0 +1,69 @@
+import pytest
+import pandas as pd
+from io import StringIO
+from kenpompy.tables import Page
+
+PAGE = '''<html><head><script type="text/javascript">var x = "<table><tr><td>no</td></tr></table>";</script></head>
+<body><div id="content-header"><h2>2019 Pomeroy College Basketball Ratings</h2></div>
+<table id="ratings-table">
+<thead>
+<tr class="thead1"><th colspan="2"></th><th colspan="2" class="hard_left">Strength of Schedule</th><th>Luck</th></tr>
+<tr class="thead2"><th>Rk</th><th>Team</th><th>AdjEM</th><th>AdjEM</th><th>Luck</th></tr>
+</thead>
+<tbody>
+<tr><td>1</td><td><a href="team.php?team=Virginia">Virginia</a> <span class="seed">1</span></td><td>+34.22</td><td>2</td><td>+.050</td></tr>
+<tr><td>2</td><td><a href="team.php?team=Saint+Mary%27s">Saint Mary's</a>&nbsp;<span class="seed">11</span></td><td>+17.31</td><td>1,234</td><td>-.045</td></tr>
+<tr class="thead2"><th>Rk</th><th>Team</th><th>AdjEM</th><th>AdjEM</th><th>Luck</th></tr>
+<tr><td>3</td><td>Texas A&amp;M<br>Corpus Chris</td><td></td><td rowspan="2">4</td><td>  +.001
+</td></tr>
+<tr><td>4</td><td>Hidden<span style="display: none">XYZ</span></td><td>-3.5</td><td>N/A</td></tr>
+</tbody>
+</table>
+<table><tr><th>Stat</th><th>Value</th><th></th><th>Rank</th></tr>
+<tr><td>Tempo (poss)</td><td>67.9</td><td></td><td>20</td></tr>
+<tr><td>Home win%</td><td>60.3%</td><td></td><td>8</td></tr>
+<tr><td>Capacity</td><td>22,000</td><td></td><td>1</td></tr>
+</table>
+<table><tr><td>Date</td><td>Opponent</td><td>Result</td></tr><tr><td>Sat Dec 15</td><td>Portland St.</td><td>W, 85-58</td></tr>
+<tr><td colspan="3">Big Ten Conference Tournament</td></tr><tr><td>Sun Mar 17</td><td>Michigan</td></tr></table>
+</body></html>'''.encode('utf-8')
+
+def test_read_table_matches_read_html():
+	page = Page(PAGE)
+	assert len(page.tables) == 3
+	for i, table in enumerate(page.tables):
+		expected = pd.read_html(StringIO(PAGE.decode('utf-8')))[i]
+		pd.testing.assert_frame_equal(page.read_table(i), expected)
+
+def test_page_queries():
+	page = Page(PAGE)
+	assert page.find('//*[@id="content-header"]//h2').text_content().startswith('2019')
+	assert page.find('//div[@class="missing"]') is None
+	assert len(page.find_all('//script[@type="text/javascript"]')) == 1
+	assert 'Pomeroy College Basketball Ratings' in page.text
+
+def test_table_stops_early(monkeypatch):
+	monkeypatch.setattr(Page, 'chunk_size', 64)
+	padding = ''.join(f'<div class="nav"><a href="/{i}">{i}</a></div>' for i in range(2000)).encode('utf-8')
+	content = PAGE.replace(b'</body>', padding + b'</body>')
+
+	page = Page(content)
+	pd.testing.assert_frame_equal(page.read_table(0), Page(PAGE).read_table(0))
+	assert page._position < len(PAGE)
+	pd.testing.assert_frame_equal(page.read_table(2), Page(PAGE).read_table(2))
+	assert page._position < len(content) / 2
+
+	# The rest of the page is still there when needed.
+	assert page.table(1) is page.tables[1]
+	assert len(page.find_all('//div[@class="nav"]')) == 2000
+	with pytest.raises(IndexError):
+		page.table(3)
+
+def test_read_table_leaves_page_unchanged():
+	# Line breaks are read without touching the tree the rest of the page shares.
+	content = b'<html><body><table><tr><th>Team</th></tr><tr><td>Texas A&amp;M<br>Corpus Chris</td></tr></table></body></html>'
+	page = Page(content)
+	text = page.text
+	assert page.read_table(0)['Team'].to_list() == ['Texas A&M Corpus Chris']
+	assert page.text == text
+	pd.testing.assert_frame_equal(page.read_table(0), pd.read_html(StringIO(content.decode('utf-8')))[0])
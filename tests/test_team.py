@@ -1,7 +1,9 @@
 import pytest
-import datetime
+import pandas as pd
 import kenpompy.team as kpteam
 import kenpompy.misc as kpmisc
+from kenpompy.catalog import get_catalog
+from tests.conftest import FakeResponse
 
 def test_get_valid_teams(browser):
 	expected = 357
@@ -44,7 +46,6 @@ def test_get_schedule(browser):
 	df = kpteam.get_schedule(browser, team='Villanova', season=2018)
 	assert df[df.Date == 'Mon Apr 2'].iloc[0].to_list() == expected
 
-	date = datetime.date.today()
 	currentYear = kpmisc.get_current_season(browser)
 	nextYear = str(int(currentYear)+1)
 
@@ -99,3 +100,124 @@ def test_get_scouting_report(browser):
 	assert data['APLD'] == ''
 	# Not including SoS and Personnel (88 with)
 	assert len(data) == 70
+
+def table(header, rows, attributes=''):
+	head = '<tr>' + ''.join(f'<th>{cell}</th>' for cell in header) + '</tr>'
+	body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+	return f'<table{attributes}><thead>{head}</thead><tbody>{body}</tbody></table>'
+
+def stat(token, value, rank):
+	return f'$("td#{token}").html("<a href=\\"teamstats.php\\">{value}</a> <span class=\\"seed\\">{rank}</span>");\n'
+
+TEAM_PAGE = ('<html><head><script type="text/javascript" src="jquery.js"></script>'
+	+ '<script type="text/javascript">\nfunction tableStart() {\n'
+	+ stat('Year', 2023, 1) + stat('Team', 0, 1) + stat('OE', 117.7, 5) + stat('APLD', 18.1, 300)
+	+ '}\n$(\':checkbox\').click(function() {\n'
+	+ stat('Year', 2023, 1) + stat('Team', 0, 1) + stat('OE', 111.3, 9)
+	+ '}\n</script></head><body>'
+	+ table(['Rk', 'Team'], [['1', 'Purdue']])
+	+ table(['Date', 'Rk', 'Rk', 'Opponent', 'Result', 'Poss', '', 'Location', 'Record', 'Conf', ''],
+		[['Mon Nov 7', '2', '310', 'Milwaukee', 'W, 84-53', '70', '', 'Home', '1-0', '', ''],
+		 ['<span>Big Ten Tournament</span>'] * 11,
+		 ['Fri Mar 10', '1', '40', 'Rutgers', 'W, 65-62', '63', '', 'Neutral', '27-5', '', '']])
+	+ table(['Player', 'Yr', 'ORtg'], [['Zach Edey', 'Jr', '127.1'], ['Player', 'Yr', 'ORtg'], ['Braden Smith', 'Fr', '105.9']],
+		' id="player-table"')
+	+ '</body></html>').encode('utf-8')
+
+def test_team_page(fake_browser):
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)]
+	page = kpteam.TeamPage(fake_browser, 'Purdue', season=2023, current_season=2024, valid_teams={'Purdue'})
+
+	assert page.schedule.shape == (2, 10)
+	assert [str(i) for i in page.schedule.iloc[0].to_list()] == ['Mon Nov 7', '2', '310', 'Milwaukee', 'W, 84-53', '70', 'Home', '1-0', '', 'None']
+	assert page.schedule.iloc[1]['Postseason'] == 'Big Ten'
+	report = page.scouting_report()
+	assert report['OE'] == 117.7
+	assert report['OE.Rank'] == 5
+	assert report['APLD'] == 18.1
+	assert len(report) == 70
+	assert page.scouting_report(conference_only=True)['OE'] == 111.3
+	assert page.roster['Player'].to_list() == ['Zach Edey', 'Braden Smith']
+	assert len(fake_browser.requested) == 1
+
+	with pytest.raises(ValueError):
+		kpteam.TeamPage(fake_browser, 'Purdue', season=1998)
+	with pytest.raises(ValueError):
+		kpteam.TeamPage(fake_browser, 'Purdue', season=2025, current_season=2024)
+	with pytest.raises(ValueError):
+		kpteam.TeamPage(fake_browser, 'Purdoo', season=2023, valid_teams={'Purdue'})
+	with pytest.raises(ValueError):
+		kpteam.TeamPage.from_html(b'<html><body><p>Team not found</p></body></html>', 'Purdoo', season=2023)
+	assert len(fake_browser.requested) == 1
+
+def test_get_schedule_typed(fake_browser):
+	catalog = get_catalog(fake_browser)
+	catalog.set_current_season(2024)
+	catalog.set_teams(2023, ['Purdue'])
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)]
+
+	df = kpteam.get_schedule(fake_browser, 'Purdue', season=2023, typed=True)
+	assert df['Date'].dt.strftime('%Y-%m-%d').to_list() == ['2022-11-07', '2023-03-10']
+	assert df['Team Rank'].to_list() == [2, 1]
+	assert df['Wins'].to_list() == [1, 27]
+	assert df['Losses'].to_list() == [0, 5]
+	assert df['Postseason'].dtype == 'category'
+
+def test_get_scouting_reports(fake_browser):
+	catalog = get_catalog(fake_browser)
+	catalog.set_current_season(2024)
+	catalog.set_teams(2023, ['Purdue', 'Texas A&M'])
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)]
+	fake_browser.responses['https://kenpom.com/team.php?team=Texas+A%26M&y=2023'] = [FakeResponse(TEAM_PAGE.replace(b'117.7', b'104.2'))]
+
+	reports_df = kpteam.get_scouting_reports(fake_browser, season=2023)
+	assert reports_df.index.to_list() == ['Purdue', 'Texas A&M']
+	assert reports_df.shape == (2, 70)
+	assert reports_df.loc['Texas A&M', 'OE'] == 104.2
+	assert reports_df.loc['Purdue', 'APLD.Rank'] == 300
+	assert reports_df['DE'].isna().all()
+	assert reports_df.loc['Purdue'].dropna().to_dict() == {k: v for k, v in kpteam.TeamPage.from_html(TEAM_PAGE, 'Purdue', 2023).scouting_report().items() if v != ''}
+
+	# A page without a report leaves its team empty, and the rest of the season is kept.
+	catalog.set_teams(2023, ['Purdue', 'Texas A&M', 'Wagner'])
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)]
+	fake_browser.responses['https://kenpom.com/team.php?team=Texas+A%26M&y=2023'] = [FakeResponse(TEAM_PAGE)]
+	fake_browser.responses['https://kenpom.com/team.php?team=Wagner&y=2023'] = [FakeResponse(b'<html><body></body></html>')]
+	reports_df = kpteam.get_scouting_reports(fake_browser, season=2023)
+	assert reports_df.index.to_list() == ['Purdue', 'Texas A&M', 'Wagner']
+	assert reports_df.loc['Wagner'].isna().all()
+	assert reports_df.shape == (3, 70)
+	assert reports_df.loc['Purdue', 'APLD.Rank'] == 300
+
+RUTGERS_PAGE = TEAM_PAGE.replace(b'Rutgers', b'Purdue').replace(b'Milwaukee', b'Columbia').replace(b'W, 65-62', b'L, 62-65')
+
+def test_get_season_games(fake_browser):
+	catalog = get_catalog(fake_browser)
+	catalog.set_current_season(2024)
+	catalog.set_teams(2023, ['Purdue', 'Rutgers'])
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2023'] = [FakeResponse(TEAM_PAGE)] * 2
+	fake_browser.responses['https://kenpom.com/team.php?team=Rutgers&y=2023'] = [FakeResponse(RUTGERS_PAGE)] * 2
+
+	schedules_df = kpteam.get_season_schedule(fake_browser, season=2023)
+	assert schedules_df.shape == (4, 11)
+	assert schedules_df['Team'].to_list() == ['Purdue', 'Purdue', 'Rutgers', 'Rutgers']
+	assert len(fake_browser.requested) == 2
+
+	# A page without a schedule leaves its team out, and the rest of the season is kept.
+	catalog.set_teams(2022, ['Purdue', 'Wagner'])
+	fake_browser.responses['https://kenpom.com/team.php?team=Purdue&y=2022'] = [FakeResponse(TEAM_PAGE)]
+	fake_browser.responses['https://kenpom.com/team.php?team=Wagner&y=2022'] = [FakeResponse(b'<html><body></body></html>')]
+	assert kpteam.get_season_schedule(fake_browser, season=2022)['Team'].to_list() == ['Purdue', 'Purdue']
+
+	games_df = kpteam.get_season_games(fake_browser, season=2023, typed=True)
+	# Purdue and Rutgers played each other, which both schedules list.
+	assert games_df[['Team1', 'Team2']].astype(str).values.tolist() == [['Milwaukee', 'Purdue'], ['Purdue', 'Rutgers'],
+																		 ['Columbia', 'Rutgers']]
+	assert games_df.index.name == 'GameID'
+	assert games_df.index.is_unique
+	game = games_df.iloc[1]
+	assert (game['Winner'], game['Loser'], game['WinnerScore'], game['LoserScore']) == ('Purdue', 'Rutgers', 65, 62)
+	assert game['Date'] == pd.Timestamp('2023-03-10')
+	assert game['Postseason'] == 'Big Ten'
+	assert pd.isna(game['HomeTeam'])
+	assert games_df.iloc[0]['HomeTeam'] == 'Purdue'
@@ -0,0 +1,27 @@
+import time
+import kenpompy.utils as kputils
+import kenpompy.misc as kpmisc
+from kenpompy.transport import RecordingTransport, ReplayTransport
+from tests.conftest import FakeResponse
+
+HOME = b'<html><div id="content-header"><h2>2025 Pomeroy College Basketball Ratings</h2></div>Logged in as me</html>'
+
+def test_record_and_replay(fake_browser, tmp_path):
+	path = str(tmp_path / 'archive.zip')
+	fake_browser.responses['https://kenpom.com/'] = [FakeResponse(HOME)]
+	fake_browser.responses['https://kenpom.com/index.php'] = [FakeResponse(HOME), FakeResponse(HOME)]
+
+	with RecordingTransport(fake_browser, path) as recorder:
+		browser = kputils.login('me@example.com', 'hunter2', transport=recorder)
+		kputils.get_html(browser, 'https://kenpom.com/summary.php?y=2019')
+		assert kpmisc.get_current_season(browser) == 2025
+	assert len(fake_browser.requested) == 4
+
+	replay = ReplayTransport(path, latency=0.05)
+	browser = kputils.login('', '', transport=replay)
+	start = time.monotonic()
+	assert kputils.get_html(browser, 'https://kenpom.com/summary.php?y=2019') == b'https://kenpom.com/summary.php?y=2019'
+	assert time.monotonic() - start >= 0.05
+	assert kpmisc.get_current_season(browser) == 2025
+	assert 'https://kenpom.com/trends.php' not in replay
+	assert replay.get('https://kenpom.com/trends.php').status_code == 404
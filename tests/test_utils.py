@@ -0,0 +1,140 @@
+import os
+import time
+import pytest
+import requests
+import cloudscraper
+import kenpompy.utils as kputils
+from kenpompy.ratelimit import RateLimiter
+from kenpompy.retry import RetryPolicy, RetryError, parse_retry_after
+from tests.conftest import FakeResponse
+
+def test_get_html_many(fake_browser):
+	urls = ['https://kenpom.com/summary.php?y=' + str(season) for season in range(2002, 2025)]
+	fake_browser.responses[urls[3]] = [FakeResponse(b'', status_code=404)]
+
+	results = kputils.get_html_many(fake_browser, urls, max_workers=8)
+	assert len(results) == len(urls)
+	assert isinstance(results[3], Exception)
+	for url, result in zip(urls[4:], results[4:]):
+		assert result == url.encode('utf-8')
+
+	fake_browser.responses[urls[0]] = [FakeResponse(b'', status_code=403)]
+	with pytest.raises(Exception):
+		kputils.get_html_many(fake_browser, urls, return_exceptions=False)
+
+	with pytest.raises(ValueError):
+		kputils.get_html_many(fake_browser, urls, max_workers=0)
+
+def test_rate_limiter_spacing():
+	limiter = RateLimiter(rate=100, burst=5)
+	waits = [limiter.reserve() for _ in range(10)]
+	# The first `burst` requests go straight out, then each one waits a further interval.
+	assert waits[:5] == [0.0] * 5
+	for previous, wait in zip(waits[5:], waits[6:]):
+		assert wait - previous == pytest.approx(0.01, abs=1e-3)
+
+def test_rate_limiter_shared_file(tmp_path):
+	path = str(tmp_path / 'bucket')
+	first = RateLimiter(rate=10, path=path)
+	second = RateLimiter(rate=10, path=path)
+	assert first.reserve() == 0.0
+	assert second.reserve() == pytest.approx(0.1, abs=0.02)
+
+def test_default_rate_limiter():
+	# Requests to kenpom.com are throttled unless the caller turns the limiter off.
+	limiter = kputils.get_rate_limiter()
+	assert isinstance(limiter, RateLimiter)
+	assert (limiter.rate, limiter.burst) == (1.0, 1)
+
+def test_rate_limited_get_html(fake_browser):
+	previous = kputils.set_rate_limiter(RateLimiter(rate=50))
+	try:
+		start = time.monotonic()
+		kputils.get_html_many(fake_browser, ['https://kenpom.com/?y=' + str(i) for i in range(11)], max_workers=4)
+		assert time.monotonic() - start >= 0.19
+	finally:
+		kputils.set_rate_limiter(previous)
+
+def test_session_roundtrip(tmp_path):
+	path = str(tmp_path / 'session.json')
+	browser = cloudscraper.create_scraper()
+	browser.cookies.set('PHPSESSID', 'abc123', domain='kenpom.com', path='/')
+	browser.cookies.set('cf_clearance', 'xyz', domain='.kenpom.com', path='/', expires=int(time.time()) + 3600)
+	browser.cookies.set('stale', 'old', domain='kenpom.com', path='/', expires=int(time.time()) - 3600)
+	kputils.save_session(browser, path)
+	if os.name == 'posix':
+		assert os.stat(path).st_mode & 0o777 == 0o600
+
+	restored = kputils.load_session(path, validate=False)
+	assert restored.headers['User-Agent'] == browser.headers['User-Agent']
+	assert restored.cookies.get('PHPSESSID', domain='kenpom.com') == 'abc123'
+	assert restored.cookies.get('cf_clearance', domain='.kenpom.com') == 'xyz'
+	assert restored.cookies.get('stale') is None
+
+	assert kputils.load_session(str(tmp_path / 'missing.json')) is None
+
+def test_login_reuses_session(tmp_path, monkeypatch):
+	path = str(tmp_path / 'session.json')
+	logins = []
+
+	def fake_login(email, password):
+		logins.append(email)
+		browser = cloudscraper.create_scraper()
+		browser.cookies.set('PHPSESSID', 'abc123', domain='kenpom.com', path='/')
+		return browser
+
+	monkeypatch.setattr(kputils, '_login', fake_login)
+	monkeypatch.setattr(kputils, '_is_logged_in', lambda browser: True)
+	kputils.login('me@example.com', 'hunter2', session_path=path)
+	kputils.login('me@example.com', 'hunter2', session_path=path)
+	assert logins == ['me@example.com']
+
+	monkeypatch.setattr(kputils, '_is_logged_in', lambda browser: False)
+	kputils.login('me@example.com', 'hunter2', session_path=path)
+	assert len(logins) == 2
+
+@pytest.fixture
+def fast_retries():
+	previous = kputils.set_retry_policy(RetryPolicy(max_attempts=3, backoff_factor=0.01, jitter=False))
+	yield
+	kputils.set_retry_policy(previous)
+
+def test_retry_transient_failure(fake_browser, fast_retries):
+	url = 'https://kenpom.com/summary.php?y=2019'
+	fake_browser.responses[url] = [FakeResponse(b'', status_code=503), requests.exceptions.ConnectionError()]
+	assert kputils.get_html(fake_browser, url) == url.encode('utf-8')
+	assert len(fake_browser.requested) == 3
+
+def test_retry_exhausted(fake_browser, fast_retries):
+	url = 'https://kenpom.com/summary.php?y=2019'
+	fake_browser.responses[url] = [FakeResponse(b'', status_code=429)] * 3
+	with pytest.raises(RetryError) as e:
+		kputils.get_html(fake_browser, url)
+	assert e.value.attempts == 3
+	assert e.value.status_code == 429
+
+	# Errors that won't go away on their own aren't retried.
+	fake_browser.responses[url] = [FakeResponse(b'', status_code=404)]
+	with pytest.raises(Exception) as e:
+		kputils.get_html(fake_browser, url)
+	assert not isinstance(e.value, RetryError)
+
+def test_retry_after():
+	assert parse_retry_after('120') == 120
+	assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+	assert parse_retry_after('soon') is None
+	policy = RetryPolicy(backoff_factor=1, max_backoff=4, jitter=False)
+	assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 2, 4, 4]
+	assert policy.backoff(1, retry_after=30) == 30
+
+def test_single_flight(fake_browser):
+	class SlowBrowser(type(fake_browser)):
+		def get(self, url, **kwargs):
+			time.sleep(0.2)
+			return super().get(url, **kwargs)
+
+	browser = SlowBrowser()
+	urls = ['https://kenpom.com/index.php'] * 6 + ['https://kenpom.com/'] * 2 + ['https://kenpom.com/trends.php']
+	results = kputils.get_html_many(browser, urls, max_workers=len(urls))
+	assert results[:8] == [b'https://kenpom.com/index.php'] * 8
+	assert sorted(browser.requested) == ['https://kenpom.com/index.php', 'https://kenpom.com/trends.php']